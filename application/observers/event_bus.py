@@ -0,0 +1,249 @@
+import atexit
+import logging
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from enum import Enum
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from application.observers.resource_observer import ResourceObserver, dispatch_events
+from domain.entities.resource import Resource
+
+_log = logging.getLogger(__name__)
+
+
+class LifecycleEvent(NamedTuple):
+    """A published lifecycle event; unpacks like a ResourceEvent as (event, resource, message)"""
+    event: str
+    resource: Resource
+    message: str
+
+    @property
+    def resource_name(self) -> str:
+        return self.resource.id.value
+
+    @property
+    def resource_type(self) -> str:
+        return self.resource.get_resource_type()
+
+
+class BackpressurePolicy(Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+
+
+class _Subscription:
+    """Bounded queue and delivery thread of one subscriber"""
+
+    def __init__(self, subscriber, policy: BackpressurePolicy, capacity: int, batch_size: int):
+        self.subscriber = subscriber
+        self.policy = policy
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self._pending: deque = deque()
+        # Pending events per resource id, so a full COALESCE queue knows whether collapsing would free room
+        self._counts: Optional[Dict] = defaultdict(int) if policy is BackpressurePolicy.COALESCE else None
+        self._condition = threading.Condition()
+        self._worker_waiting = False
+        self._in_flight = 0
+        self._closed = False
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._deliver = getattr(subscriber, 'on_batch', None) or (lambda batch: dispatch_events(subscriber, batch))
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        name = f"event-bus-{type(self.subscriber).__name__}"
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put_many(self, events: List[LifecycleEvent]) -> None:
+        with self._condition:
+            for event in events:
+                if len(self._pending) >= self.capacity:
+                    self._make_room()
+                self._pending.append(event)
+                if self._counts is not None:
+                    self._counts[event.resource.id] += 1
+            if self._worker_waiting:
+                self._condition.notify_all()
+
+    def _make_room(self) -> None:
+        if self.policy is BackpressurePolicy.DROP_OLDEST:
+            self._pending.popleft()
+            self.dropped += 1
+            return
+        if self.policy is BackpressurePolicy.COALESCE:
+            self._coalesce()
+        while len(self._pending) >= self.capacity and not self._closed:
+            self._wait_for_room()
+
+    def _coalesce(self) -> None:
+        """Keep only the latest pending event of each resource; only done once the queue is full"""
+        if len(self._pending) == len(self._counts):
+            return  # one event per resource, nothing to collapse
+        kept: deque = deque()
+        seen = set()
+        for event in reversed(self._pending):
+            key = event.resource.id
+            if key not in seen:
+                seen.add(key)
+                kept.appendleft(event)
+        self.coalesced += len(self._pending) - len(kept)
+        self._pending = kept
+        self._counts = defaultdict(int, dict.fromkeys(seen, 1))
+
+    def _wait_for_room(self) -> None:
+        if self._worker_waiting:
+            self._condition.notify_all()
+        self._condition.wait()
+
+    def deliver_now(self, events: List[LifecycleEvent]) -> None:
+        """Synchronous mode: hand the events straight to the subscriber; its exceptions propagate"""
+        self._deliver(events)
+        self.delivered += len(events)
+
+    def _take_batch(self) -> List[LifecycleEvent]:
+        pending = self._pending
+        batch = [pending.popleft() for _ in range(min(len(pending), self.batch_size))]
+        counts = self._counts
+        if counts is not None:
+            for event in batch:
+                key = event.resource.id
+                counts[key] -= 1
+                if not counts[key]:
+                    del counts[key]
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._worker_waiting = True
+                    self._condition.notify_all()
+                    self._condition.wait()
+                    self._worker_waiting = False
+                if not self._pending and self._closed:
+                    self._condition.notify_all()
+                    return
+                batch = self._take_batch()
+                self._in_flight = len(batch)
+                # Wake publishers blocked on a full queue
+                self._condition.notify_all()
+            try:
+                self._deliver(batch)
+            except Exception:
+                self.errors += 1
+                _log.exception("%s failed to handle %d event(s)", type(self.subscriber).__name__, len(batch))
+            with self._condition:
+                self.delivered += len(batch)
+                self._in_flight = 0
+
+    def drain(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.notify_all()
+                self._condition.wait(remaining if remaining is None else min(remaining, 0.05))
+        return True
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return {"queued": len(self._pending), "delivered": self.delivered, "dropped": self.dropped,
+                    "coalesced": self.coalesced, "errors": self.errors, "policy": self.policy.value}
+
+
+_OPEN_BUSES: 'weakref.WeakSet[EventBus]' = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_buses() -> None:
+    for bus in list(_OPEN_BUSES):
+        bus.close()
+
+
+class EventBus(ResourceObserver):
+    """Delivers lifecycle events to subscribers off the hot path.
+
+    Attached to resources like any observer, the bus only enqueues: every
+    subscriber has its own bounded queue and delivery thread, so a slow
+    subscriber never delays a transition or another subscriber. Events are
+    delivered in batches through ``on_batch`` (or one by one for observers
+    without it), in publish order, which keeps the order of each resource's
+    events. When a queue is full its policy decides: BLOCK waits for room,
+    DROP_OLDEST discards the oldest pending event and COALESCE collapses the
+    pending events to the latest one per resource, then waits if that frees
+    no room. Below capacity every event is delivered. Subscriber exceptions
+    are logged through the ``logging`` module and counted in ``stats()``;
+    ``synchronous=True`` delivers inline and lets them propagate, for tests.
+    """
+
+    def __init__(self, synchronous: bool = False):
+        self._synchronous = synchronous
+        self._subscriptions: List[_Subscription] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        if not synchronous:
+            _OPEN_BUSES.add(self)
+
+    def subscribe(self, subscriber, policy: BackpressurePolicy = BackpressurePolicy.BLOCK, capacity: int = 65536,
+                  batch_size: int = 1024) -> None:
+        subscription = _Subscription(subscriber, policy, max(capacity, 1), max(batch_size, 1))
+        with self._lock:
+            if not self._synchronous:
+                subscription.start()
+            self._subscriptions = self._subscriptions + [subscription]
+
+    def publish(self, event: str, resource: Resource, message: str) -> None:
+        self.publish_many([LifecycleEvent(event, resource, message)])
+
+    def publish_many(self, events: Iterable[LifecycleEvent]) -> None:
+        events = list(events)
+        for subscription in self._subscriptions:
+            if self._synchronous:
+                subscription.deliver_now(events)
+            else:
+                subscription.put_many(events)
+
+    def on_resource_started(self, resource: Resource, message: str) -> None:
+        self.publish_many([LifecycleEvent('started', resource, message)])
+
+    def on_resource_stopped(self, resource: Resource, message: str) -> None:
+        self.publish_many([LifecycleEvent('stopped', resource, message)])
+
+    def on_resource_deleted(self, resource: Resource, message: str) -> None:
+        self.publish_many([LifecycleEvent('deleted', resource, message)])
+
+    def on_batch(self, events: List) -> None:
+        self.publish_many(LifecycleEvent(*event) for event in events)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every published event has been delivered; False on timeout"""
+        return all(subscription.drain(timeout) for subscription in self._subscriptions)
+
+    def close(self) -> None:
+        """Deliver what is pending and stop the delivery threads"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for subscription in self._subscriptions:
+            subscription.close()
+        _OPEN_BUSES.discard(self)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {f"{index}:{type(subscription.subscriber).__name__}": subscription.stats()
+                for index, subscription in enumerate(self._subscriptions)}
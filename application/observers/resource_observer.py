@@ -1,8 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import List, Tuple
 from domain.entities.resource import Resource
 
+# (event, resource, message) where event is 'started', 'stopped' or 'deleted'
+ResourceEvent = Tuple[str, Resource, str]
+
 
 class ResourceObserver(ABC):
+    # True for observers that keep stored state in step with the resources (indexes, rollups, write-ahead logs):
+    # services that defer notifications still update these before a transition returns
+    records_state = False
+    
     @abstractmethod
     def on_resource_started(self, resource: Resource, message: str) -> None:
         pass
@@ -14,6 +22,20 @@ class ResourceObserver(ABC):
     @abstractmethod
     def on_resource_deleted(self, resource: Resource, message: str) -> None:
         pass
+    
+    def on_batch(self, events: List[ResourceEvent]) -> None:
+        """Receive the events of a bulk operation at once; dispatches them one by one by default"""
+        dispatch_events(self, events)
+
+
+def dispatch_events(observer, events: List[ResourceEvent]) -> None:
+    for event, resource, message in events:
+        if event == 'started':
+            observer.on_resource_started(resource, message)
+        elif event == 'stopped':
+            observer.on_resource_stopped(resource, message)
+        else:
+            observer.on_resource_deleted(resource, message)
 
 
 class LoggingObserver(ResourceObserver):
@@ -21,10 +43,14 @@ class LoggingObserver(ResourceObserver):
         self._logger = logger
     
     def on_resource_started(self, resource: Resource, message: str) -> None:
-        self._logger.log(resource.get_resource_type(), message)
+        self._logger.log(resource.get_resource_type(), message, resource.id.value)
     
     def on_resource_stopped(self, resource: Resource, message: str) -> None:
-        self._logger.log(resource.get_resource_type(), message)
+        self._logger.log(resource.get_resource_type(), message, resource.id.value)
     
     def on_resource_deleted(self, resource: Resource, message: str) -> None:
-        self._logger.log(resource.get_resource_type(), message)
\ No newline at end of file
+        self._logger.log(resource.get_resource_type(), message, resource.id.value)
+    
+    def on_batch(self, events: List[ResourceEvent]) -> None:
+        self._logger.log_many([(resource.get_resource_type(), message, resource.id.value)
+                               for _, resource, message in events])
@@ -0,0 +1,270 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from domain.exceptions import ThrottledError
+
+_CALLER: ContextVar[str] = ContextVar('cloudconnect_caller', default='anonymous')
+
+
+@contextmanager
+def acting_as(caller: str) -> Iterator[None]:
+    """Attribute the service calls made inside the block to ``caller`` (a client, user or tenant)"""
+    token = _CALLER.set(caller)
+    try:
+        yield
+    finally:
+        _CALLER.reset(token)
+
+
+def current_caller() -> str:
+    return _CALLER.get()
+
+
+class OverloadPolicy(Enum):
+    REJECT = "reject"
+    QUEUE = "queue"
+
+
+class RateLimit(NamedTuple):
+    """``rate`` operations per second with bursts of up to ``burst``"""
+    rate: float
+    burst: float
+
+
+class TokenBucket:
+    """Token bucket refilled lazily on each take; an operation costs one token per item"""
+
+    __slots__ = ('rate', 'burst', '_tokens', '_updated', '_lock')
+
+    def __init__(self, limit: RateLimit, now: float):
+        self.rate = limit.rate
+        self.burst = limit.burst
+        self._tokens = float(limit.burst)
+        self._updated = now
+        self._lock = threading.Lock()
+
+    def take(self, cost: int, now: float, max_wait: float = 0.0) -> Tuple[bool, float]:
+        """Take ``cost`` tokens if they are available within ``max_wait`` seconds.
+
+        Returns (taken, wait): when taken the caller must wait ``wait`` seconds
+        before proceeding (the bucket may go into debt for it); otherwise
+        ``wait`` is when the tokens would have been available. An operation
+        larger than the burst only needs a full bucket and leaves it in debt.
+        """
+        with self._lock:
+            tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(min(cost, self.burst) - tokens, 0.0) / self.rate
+            if wait > max_wait:
+                self._tokens = tokens
+                return False, wait
+            self._tokens = tokens - cost
+            return True, wait
+
+    def refund(self, cost: int) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + cost)
+
+    def is_full(self, now: float) -> bool:
+        return self._tokens + (now - self._updated) * self.rate >= self.burst
+
+
+class _Waiter:
+    __slots__ = ('event', 'granted')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class _Permit:
+    """Held for the duration of an admitted operation; releases its in-flight slot on exit"""
+
+    __slots__ = ('_release',)
+
+    def __init__(self, release: Optional[Callable[[], None]]):
+        self._release = release
+
+    def __enter__(self) -> '_Permit':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._release is not None:
+            self._release()
+
+
+_UNLIMITED = _Permit(None)
+
+
+class AdmissionController:
+    """Decides whether a service operation may run now, later or not at all.
+
+    Each operation is charged one token per item against the bucket of its
+    caller (see ``acting_as``) and against the bucket of each resource type it
+    touches, then takes one of ``max_in_flight`` slots until it completes.
+    With ``OverloadPolicy.REJECT`` an operation that would have to wait fails
+    at once with ThrottledError. With ``OverloadPolicy.QUEUE`` it waits up to
+    ``max_wait`` seconds: for tokens in arrival order, and for a slot in a
+    queue of at most ``max_queue`` operations served round-robin between
+    callers, so one busy caller cannot starve the others. Checks take constant
+    time and only hold the lock of the bucket or slot counter involved.
+    """
+
+    def __init__(self, per_caller: Optional[RateLimit] = None, per_type: Optional[Dict[str, RateLimit]] = None,
+                 max_in_flight: Optional[int] = None, policy: OverloadPolicy = OverloadPolicy.REJECT,
+                 max_queue: int = 1000, max_wait: float = 5.0, max_callers: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        per_type = per_type or {}
+        for limit in ([per_caller] if per_caller else []) + list(per_type.values()):
+            if limit.rate <= 0 or limit.burst < 1:
+                raise ValueError("A rate limit needs a positive rate and a burst of at least 1")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        now = clock()
+        self._per_caller = per_caller
+        self._type_buckets = {resource_type: TokenBucket(limit, now) for resource_type, limit in per_type.items()}
+        self.max_in_flight = max_in_flight
+        self.policy = policy
+        self.max_queue = max_queue
+        self.max_wait = max_wait if policy is OverloadPolicy.QUEUE else 0.0
+        self._max_callers = max_callers
+        self._clock = clock
+        self._callers: Dict[str, TokenBucket] = {}
+        self._sweep_at = max_callers
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # Slot waiters per caller; the dict order is the round-robin order
+        self._queues: Dict[str, Deque[_Waiter]] = {}
+        self._queued = 0
+        self._delayed = 0
+        self.admitted = 0
+        self.rejected = {"caller_rate": 0, "type_rate": 0, "saturated": 0}
+
+    def admit(self, resource_types: Dict[str, int], items: Optional[int] = None) -> _Permit:
+        """Admit an operation on ``items`` resources or raise ThrottledError.
+
+        ``resource_types`` counts the items per resource type, where known; the
+        caller is charged for all items. Use the returned permit as a context
+        manager around the operation.
+        """
+        caller = _CALLER.get()
+        cost = max(items if items is not None else sum(resource_types.values()), 1)
+        now = self._clock()
+        taken: List[Tuple[TokenBucket, int]] = []
+        wait = 0.0
+        if self._per_caller is not None:
+            bucket = self._caller_bucket(caller, now)
+            granted, bucket_wait = bucket.take(cost, now, self.max_wait)
+            if not granted:
+                self._reject("caller_rate", f"Caller '{caller}' is over its rate limit", bucket_wait)
+            taken.append((bucket, cost))
+            wait = bucket_wait
+        for resource_type, count in resource_types.items():
+            bucket = self._type_buckets.get(resource_type)
+            if bucket is None:
+                continue
+            granted, bucket_wait = bucket.take(count, now, self.max_wait)
+            if not granted:
+                self._refund(taken)
+                self._reject("type_rate", f"{resource_type} operations are over their rate limit", bucket_wait)
+            taken.append((bucket, count))
+            wait = max(wait, bucket_wait)
+        if wait > 0:
+            self._delay(wait)
+        if self.max_in_flight is None:
+            with self._lock:
+                self.admitted += 1
+            return _UNLIMITED
+        try:
+            self._acquire_slot(caller)
+        except ThrottledError:
+            self._refund(taken)
+            raise
+        return _Permit(self._release_slot)
+
+    def _caller_bucket(self, caller: str, now: float) -> TokenBucket:
+        bucket = self._callers.get(caller)
+        if bucket is None:
+            with self._lock:
+                bucket = self._callers.get(caller)
+                if bucket is None:
+                    if len(self._callers) >= self._sweep_at:
+                        self._sweep(now)
+                    bucket = self._callers[caller] = TokenBucket(self._per_caller, now)
+        return bucket
+
+    def _sweep(self, now: float) -> None:
+        # A full bucket is the same as a new one, so idle callers can be forgotten; sweeping again only once the
+        # map has doubled keeps this amortized constant time
+        self._callers = {caller: bucket for caller, bucket in self._callers.items() if not bucket.is_full(now)}
+        self._sweep_at = max(self._max_callers, 2 * len(self._callers))
+
+    def _delay(self, wait: float) -> None:
+        with self._lock:
+            self._delayed += 1
+        try:
+            time.sleep(wait)
+        finally:
+            with self._lock:
+                self._delayed -= 1
+
+    def _acquire_slot(self, caller: str) -> None:
+        with self._lock:
+            if self._in_flight < self.max_in_flight and not self._queued:
+                self._in_flight += 1
+                self.admitted += 1
+                return
+            if self.policy is OverloadPolicy.REJECT or self._queued >= self.max_queue:
+                self.rejected["saturated"] += 1
+                raise ThrottledError(f"Too many operations in flight ({self._in_flight})", self.max_wait or None)
+            waiter = _Waiter()
+            self._queues.setdefault(caller, deque()).append(waiter)
+            self._queued += 1
+        if waiter.event.wait(self.max_wait):
+            return
+        with self._lock:
+            if waiter.granted:
+                return
+            queue = self._queues[caller]
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[caller]
+            self._queued -= 1
+            self.rejected["saturated"] += 1
+        raise ThrottledError(f"Timed out after {self.max_wait:g} s waiting for an operation slot", self.max_wait)
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            if not self._queues:
+                self._in_flight -= 1
+                return
+            # The slot passes straight to the next caller in turn, who then goes to the back of the rotation
+            caller, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            del self._queues[caller]
+            if queue:
+                self._queues[caller] = queue
+            self._queued -= 1
+            self.admitted += 1
+            waiter.granted = True
+            waiter.event.set()
+
+    def _reject(self, reason: str, message: str, retry_after: float) -> None:
+        with self._lock:
+            self.rejected[reason] += 1
+        raise ThrottledError(message, retry_after)
+
+    @staticmethod
+    def _refund(taken: List[Tuple[TokenBucket, int]]) -> None:
+        for bucket, cost in taken:
+            bucket.refund(cost)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"in_flight": self._in_flight, "max_in_flight": self.max_in_flight,
+                    "queue_depth": self._queued + self._delayed, "admitted": self.admitted,
+                    "rejected": dict(self.rejected), "callers": len(self._callers)}
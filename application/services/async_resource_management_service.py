@@ -0,0 +1,136 @@
+import asyncio
+import weakref
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from application.factories.resource_factory import ResourceFactoryRegistry
+from application.observers.resource_observer import ResourceObserver
+from application.services.latency_simulator import LatencySimulator, NoLatency
+from application.services.resource_management_service import EVENTS, OperationResult
+from domain.engines.release import deferred_release, run_releases
+from domain.entities.resource import Resource
+from domain.exceptions import DuplicateResourceError, DomainException
+from domain.repositories.resource_repository import ResourceRepository
+from domain.value_objects import ResourceId
+
+
+class AsyncResourceManagementService:
+    """asyncio front-end that models provisioning latency per resource type.
+
+    Operations wait out the simulated latency before the transition is applied,
+    so thousands can be in flight at once up to ``max_concurrency``. Invalid
+    transitions fail immediately without waiting. A cancelled or timed-out
+    operation leaves the resource unchanged. Observers receive the same events
+    as with the synchronous service, called in the loop's default executor so
+    that their I/O does not stall the loop.
+    """
+    
+    def __init__(self, repository: ResourceRepository, factory_registry: ResourceFactoryRegistry,
+                 logging_observer: ResourceObserver, latency: Optional[LatencySimulator] = None,
+                 max_concurrency: int = 1000, timeout: Optional[float] = None):
+        if max_concurrency < 1:
+            raise ValueError("Max concurrency must be at least 1")
+        self._repository = repository
+        self._factory_registry = factory_registry
+        self._latency = latency or NoLatency()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._timeout = timeout
+        # Held only while an operation on the resource is pending
+        self._locks: 'weakref.WeakValueDictionary[ResourceId, asyncio.Lock]' = weakref.WeakValueDictionary()
+        self._provisioning: Set[ResourceId] = set()
+        repository.attach_observer(logging_observer)
+    
+    async def create_resource(self, resource_type: str, name: str, timeout: Optional[float] = None,
+                              **kwargs) -> Resource:
+        resource_id = ResourceId(name)
+        if resource_id in self._provisioning or self._repository.exists(resource_id):
+            raise DuplicateResourceError(f"Resource '{name}' already exists")
+        resource = self._factory_registry.create_resource(resource_type, resource_id, **kwargs)
+        self._provisioning.add(resource_id)
+        try:
+            await self._wait(resource_type, 'create', timeout)
+            self._repository.add(resource)
+        finally:
+            self._provisioning.discard(resource_id)
+        return resource
+    
+    async def start_resource(self, name: str, timeout: Optional[float] = None) -> None:
+        await self._transition(name, 'start', timeout)
+    
+    async def stop_resource(self, name: str, timeout: Optional[float] = None) -> None:
+        await self._transition(name, 'stop', timeout)
+    
+    async def delete_resource(self, name: str, timeout: Optional[float] = None) -> None:
+        await self._transition(name, 'delete', timeout)
+    
+    def list_resources(self, **filters) -> List[Resource]:
+        return sorted(self._repository.query(**filters), key=lambda resource: resource.id.value)
+    
+    def fleet_summary(self) -> Dict:
+        return self._repository.fleet_rollup().summary()
+    
+    async def create_many(self, specs: Iterable[Tuple[str, str, Dict]],
+                          timeout: Optional[float] = None) -> List[OperationResult]:
+        specs = list(specs)
+        return await self._gather([name for _, name, _ in specs],
+                                  [self.create_resource(resource_type, name, timeout, **kwargs)
+                                   for resource_type, name, kwargs in specs])
+    
+    async def start_many(self, names: Iterable[str], timeout: Optional[float] = None) -> List[OperationResult]:
+        return await self._transition_many(names, self.start_resource, timeout)
+    
+    async def stop_many(self, names: Iterable[str], timeout: Optional[float] = None) -> List[OperationResult]:
+        return await self._transition_many(names, self.stop_resource, timeout)
+    
+    async def delete_many(self, names: Iterable[str], timeout: Optional[float] = None) -> List[OperationResult]:
+        return await self._transition_many(names, self.delete_resource, timeout)
+    
+    async def _transition(self, name: str, action: str, timeout: Optional[float]) -> None:
+        resource = self._repository.get(ResourceId(name))
+        lock = self._locks.get(resource.id)
+        if lock is None:
+            lock = self._locks[resource.id] = asyncio.Lock()
+        async with lock:
+            # Invalid transitions fail before waiting
+            resource.check_transition(action)
+            await self._wait(resource.get_resource_type(), action, timeout)
+            with deferred_release() as pending:
+                getattr(resource, action)(notify=False)
+            # Still under the resource lock, so that events are delivered in transition order
+            notify = getattr(resource, f"notify_{EVENTS[action]}")
+            await asyncio.shield(asyncio.get_running_loop().run_in_executor(None, self._deliver, notify, pending))
+    
+    @staticmethod
+    def _deliver(notify: Callable[[], None], pending: List[Callable[[], None]]) -> None:
+        notify()
+        run_releases(pending)
+    
+    async def _wait(self, resource_type: str, operation: str, timeout: Optional[float]) -> None:
+        delay = self._latency.delay(resource_type, operation)
+        timeout = self._timeout if timeout is None else timeout
+        if timeout is None:
+            await self._occupy(delay)
+        else:
+            # Queueing for a slot counts against the timeout as well
+            await asyncio.wait_for(self._occupy(delay), timeout)
+    
+    async def _occupy(self, delay: float) -> None:
+        async with self._semaphore:
+            await asyncio.sleep(delay)
+    
+    async def _transition_many(self, names: Iterable[str], operation: Callable[..., Awaitable[None]],
+                               timeout: Optional[float]) -> List[OperationResult]:
+        names = list(names)
+        return await self._gather(names, [operation(name, timeout) for name in names])
+    
+    @staticmethod
+    async def _gather(names: List[str], operations: List[Awaitable]) -> List[OperationResult]:
+        outcomes = await asyncio.gather(*operations, return_exceptions=True)
+        results = []
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, (DomainException, ValueError, KeyError, asyncio.TimeoutError)):
+                results.append(OperationResult(name, error=outcome))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results.append(OperationResult(name, applied=True,
+                                               resource=outcome if isinstance(outcome, Resource) else None))
+        return results
@@ -0,0 +1,134 @@
+import threading
+from collections import deque
+from functools import partial
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from application.factories.resource_factory import ResourceFactoryRegistry
+from application.observers.resource_observer import ResourceObserver
+from application.services.admission_control import AdmissionController
+from application.services.idempotency_cache import IdempotencyCache
+from application.services.resource_management_service import EVENTS, ResourceManagementService, OperationResult
+from application.services.striped_lock import StripedLock
+from domain.engines.release import deferred_release, run_releases
+from domain.entities.resource import Resource
+from domain.repositories.resource_repository import ResourceRepository
+from domain.value_objects import ResourceId
+
+
+# (event, resource, message) as passed to the observers
+Event = Tuple[str, Resource, str]
+
+
+def _lock_key(name: str) -> str:
+    # Same key ResourceId hashes on; invalid names still get a stripe and fail validation later
+    return name.strip()
+
+
+class _Outbox:
+    """Lifecycle events of one lock stripe, delivered in the order they were posted.
+
+    Events are posted while the stripe lock is held, so they queue in the order
+    of the transitions, and are delivered once it has been released. Only one
+    thread delivers a stripe's events at a time: a thread that posts while
+    another is delivering leaves its events to that thread.
+    """
+
+    __slots__ = ('_events', '_delivering', '_lock')
+
+    def __init__(self):
+        self._events: Deque[Event] = deque()
+        self._delivering = False
+        self._lock = threading.Lock()
+
+    def post(self, events: Iterable[Event]) -> None:
+        with self._lock:
+            self._events.extend(events)
+
+    def deliver(self, notify: Callable[[List[Event]], None]) -> None:
+        with self._lock:
+            if self._delivering:
+                return
+            self._delivering = True
+        try:
+            while True:
+                with self._lock:
+                    if not self._events:
+                        self._delivering = False
+                        return
+                    batch = list(self._events)
+                    self._events.clear()
+                notify(batch)
+        except BaseException:
+            with self._lock:
+                self._delivering = False
+            raise
+
+
+class ConcurrentResourceManagementService(ResourceManagementService):
+    """Service that may be called from many threads at once.
+
+    Transitions take the stripe lock of their resource, so different resources
+    move in parallel while the same resource is serialized. The repository's
+    own observers (``records_state``: the state index, the fleet rollup, the
+    write-ahead log) are updated under that lock, so queries and the fleet
+    summary reflect a transition as soon as its call returns. The other
+    observers are notified after the lock has been released, in the order the
+    transitions happened, and engines are released (replica pools drained,
+    deleted blobs removed) after that. Under contention a call may return while
+    another thread is still delivering its event to those observers.
+    """
+    
+    def __init__(self, repository: ResourceRepository, factory_registry: ResourceFactoryRegistry,
+                 logging_observer: ResourceObserver, lock_stripes: int = 64,
+                 idempotency: Optional[IdempotencyCache] = None, admission: Optional[AdmissionController] = None):
+        super().__init__(repository, factory_registry, logging_observer, idempotency, admission)
+        self._locks = StripedLock(lock_stripes)
+        self._outboxes = [_Outbox() for _ in range(lock_stripes)]
+        self._notify_deferred = partial(self._notify_batch, records_state=False)
+    
+    def _create_resource(self, resource_type: str, name: str, kwargs: Dict) -> Resource:
+        with self._locks.for_key(_lock_key(name)):
+            return super()._create_resource(resource_type, name, kwargs)
+    
+    def _start_resource(self, name: str) -> None:
+        self._transition(name, 'start')
+    
+    def _stop_resource(self, name: str) -> None:
+        self._transition(name, 'stop')
+    
+    def _delete_resource(self, name: str) -> None:
+        self._transition(name, 'delete')
+    
+    def _transition(self, name: str, action: str) -> None:
+        resource = self._repository.get(ResourceId(name))
+        key = _lock_key(name)
+        outbox = self._outboxes[self._locks.index(key)]
+        with deferred_release() as releases, self._locks.for_key(key):
+            getattr(resource, action)(notify=False)
+            event = EVENTS[action]
+            events = [(event, resource, resource.get_event_message(event))]
+            self._notify_batch(events, records_state=True)
+            outbox.post(events)
+        outbox.deliver(self._notify_deferred)
+        run_releases(releases)
+    
+    def _scale_resource(self, name: str, replica_count: int) -> None:
+        with self._locks.for_key(_lock_key(name)):
+            super()._scale_resource(name, replica_count)
+    
+    def _create_many(self, specs: List[Tuple[str, str, Dict]], atomic: bool) -> List[OperationResult]:
+        with self._locks.acquire_all(_lock_key(name) for _, name, _ in specs):
+            return super()._create_many(specs, atomic)
+    
+    def _transition_many(self, action: str, names: List[str], atomic: bool) -> List[OperationResult]:
+        with deferred_release() as releases, self._locks.acquire_all(_lock_key(name) for name in names):
+            results, events = self._apply_transitions(action, names, atomic)
+            self._notify_batch(events, records_state=True)
+            by_stripe: Dict[int, List[Event]] = {}
+            for event in events:
+                by_stripe.setdefault(self._locks.index(event[1].id.value), []).append(event)
+            for index, stripe_events in by_stripe.items():
+                self._outboxes[index].post(stripe_events)
+        for index in sorted(by_stripe):
+            self._outboxes[index].deliver(self._notify_deferred)
+        run_releases(releases)
+        return results
@@ -0,0 +1,214 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from application.services.latency_simulator import LatencySimulator, NoLatency
+from application.services.resource_management_service import ResourceManagementService, OperationResult
+from domain.exceptions import DependencyCycleError, DomainException
+
+
+class FailurePolicy(Enum):
+    FAIL_FAST = "fail_fast"
+    CONTINUE = "continue"
+
+
+class DependencyGraph:
+    """Start-order dependencies between resources, keyed by name; cycles are rejected as they are declared"""
+
+    def __init__(self):
+        self._dependencies: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def declare(self, name: str, depends_on: Iterable[str] = ()) -> None:
+        """Record that ``name`` may only start after every resource in ``depends_on``"""
+        depends_on = set(depends_on)
+        with self._lock:
+            for dependency in depends_on:
+                path = self._path(dependency, name)
+                if path is not None:
+                    raise DependencyCycleError(f"Dependency cycle: {' -> '.join([name] + path)}")
+            self._dependencies.setdefault(name, set()).update(depends_on)
+            self._dependents.setdefault(name, set())
+            for dependency in depends_on:
+                self._dependencies.setdefault(dependency, set())
+                self._dependents.setdefault(dependency, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            for dependency in self._dependencies.pop(name, ()):
+                self._dependents[dependency].discard(name)
+            for dependent in self._dependents.pop(name, ()):
+                self._dependencies[dependent].discard(name)
+
+    def dependencies(self, name: str) -> Set[str]:
+        return set(self._dependencies.get(name, ()))
+
+    def dependents(self, name: str) -> Set[str]:
+        return set(self._dependents.get(name, ()))
+
+    def names(self) -> Set[str]:
+        return set(self._dependencies)
+
+    def _path(self, origin: str, target: str) -> Optional[List[str]]:
+        """Dependency chain from origin to target, if target is reachable"""
+        parents: Dict[str, Optional[str]] = {origin: None}
+        stack = [origin]
+        while stack:
+            node = stack.pop()
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+            for dependency in self._dependencies.get(node, ()):
+                if dependency not in parents:
+                    parents[dependency] = node
+                    stack.append(dependency)
+        return None
+
+    def closure(self, names: Iterable[str], edges: str) -> Set[str]:
+        """The names plus everything reachable over 'dependencies' or 'dependents' edges"""
+        adjacency = self._dependencies if edges == 'dependencies' else self._dependents
+        with self._lock:
+            seen = set(names)
+            stack = list(seen)
+            while stack:
+                for neighbour in adjacency.get(stack.pop(), ()):
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        stack.append(neighbour)
+        return seen
+
+
+class ScheduleReport:
+    """Outcome and timing of one scheduled run"""
+
+    def __init__(self, action: str):
+        self.action = action
+        self.results: Dict[str, OperationResult] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self.critical_path: List[str] = []
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results.values())
+
+    @property
+    def critical_path_seconds(self) -> float:
+        return sum(self.timings[name][1] - self.timings[name][0] for name in self.critical_path)
+
+    def lines(self) -> List[str]:
+        failed = [result for result in self.results.values() if not result.ok]
+        lines = [f"{self.action}: {len(self.results) - len(failed)} ok, {len(failed)} failed "
+                 f"in {self.elapsed:.3f} s"]
+        lines += [f"  ❌ {result.name}: {result.error}" for result in failed]
+        lines.append(f"  critical path ({self.critical_path_seconds:.3f} s):")
+        lines += [f"    {name:<30} {self.timings[name][1] - self.timings[name][0]:8.3f} s"
+                  for name in self.critical_path]
+        return lines
+
+
+class DependencyScheduler:
+    """Starts resources in dependency order and stops them in reverse.
+
+    Every resource whose prerequisites are done is started (or stopped) at once,
+    up to ``max_concurrency`` in flight. With ``FAIL_FAST`` the first failure
+    stops new work from being scheduled; with ``CONTINUE`` only the resources
+    that depend on the failed one are skipped. Each run reports the critical
+    path: the chain of dependent operations that bounded the wall-clock time.
+    The service must be thread-safe when ``max_concurrency`` is above 1.
+    """
+
+    def __init__(self, service: ResourceManagementService, graph: DependencyGraph, max_concurrency: int = 8,
+                 policy: FailurePolicy = FailurePolicy.FAIL_FAST, latency: Optional[LatencySimulator] = None):
+        self._service = service
+        self._graph = graph
+        self._max_concurrency = max(max_concurrency, 1)
+        self._policy = policy
+        self._latency = latency or NoLatency()
+
+    def start(self, names: Optional[Iterable[str]] = None) -> ScheduleReport:
+        """Start the given resources (default: every declared one) and all of their dependencies"""
+        selected = self._graph.closure(self._graph.names() if names is None else names, 'dependencies')
+        return self._run('start', selected, self._graph.dependencies)
+
+    def stop(self, names: Optional[Iterable[str]] = None) -> ScheduleReport:
+        """Stop the given resources (default: every declared one) after everything that depends on them"""
+        selected = self._graph.closure(self._graph.names() if names is None else names, 'dependents')
+        return self._run('stop', selected, self._graph.dependents)
+
+    def _run(self, action: str, selected: Set[str], prerequisites_of) -> ScheduleReport:
+        report = ScheduleReport(action)
+        prerequisites = {name: prerequisites_of(name) & selected for name in selected}
+        waiting = {name: len(required) for name, required in prerequisites.items()}
+        followers: Dict[str, List[str]] = {name: [] for name in selected}
+        for name, required in prerequisites.items():
+            for prerequisite in required:
+                followers[prerequisite].append(name)
+
+        ready = sorted(name for name, count in waiting.items() if count == 0)
+        running: Dict[Future, str] = {}
+        halted = False
+        origin = time.perf_counter()
+        with ThreadPoolExecutor(self._max_concurrency) as executor:
+            while ready or running:
+                while ready and not halted and len(running) < self._max_concurrency:
+                    name = ready.pop()
+                    running[executor.submit(self._execute, action, name, origin)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result, started, finished = future.result()
+                    report.results[name] = result
+                    report.timings[name] = (started, finished)
+                    if not result.ok:
+                        halted = halted or self._policy is FailurePolicy.FAIL_FAST
+                        continue
+                    for follower in followers[name]:
+                        waiting[follower] -= 1
+                        if waiting[follower] == 0:
+                            ready.append(follower)
+        report.elapsed = time.perf_counter() - origin
+
+        for name in selected:
+            if name not in report.results:
+                report.results[name] = OperationResult(name, error=DomainException(
+                    f"Skipped '{name}' after an earlier failure"))
+        report.critical_path = self._critical_path(report, prerequisites)
+        return report
+
+    def _execute(self, action: str, name: str, origin: float) -> Tuple[OperationResult, float, float]:
+        started = time.perf_counter() - origin
+        result = OperationResult(name)
+        try:
+            resource = self._service.get_resource(name)
+            result.resource = resource
+            # Started resources are not started again; only started ones need stopping
+            if (resource.state == 'Started') == (action == 'stop'):
+                time.sleep(self._latency.delay(resource.get_resource_type(), action))
+                getattr(self._service, f"{action}_resource")(name)
+                result.applied = True
+        except (ValueError, DomainException) as e:
+            result.error = e
+        return result, started, time.perf_counter() - origin
+
+    @staticmethod
+    def _critical_path(report: ScheduleReport, prerequisites: Dict[str, Set[str]]) -> List[str]:
+        """Walk back from the last operation to finish through the prerequisite that finished last"""
+        if not report.timings:
+            return []
+        name = max(report.timings, key=lambda node: report.timings[node][1])
+        path = [name]
+        while True:
+            finished = [prerequisite for prerequisite in prerequisites[name] if prerequisite in report.timings]
+            if not finished:
+                break
+            name = max(finished, key=lambda node: report.timings[node][1])
+            path.append(name)
+        return path[::-1]
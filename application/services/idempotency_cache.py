@@ -0,0 +1,144 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Callable, Dict, Optional
+from domain.exceptions import DomainException, IdempotencyKeyReusedError
+
+# Outcomes of these errors are remembered and replayed; anything else is treated as transient and runs again
+_REPLAYED_ERRORS = (DomainException, ValueError, KeyError)
+
+
+def _encode_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot fingerprint a value of type {type(value).__name__}")
+
+
+def _fingerprint(request) -> bytes:
+    """Digest of a request's canonical JSON encoding, the same in every process and Python version"""
+    encoded = json.dumps(request, sort_keys=True, separators=(',', ':'), default=_encode_value)
+    return hashlib.sha256(encoded.encode('utf-8')).digest()
+
+
+class _Outcome:
+    __slots__ = ('fingerprint', 'value', 'error', 'weight', 'expires')
+
+    def __init__(self, fingerprint: bytes, value, error: Optional[Exception], weight: int, expires: float):
+        self.fingerprint = fingerprint
+        self.value = value
+        self.error = error
+        self.weight = weight
+        self.expires = expires
+
+
+class IdempotencyCache:
+    """Remembers the outcome of each keyed operation so a retried call replays it instead of running again.
+
+    Outcomes expire ``ttl`` seconds after they were recorded. At most
+    ``capacity`` outcomes are held, a bulk operation counting one per item;
+    the oldest go first and an operation larger than the whole cache is not
+    remembered. A call whose key is still running waits for the first call
+    and replays its outcome. Domain and validation errors are replayed as
+    well; other failures are forgotten so that a retry runs again.
+    """
+
+    def __init__(self, capacity: int = 10000, ttl: float = 24 * 3600.0, clock: Callable[[], float] = time.monotonic):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        if ttl <= 0:
+            raise ValueError("TTL must be positive")
+        self.capacity = capacity
+        self.ttl = ttl
+        self._clock = clock
+        self._outcomes: 'OrderedDict[str, _Outcome]' = OrderedDict()
+        self._running: Dict[str, bytes] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.conflicts = 0
+
+    def run(self, key: str, request, operation: Callable, *args):
+        """Return ``operation(*args)``, or replay the recorded outcome of ``key``.
+
+        ``request`` identifies the call as JSON-encodable data and is compared
+        by its fingerprint; reusing a key for a different call raises
+        IdempotencyKeyReusedError.
+        """
+        fingerprint = _fingerprint(request)
+        with self._lock:
+            while True:
+                self._expire()
+                outcome = self._outcomes.get(key)
+                if outcome is not None:
+                    self._check(key, outcome.fingerprint, fingerprint)
+                    self.hits += 1
+                    if outcome.error is not None:
+                        # A copy, so concurrent replays do not share one traceback
+                        raise copy.copy(outcome.error)
+                    return outcome.value
+                running = self._running.get(key)
+                if running is None:
+                    break
+                self._check(key, running, fingerprint)
+                self._finished.wait()
+            self._running[key] = fingerprint
+            self.misses += 1
+        try:
+            value = operation(*args)
+        except _REPLAYED_ERRORS as e:
+            self._record(key, fingerprint, None, e)
+            raise
+        except BaseException:
+            with self._lock:
+                del self._running[key]
+                self._finished.notify_all()
+            raise
+        self._record(key, fingerprint, value, None)
+        return value
+
+    def _check(self, key: str, recorded: bytes, fingerprint: bytes) -> None:
+        if recorded != fingerprint:
+            self.conflicts += 1
+            raise IdempotencyKeyReusedError(f"Idempotency key '{key}' was already used for a different request")
+
+    def _record(self, key: str, fingerprint: bytes, value, error: Optional[Exception]) -> None:
+        weight = len(value) if isinstance(value, list) else 1
+        with self._lock:
+            del self._running[key]
+            self._finished.notify_all()
+            if weight > self.capacity:
+                return
+            self._expire()
+            while self._size + weight > self.capacity:
+                self._size -= self._outcomes.popitem(last=False)[1].weight
+                self.evictions += 1
+            self._outcomes[key] = _Outcome(fingerprint, value, error, weight, self._clock() + self.ttl)
+            self._size += weight
+
+    def _expire(self) -> None:
+        # Every outcome lives for the same TTL, so insertion order is expiry order
+        now = self._clock()
+        outcomes = self._outcomes
+        while outcomes:
+            key, outcome = next(iter(outcomes.items()))
+            if outcome.expires > now:
+                return
+            del outcomes[key]
+            self._size -= outcome.weight
+            self.expirations += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self._outcomes), "size": self._size, "capacity": self.capacity,
+                    "in_flight": len(self._running), "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0, "evictions": self.evictions,
+                    "expirations": self.expirations, "conflicts": self.conflicts}
@@ -0,0 +1,45 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+OPERATIONS = ('create', 'start', 'stop', 'delete')
+
+
+class LatencySimulator(ABC):
+    """Decides how long a simulated cloud operation takes"""
+    
+    @abstractmethod
+    def delay(self, resource_type: str, operation: str) -> float:
+        pass
+
+
+class NoLatency(LatencySimulator):
+    def delay(self, resource_type: str, operation: str) -> float:
+        return 0.0
+
+
+class FixedLatencySimulator(LatencySimulator):
+    """Constant latency per resource type and operation, e.g. {'AppService': {'start': 0.2}}"""
+    
+    def __init__(self, latencies: Dict[str, Dict[str, float]], default: float = 0.0):
+        self._latencies = latencies
+        self._default = default
+    
+    def delay(self, resource_type: str, operation: str) -> float:
+        return self._latencies.get(resource_type, {}).get(operation, self._default)
+
+
+class JitteredLatencySimulator(FixedLatencySimulator):
+    """Fixed latencies scaled by a uniform random factor in [1 - jitter, 1 + jitter]"""
+    
+    def __init__(self, latencies: Dict[str, Dict[str, float]], default: float = 0.0, jitter: float = 0.2,
+                 seed: Optional[int] = None):
+        if not 0 <= jitter <= 1:
+            raise ValueError("Jitter must be between 0 and 1")
+        super().__init__(latencies, default)
+        self._jitter = jitter
+        self._random = random.Random(seed)
+    
+    def delay(self, resource_type: str, operation: str) -> float:
+        base = super().delay(resource_type, operation)
+        return base * self._random.uniform(1 - self._jitter, 1 + self._jitter)
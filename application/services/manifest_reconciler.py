@@ -0,0 +1,302 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from application.services.dependency_scheduler import DependencyGraph, DependencyScheduler, FailurePolicy
+from application.services.resource_management_service import ResourceManagementService, OperationResult
+from domain.entities.resource import Resource
+from domain.exceptions import DependencyCycleError, DomainException, ResourceNotFoundException
+from domain.states import STATES_BY_NAME, TRANSITIONS
+
+
+class ResourceSpec(NamedTuple):
+    """Desired state of one resource; kwargs are the factory arguments, state None keeps the current state.
+
+    ``depends_on`` names the resources that must be started before this one
+    and stopped or deleted after it.
+    """
+    resource_type: str
+    name: str
+    kwargs: Dict
+    state: Optional[str] = None
+    depends_on: Tuple[str, ...] = ()
+
+
+class PlannedChange:
+    """Steps that move one resource from its current to its desired state"""
+
+    def __init__(self, name: str, resource_type: str, current_state: Optional[str], target_state: Optional[str]):
+        self.name = name
+        self.resource_type = resource_type
+        self.current_state = current_state
+        self.target_state = target_state
+        self.create: Optional[Dict] = None
+        self.scale_to: Optional[int] = None
+        self.actions: Tuple[str, ...] = ()
+        self.error: Optional[str] = None
+
+    @property
+    def empty(self) -> bool:
+        return self.create is None and self.scale_to is None and not self.actions and self.error is None
+
+    def describe(self) -> str:
+        if self.error:
+            return f"! {self.resource_type} {self.name}: {self.error}"
+        steps = []
+        if self.create is not None:
+            steps.append("create")
+        if self.scale_to is not None:
+            steps.append(f"scale to {self.scale_to} replicas")
+        steps.extend(self.actions)
+        marker = "+" if self.create is not None else "-" if self.target_state == "Deleted" else "~"
+        states = f"{self.current_state or '(new)'} -> {self.target_state or self.current_state or 'Created'}"
+        return f"{marker} {self.resource_type} {self.name}: {', '.join(steps)} ({states})"
+
+
+class ReconciliationPlan:
+    def __init__(self, changes: List[PlannedChange], unchanged: int, graph: Optional[DependencyGraph] = None):
+        self.changes = changes
+        self.unchanged = unchanged
+        self.graph = graph or DependencyGraph()
+
+    @property
+    def errors(self) -> List[PlannedChange]:
+        return [change for change in self.changes if change.error]
+
+    def summary(self) -> Dict[str, int]:
+        valid = [change for change in self.changes if not change.error]
+        return {
+            "create": sum(1 for change in valid if change.create is not None),
+            "scale": sum(1 for change in valid if change.scale_to is not None),
+            "transitions": sum(len(change.actions) for change in valid),
+            "unchanged": self.unchanged,
+            "errors": len(self.changes) - len(valid),
+        }
+
+    def lines(self) -> List[str]:
+        summary = self.summary()
+        return [change.describe() for change in self.changes] + [
+            f"Plan: {summary['create']} to create, {summary['scale']} to scale, "
+            f"{summary['transitions']} transitions, {summary['unchanged']} unchanged, {summary['errors']} errors"]
+
+
+def _shortest_paths() -> Dict[Tuple[str, str], Tuple[str, ...]]:
+    """Shortest action sequence between every pair of connected states"""
+    paths = {}
+    for origin in STATES_BY_NAME:
+        paths[(origin, origin)] = ()
+        queue = deque([origin])
+        while queue:
+            state = queue.popleft()
+            for (source, action), target in TRANSITIONS.items():
+                if source == state and (origin, target) not in paths:
+                    paths[(origin, target)] = paths[(origin, state)] + (action,)
+                    queue.append(target)
+    return paths
+
+
+_PATHS = _shortest_paths()
+
+
+def _normalize(config: Dict) -> Dict:
+    return {key: value.value if isinstance(value, Enum) else value for key, value in config.items()}
+
+
+class ManifestReconciler:
+    """Brings the repository to the state described by a manifest.
+
+    ``plan`` diffs the specs against the service's resources and derives the
+    fewest creates, scalings and lifecycle transitions, following the state
+    machine (a started resource is stopped before it is deleted). ``apply``
+    executes a plan in waves: all creates, then all scalings, then the n-th
+    transition of every resource. Each wave is split into bulk operations of
+    ``chunk_size`` names that run on ``workers`` threads; with more than one
+    worker the service must be thread-safe (ConcurrentResourceManagementService).
+    Resources with ``depends_on`` are started by a DependencyScheduler, after
+    their dependencies, and stopped or deleted before them.
+    """
+
+    def __init__(self, service: ResourceManagementService, workers: int = 4, chunk_size: int = 500):
+        self._service = service
+        self._workers = max(workers, 1)
+        self._chunk_size = max(chunk_size, 1)
+
+    def plan(self, specs: Iterable[ResourceSpec], prune: bool = False) -> ReconciliationPlan:
+        """Changes needed to reach the specs; with ``prune`` resources missing from them are deleted"""
+        planned = []
+        seen = set()
+        for spec in specs:
+            planned.append((spec, self._plan_one(spec, spec.name in seen)))
+            seen.add(spec.name)
+        graph = self._plan_dependencies(planned, prune)
+        changes = [change for _, change in planned if not change.empty]
+        unchanged = len(planned) - len(changes)
+        if prune:
+            for resource in self._service.list_resources():
+                if resource.id.value not in seen and resource.state != "Deleted":
+                    change = PlannedChange(resource.id.value, resource.get_resource_type(), resource.state, "Deleted")
+                    change.actions = _PATHS[(resource.state, "Deleted")]
+                    changes.append(change)
+        return ReconciliationPlan(changes, unchanged, graph)
+
+    def _plan_dependencies(self, planned: List[Tuple[ResourceSpec, PlannedChange]], prune: bool) -> DependencyGraph:
+        """Declare the dependencies of the specs; a cycle or a dependency that will not be running is an error.
+
+        A dependency missing from the manifest keeps its current state (or is
+        deleted with ``prune``), so it must already be started: the plan never
+        starts resources it does not list.
+        """
+        graph = DependencyGraph()
+        outcomes = {spec.name: change.target_state or change.current_state or "Created" for spec, change in planned}
+        for spec, change in planned:
+            if not spec.depends_on or change.error:
+                continue
+            for dependency in spec.depends_on:
+                outcome = outcomes.get(dependency) or (None if prune else self._current_state(dependency))
+                if outcome is None:
+                    change.error = f"depends on {dependency}, which is not in the manifest"
+                elif outcomes[spec.name] == "Started" and outcome != "Started":
+                    change.error = f"depends on {dependency}, which would not be started"
+                if change.error:
+                    break
+            else:
+                try:
+                    graph.declare(spec.name, spec.depends_on)
+                except DependencyCycleError as e:
+                    change.error = str(e)
+        return graph
+
+    def _current_state(self, name: str) -> Optional[str]:
+        try:
+            return self._service.get_resource(name).state
+        except (ValueError, ResourceNotFoundException):
+            return None
+
+    def _plan_one(self, spec: ResourceSpec, duplicate: bool) -> PlannedChange:
+        if spec.state is not None and spec.state not in STATES_BY_NAME:
+            change = PlannedChange(spec.name, spec.resource_type, None, spec.state)
+            change.error = f"unknown state {spec.state}"
+            return change
+        try:
+            resource = self._service.get_resource(spec.name)
+        except (ValueError, ResourceNotFoundException):
+            resource = None
+        current = resource.state if resource else None
+        change = PlannedChange(spec.name, spec.resource_type, current, spec.state)
+        if duplicate:
+            change.error = "listed more than once"
+        elif resource is None and spec.state == "Deleted":
+            # Nothing to create only to delete it again
+            pass
+        elif resource is None:
+            change.create = spec.kwargs
+            change.actions = _PATHS[("Created", spec.state or "Created")]
+        else:
+            self._plan_existing(change, spec, resource)
+        return change
+
+    @staticmethod
+    def _plan_existing(change: PlannedChange, spec: ResourceSpec, resource: Resource) -> None:
+        if resource.get_resource_type() != spec.resource_type:
+            change.error = f"exists as a {resource.get_resource_type()}"
+            return
+        current_config = resource.config
+        desired_config = _normalize(spec.kwargs)
+        differing = sorted(key for key, value in desired_config.items() if current_config.get(key) != value)
+        if differing == ["replica_count"]:
+            change.scale_to = desired_config["replica_count"]
+        elif differing:
+            change.error = f"cannot change {', '.join(differing)} of an existing resource"
+            return
+        if spec.state is not None:
+            actions = _PATHS.get((resource.state, spec.state))
+            if actions is None:
+                change.error = f"cannot go from {resource.state} to {spec.state}"
+                return
+            change.actions = actions
+
+    def apply(self, plan: ReconciliationPlan) -> Dict[str, OperationResult]:
+        """Execute every valid change of the plan; returns the outcome per resource name.
+
+        An applied change reports the result of the last bulk operation that
+        touched its resource, with the resource it returned (none for a change
+        that only scales).
+        """
+        changes = [change for change in plan.changes if not change.error]
+        results = {change.name: OperationResult(change.name) for change in plan.changes}
+        for change in plan.errors:
+            results[change.name].error = ValueError(change.error)
+
+        with ThreadPoolExecutor(self._workers) as executor:
+            creates = [(change.resource_type, change.name, change.create)
+                       for change in changes if change.create is not None]
+            self._run_wave(executor, results, creates, lambda chunk: self._service.create_many(chunk),
+                           key=lambda spec: spec[1])
+            scalings = [change for change in changes if change.scale_to is not None and results[change.name].ok]
+            self._run_wave(executor, results, scalings, self._scale_chunk, key=lambda change: change.name)
+            for step in range(max((len(change.actions) for change in changes), default=0)):
+                by_action: Dict[str, List[str]] = {}
+                for change in changes:
+                    if step < len(change.actions) and results[change.name].ok:
+                        by_action.setdefault(change.actions[step], []).append(change.name)
+                for action, names in by_action.items():
+                    self._run_transitions(executor, results, plan.graph, action, names)
+
+        for change in changes:
+            result = results[change.name]
+            if result.ok:
+                result.applied = True
+        return results
+
+    def _run_wave(self, executor: ThreadPoolExecutor, results: Dict[str, OperationResult], items: List,
+                  operation, key) -> None:
+        chunks = [items[i:i + self._chunk_size] for i in range(0, len(items), self._chunk_size)]
+        for chunk, outcomes in zip(chunks, executor.map(operation, chunks)):
+            for item, outcome in zip(chunk, outcomes):
+                if outcome.error is not None:
+                    results[key(item)].error = outcome.error
+                else:
+                    # Keep the operation's own result, so its resource is not looked up again
+                    results[key(item)] = outcome
+
+    def _run_transitions(self, executor: ThreadPoolExecutor, results: Dict[str, OperationResult],
+                         graph: DependencyGraph, action: str, names: List[str]) -> None:
+        operation = getattr(self._service, f"{action}_many")
+        if not any(graph.dependencies(name) or graph.dependents(name) for name in names):
+            self._run_wave(executor, results, names, operation, key=lambda name: name)
+            return
+        if action != 'start':
+            # Dependents go first, in waves of the resources nothing left in the set depends on
+            remaining = set(names)
+            while remaining:
+                wave = sorted(name for name in remaining if not graph.dependents(name) & remaining)
+                remaining.difference_update(wave)
+                self._run_wave(executor, results, wave, operation, key=lambda name: name)
+            return
+        runnable = []
+        for name in names:
+            failed = sorted(dependency for dependency in graph.closure([name], 'dependencies')
+                            if dependency in results and not results[dependency].ok)
+            if failed:
+                results[name].error = DomainException(f"Skipped '{name}': dependency '{failed[0]}' failed")
+            else:
+                runnable.append(name)
+        scheduler = DependencyScheduler(self._service, graph, self._workers, FailurePolicy.CONTINUE)
+        report = scheduler.start(runnable)
+        for name in runnable:
+            if report.results[name].ok:
+                results[name] = report.results[name]
+            else:
+                results[name].error = report.results[name].error
+
+    def _scale_chunk(self, changes: List[PlannedChange]) -> List[OperationResult]:
+        outcomes = []
+        for change in changes:
+            outcome = OperationResult(change.name)
+            try:
+                self._service.scale_resource(change.name, change.scale_to)
+                outcome.applied = True
+            except (ValueError, DomainException) as e:
+                outcome.error = e
+            outcomes.append(outcome)
+        return outcomes
@@ -1,37 +1,293 @@
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Optional, Tuple
 from domain.repositories.resource_repository import ResourceRepository
 from application.factories.resource_factory import ResourceFactoryRegistry
-from application.observers.resource_observer import LoggingObserver
+from application.observers.resource_observer import ResourceObserver, dispatch_events
+from application.services.admission_control import AdmissionController
+from application.services.idempotency_cache import IdempotencyCache
 from domain.value_objects import ResourceId
 from domain.entities.resource import Resource
-from domain.exceptions import DuplicateResourceError
+from domain.entities.app_service import AppService
+from domain.engines.release import deferred_release, run_releases
+from domain.exceptions import DuplicateResourceError, InvalidStateTransitionError, ResourceNotFoundException
 
-class ResourceManagementService:
+# Event reported by each transition action
+EVENTS = {'start': 'started', 'stop': 'stopped', 'delete': 'deleted'}
+_ADMITTED = nullcontext()
+
+
+class OperationResult:
+    """Outcome of one item of a bulk operation"""
+    
+    def __init__(self, name: str, applied: bool = False, resource: Optional[Resource] = None,
+                 error: Optional[Exception] = None):
+        self.name = name
+        self.applied = applied
+        self.resource = resource
+        self.error = error
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+    
+    @property
+    def resource_type(self) -> Optional[str]:
+        return self.resource.get_resource_type() if self.resource else None
+    
+    def __repr__(self) -> str:
+        outcome = "applied" if self.applied else f"error={self.error!r}" if self.error else "skipped"
+        return f"OperationResult({self.name!r}, {outcome})"
+
+
+class ResourceOperations:
+    """Public resource operations, with idempotency keys and admission control.
+
+    Every operation that changes resources takes an optional ``idempotency_key``.
+    The outcome of a keyed call, including a domain error, is kept in the
+    ``idempotency`` cache and a repeated call with the same key returns it
+    without running the operation or notifying observers again.
+    
+    With an ``admission`` controller those operations are admitted, delayed or
+    rejected with ThrottledError before they run (and before a replay).
+    
+    Subclasses run the operations themselves: ``_create_resource``,
+    ``_start_resource``, ``_stop_resource``, ``_delete_resource``,
+    ``_scale_resource``, ``_create_many`` and ``_transition_many``.
+    """
+    
+    def __init__(self, idempotency: Optional[IdempotencyCache] = None,
+                 admission: Optional[AdmissionController] = None):
+        self.idempotency = idempotency or IdempotencyCache()
+        self.admission = admission
+    
+    def create_resource(self, resource_type: str, name: str, *, idempotency_key: Optional[str] = None,
+                        **kwargs) -> Resource:
+        with self._admit(types=(resource_type,)):
+            if idempotency_key is None:
+                return self._create_resource(resource_type, name, kwargs)
+            return self.idempotency.run(idempotency_key,
+                                        ('create', resource_type, name, kwargs),
+                                        self._create_resource, resource_type, name, kwargs)
+    
+    def start_resource(self, name: str, idempotency_key: Optional[str] = None) -> None:
+        self._once(idempotency_key, ('start', name), self._start_resource, name)
+    
+    def stop_resource(self, name: str, idempotency_key: Optional[str] = None) -> None:
+        self._once(idempotency_key, ('stop', name), self._stop_resource, name)
+    
+    def delete_resource(self, name: str, idempotency_key: Optional[str] = None) -> None:
+        self._once(idempotency_key, ('delete', name), self._delete_resource, name)
+    
+    def scale_resource(self, name: str, replica_count: int, idempotency_key: Optional[str] = None) -> None:
+        self._once(idempotency_key, ('scale', name, replica_count), self._scale_resource, name, replica_count)
+    
+    def _once(self, idempotency_key: Optional[str], request: Tuple, operation, *args):
+        with self._admit(names=(args[0],)):
+            if idempotency_key is None:
+                return operation(*args)
+            return self.idempotency.run(idempotency_key, request, operation, *args)
+    
+    def _admit(self, types: Iterable[str] = (), names: Iterable[str] = ()):
+        """Admission permit for an operation creating ``types`` or changing ``names``"""
+        if self.admission is None:
+            return _ADMITTED
+        resource_types: Dict[str, int] = {}
+        items = 0
+        for resource_type in types:
+            resource_types[resource_type] = resource_types.get(resource_type, 0) + 1
+            items += 1
+        for name in names:
+            items += 1
+            # Unknown resources still count against the caller; the operation reports the error
+            resource_type = self._resource_type(name)
+            if resource_type is not None:
+                resource_types[resource_type] = resource_types.get(resource_type, 0) + 1
+        return self.admission.admit(resource_types, items)
+    
+    def _resource_type(self, name: str) -> Optional[str]:
+        """Type of the named resource for per-type admission limits, or None when it is not known here"""
+        return None
+    
+    def create_many(self, specs: Iterable[Tuple[str, str, Dict]], atomic: bool = False,
+                    idempotency_key: Optional[str] = None) -> List[OperationResult]:
+        """Create resources from (resource_type, name, kwargs) specs.
+        
+        Every spec is validated before anything is added. With ``atomic`` a single
+        failure leaves the repository untouched; otherwise valid specs are applied.
+        """
+        specs = list(specs)
+        with self._admit(types=(resource_type for resource_type, _, _ in specs)):
+            if idempotency_key is None:
+                return self._create_many(specs, atomic)
+            return self.idempotency.run(idempotency_key, ('create_many', specs, atomic), self._create_many,
+                                        specs, atomic)
+    
+    def start_many(self, names: Iterable[str], atomic: bool = False,
+                   idempotency_key: Optional[str] = None) -> List[OperationResult]:
+        return self._keyed_transition_many('start', names, atomic, idempotency_key)
+    
+    def stop_many(self, names: Iterable[str], atomic: bool = False,
+                  idempotency_key: Optional[str] = None) -> List[OperationResult]:
+        return self._keyed_transition_many('stop', names, atomic, idempotency_key)
+    
+    def delete_many(self, names: Iterable[str], atomic: bool = False,
+                    idempotency_key: Optional[str] = None) -> List[OperationResult]:
+        return self._keyed_transition_many('delete', names, atomic, idempotency_key)
+    
+    def _keyed_transition_many(self, action: str, names: Iterable[str], atomic: bool,
+                               idempotency_key: Optional[str]) -> List[OperationResult]:
+        names = list(names)
+        with self._admit(names=names):
+            if idempotency_key is None:
+                return self._transition_many(action, names, atomic)
+            return self.idempotency.run(idempotency_key, (f'{action}_many', names, atomic),
+                                        self._transition_many, action, names, atomic)
+
+
+class ResourceManagementService(ResourceOperations):
+    """Resource operations over a repository"""
+    
     def __init__(self, repository: ResourceRepository, factory_registry: ResourceFactoryRegistry, 
-                 logging_observer: LoggingObserver):
+                 logging_observer: ResourceObserver, idempotency: Optional[IdempotencyCache] = None,
+                 admission: Optional[AdmissionController] = None):
+        super().__init__(idempotency, admission)
         self._repository = repository
         self._factory_registry = factory_registry
-        self._logging_observer = logging_observer
+        repository.attach_observer(logging_observer)
     
-    def create_resource(self, resource_type: str, name: str, **kwargs) -> Resource:
+    def _create_resource(self, resource_type: str, name: str, kwargs: Dict) -> Resource:
         resource_id = ResourceId(name)
         
         if self._repository.exists(resource_id):
             raise DuplicateResourceError(f"Resource '{name}' already exists")
         
         resource = self._factory_registry.create_resource(resource_type, resource_id, **kwargs)
-        resource.attach_observer(self._logging_observer)
         self._repository.add(resource)
         
         return resource
     
-    def start_resource(self, name: str) -> None:
+    def get_resource(self, name: str) -> Resource:
+        return self._repository.get(ResourceId(name))
+    
+    def _resource_type(self, name: str) -> Optional[str]:
+        try:
+            return self._repository.get(ResourceId(name)).get_resource_type()
+        except (ValueError, ResourceNotFoundException):
+            return None
+    
+    def _start_resource(self, name: str) -> None:
         resource = self._repository.get(ResourceId(name))
         resource.start()
     
-    def stop_resource(self, name: str) -> None:
+    def _stop_resource(self, name: str) -> None:
         resource = self._repository.get(ResourceId(name))
-        resource.stop()
+        with deferred_release() as releases:
+            resource.stop()
+        run_releases(releases)
     
-    def delete_resource(self, name: str) -> None:
+    def _delete_resource(self, name: str) -> None:
         resource = self._repository.get(ResourceId(name))
-        resource.delete()
\ No newline at end of file
+        with deferred_release() as releases:
+            resource.delete()
+        run_releases(releases)
+    
+    def _scale_resource(self, name: str, replica_count: int) -> None:
+        resource = self._repository.get(ResourceId(name))
+        if not isinstance(resource, AppService):
+            raise ValueError(f"Resource '{name}' is not an AppService")
+        previous_config = resource.config
+        resource.scale(replica_count)
+        self._repository.update(resource, previous_config)
+    
+    def list_resources(self, **filters) -> List[Resource]:
+        return sorted(self._repository.query(**filters), key=lambda resource: resource.id.value)
+    
+    def fleet_summary(self) -> Dict:
+        """Resource counts and provisioned capacity across the fleet, read from the repository's rollup"""
+        return self._repository.fleet_rollup().summary()
+    
+    def _validate_creates(self, specs: List[Tuple[str, str, Dict]]) -> List[OperationResult]:
+        """Build the resources of a bulk create without adding them; one result per spec"""
+        results = []
+        seen = set()
+        for resource_type, name, kwargs in specs:
+            result = OperationResult(name)
+            try:
+                resource_id = ResourceId(name)
+                if resource_id in seen or self._repository.exists(resource_id):
+                    raise DuplicateResourceError(f"Resource '{name}' already exists")
+                seen.add(resource_id)
+                # KeyError or TypeError for a missing or ill-typed creation parameter
+                result.resource = self._factory_registry.create_resource(resource_type, resource_id, **kwargs)
+            except (ValueError, KeyError, TypeError, DuplicateResourceError) as e:
+                result.error = e
+            results.append(result)
+        return results
+    
+    def _create_many(self, specs: List[Tuple[str, str, Dict]], atomic: bool) -> List[OperationResult]:
+        results = self._validate_creates(specs)
+        if atomic and not all(result.ok for result in results):
+            return results
+        for result in results:
+            if result.ok:
+                self._repository.add(result.resource)
+                result.applied = True
+        return results
+    
+    def _transition_many(self, action: str, names: List[str], atomic: bool) -> List[OperationResult]:
+        with deferred_release() as releases:
+            results, events = self._apply_transitions(action, names, atomic)
+        self._notify_batch(events)
+        run_releases(releases)
+        return results
+    
+    def _apply_transitions(self, action: str, names: List[str],
+                           atomic: bool) -> Tuple[List[OperationResult], List[Tuple[str, Resource, str]]]:
+        """Validate and apply a batch of transitions without notifying; returns the results and pending events"""
+        results = self._validate_transitions(action, names)
+        if atomic and not all(result.ok for result in results):
+            return results, []
+        event = EVENTS[action]
+        events = []
+        for result in results:
+            if result.ok:
+                getattr(result.resource, action)(notify=False)
+                result.applied = True
+                events.append((event, result.resource, result.resource.get_event_message(event)))
+        return results, events
+    
+    def _validate_transitions(self, action: str, names: List[str]) -> List[OperationResult]:
+        """Check a batch of transitions without applying them; one result per name"""
+        results = []
+        pending = set()
+        for name in names:
+            result = OperationResult(name)
+            try:
+                resource = self._repository.get(ResourceId(name))
+                if resource.id in pending:
+                    raise InvalidStateTransitionError(f"Resource '{name}' appears more than once in the batch")
+                resource.check_transition(action)
+                pending.add(resource.id)
+                result.resource = resource
+            except (ValueError, ResourceNotFoundException, InvalidStateTransitionError) as e:
+                result.error = e
+            results.append(result)
+        return results
+    
+    @staticmethod
+    def _notify_batch(events: List[Tuple[str, Resource, str]], records_state: Optional[bool] = None) -> None:
+        """Deliver the events to each observer as one batch, preserving order.
+        
+        With ``records_state`` only the observers whose ``records_state`` flag matches it are notified.
+        """
+        batches: Dict[object, List[Tuple[str, Resource, str]]] = {}
+        for event in events:
+            for observer in event[1].observers:
+                if records_state is None or getattr(observer, 'records_state', False) == records_state:
+                    batches.setdefault(observer, []).append(event)
+        for observer, batch in batches.items():
+            on_batch = getattr(observer, 'on_batch', None)
+            if on_batch:
+                on_batch(batch)
+            else:
+                dispatch_events(observer, batch)
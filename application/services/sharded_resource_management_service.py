@@ -0,0 +1,478 @@
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+from application.factories.resource_factory import ResourceFactoryRegistry
+from application.observers.resource_observer import ResourceObserver, dispatch_events
+from application.services.admission_control import AdmissionController
+from application.services.idempotency_cache import IdempotencyCache
+from application.services.resource_management_service import (
+    OperationResult,
+    ResourceManagementService,
+    ResourceOperations,
+)
+from domain.entities.resource import Resource
+from domain.repositories.fleet_rollup import FleetRollup
+from domain.repositories.resource_repository import ResourceRepository
+from domain.value_objects import ResourceId
+
+_SHARD_FILE = "shards.json"
+_TRANSITIONS = ('start_many', 'stop_many', 'delete_many')
+
+# Calls are forwarded as (method, args) and answered with (True, value) or (False, exception).
+# Lifecycle event as shipped from a shard: (event, resource type, resource name, message)
+ShippedEvent = Tuple[str, str, str, str]
+
+
+def shard_of(resource_id: ResourceId, shard_count: int) -> int:
+    return resource_id.stable_hash() % shard_count
+
+
+class ShardError(Exception):
+    """An exception raised in a shard that could not be sent back to the router as it was"""
+    pass
+
+
+class ShardResource:
+    """Stand-in for a resource of a shard, passed to the router's observers with its lifecycle events.
+
+    It carries only the id and type; the event itself tells the state. The
+    router keeps one per resource while it is referenced, so observers see the
+    same object for every event of a resource.
+    """
+
+    __slots__ = ('_id', '_resource_type', '__weakref__')
+
+    def __init__(self, resource_id: ResourceId, resource_type: str):
+        self._id = resource_id
+        self._resource_type = resource_type
+
+    @property
+    def id(self) -> ResourceId:
+        return self._id
+
+    def get_resource_type(self) -> str:
+        return self._resource_type
+
+
+class _EventCollector(ResourceObserver):
+    """Observer of a shard's resources; events travel back to the router with the next reply"""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.events: List[ShippedEvent] = []
+
+    def on_resource_started(self, resource: Resource, message: str) -> None:
+        self.on_batch([('started', resource, message)])
+
+    def on_resource_stopped(self, resource: Resource, message: str) -> None:
+        self.on_batch([('stopped', resource, message)])
+
+    def on_resource_deleted(self, resource: Resource, message: str) -> None:
+        self.on_batch([('deleted', resource, message)])
+
+    def on_batch(self, events: List) -> None:
+        if self.enabled:
+            self.events.extend((event, resource.get_resource_type(), resource.id.value, message)
+                               for event, resource, message in events)
+
+    def take(self) -> List[ShippedEvent]:
+        events, self.events = self.events, []
+        return events
+
+
+class _Shard:
+    """Runs forwarded calls inside a worker process against the partition it owns"""
+
+    def __init__(self, factory_registry: ResourceFactoryRegistry, repository: ResourceRepository,
+                 collector: _EventCollector):
+        from infrastructure.persistence.durable_repository import encode_resource
+        self._encode = encode_resource
+        self._repository = repository
+        self._service = ResourceManagementService(repository, factory_registry, collector)
+
+    def execute(self, method: str, args: tuple):
+        service = self._service
+        if method == 'create_many':
+            return [(result.name, result.applied, self._encode(result.resource) if result.applied else None,
+                     _portable(result.error)) for result in service.create_many(*args)]
+        if method in _TRANSITIONS:
+            # Transition results stay small: the router fetches a snapshot only if one is asked for
+            return [(result.name, result.applied, result.resource_type, _portable(result.error))
+                    for result in getattr(service, method)(*args)]
+        if method == 'check_many':
+            return self._check(*args)
+        if method == 'create_resource':
+            resource_type, name, kwargs = args
+            return self._encode(service.create_resource(resource_type, name, **kwargs))
+        if method == 'get_resource':
+            return self._encode(service.get_resource(*args))
+        if method == 'list_resources':
+            return [self._encode(resource) for resource in service.list_resources(**args[0])]
+        if method == 'fleet_totals':
+            return self._repository.fleet_rollup().totals()
+        if method in ('start_resource', 'stop_resource', 'delete_resource', 'scale_resource'):
+            return getattr(service, method)(*args)
+        raise ValueError(f"Unknown shard call: {method}")
+
+    def _check(self, action: str, items: List) -> List[Optional[Exception]]:
+        """Validate a bulk operation without applying it; one error (or None) per item"""
+        if action == 'create':
+            results = self._service._validate_creates(items)
+        else:
+            results = self._service._validate_transitions(action, items)
+        return [_portable(result.error) for result in results]
+
+
+def _serve_shard(connection, factory_registry: ResourceFactoryRegistry, data_directory: Optional[str],
+                 ship_events: bool) -> None:
+    """Worker process loop: receive a batch of calls, run them in order, reply with the outcomes and events"""
+    if data_directory:
+        from infrastructure.persistence.durable_repository import DurableResourceRepository
+        repository = DurableResourceRepository(data_directory, factory_registry)
+    else:
+        repository = ResourceRepository()
+    collector = _EventCollector(ship_events)
+    shard = _Shard(factory_registry, repository, collector)
+    try:
+        while True:
+            try:
+                calls = connection.recv()
+            except EOFError:
+                break
+            if calls is None:
+                break
+            outcomes = []
+            for method, args in calls:
+                try:
+                    outcomes.append((True, shard.execute(method, args)))
+                except Exception as e:
+                    outcomes.append((False, _portable(e)))
+            connection.send((outcomes, collector.take()))
+    finally:
+        if hasattr(repository, 'close'):
+            repository.close()
+        connection.close()
+
+
+def _portable(error: Optional[Exception]) -> Optional[Exception]:
+    """``error``, or a ShardError describing it when it would not survive the trip back to the router"""
+    if error is None:
+        return None
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        return ShardError(f"{type(error).__name__}: {error}")
+    return error
+
+
+class _ShardClient:
+    """Router side of one shard: queues calls and forwards them in batches, one batch in flight at a time.
+
+    Calls submitted while a batch is in flight travel together in the next
+    message, so concurrent callers share round trips. If the exchange with the
+    worker fails the shard is marked dead: every outstanding call and every
+    later one fails with ConnectionError.
+    """
+
+    def __init__(self, index: int, connection, process, max_batch: int,
+                 on_events: Callable[[List[ShippedEvent]], None]):
+        self.index = index
+        self.process = process
+        self._connection = connection
+        self._max_batch = max_batch
+        self._on_events = on_events
+        self._pending: deque = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.error: Optional[ConnectionError] = None
+        self.batches = 0
+        self.calls = 0
+        self._thread = threading.Thread(target=self._run, name=f"shard-{index}-router", daemon=True)
+        self._thread.start()
+
+    def submit(self, method: str, *args) -> Future:
+        future = Future()
+        with self._condition:
+            if self.error is not None:
+                raise self.error
+            if self._closed:
+                raise ConnectionError(f"Shard {self.index} is closed")
+            self._pending.append(((method, args), future))
+            self._condition.notify()
+        return future
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                batch = [self._pending.popleft() for _ in range(min(len(self._pending), self._max_batch))]
+            try:
+                self._connection.send([call for call, _ in batch])
+                outcomes, events = self._connection.recv()
+            except Exception as e:
+                # The pipe is broken or out of step with the worker: no later reply can be trusted
+                self._fail(batch, ConnectionError(f"Shard {self.index} is not running: {e!r}"))
+                return
+            self.batches += 1
+            self.calls += len(batch)
+            if events:
+                try:
+                    self._on_events(events)
+                except Exception:
+                    logging.getLogger(__name__).exception("Delivering the events of shard %d failed", self.index)
+            for (ok, value), (_, future) in zip(outcomes, batch):
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def _fail(self, batch: List, error: ConnectionError) -> None:
+        with self._condition:
+            self.error = error
+            batch.extend(self._pending)
+            self._pending.clear()
+        for _, future in batch:
+            future.set_exception(error)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        try:
+            self._connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join()
+        self._connection.close()
+
+
+_OPEN_SERVICES: 'weakref.WeakSet[ShardedResourceManagementService]' = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_services() -> None:
+    for service in list(_OPEN_SERVICES):
+        service.close()
+
+
+class ShardedResourceManagementService(ResourceOperations):
+    """Routes ResourceManagementService calls to worker processes that each own a partition of the resources.
+
+    A resource lives on shard ``ResourceId.stable_hash() % shard_count``. Calls
+    travel over pipes in batches; bulk operations are split per shard and run
+    on all shards in parallel, and ``list_resources`` scatters the query and
+    merges the answers. With ``data_directory`` every shard persists to its own
+    DurableResourceRepository under it, and reopening with a different shard
+    count is refused. Resources returned by the router are detached snapshots:
+    change them through the service. Lifecycle events reach
+    ``logging_observer`` in this process as each shard replies, with a
+    ShardResource standing in for the resource. A bulk call
+    with ``atomic`` that spans shards validates on every shard before applying,
+    so a concurrent change between the two steps can still fail an item.
+    Idempotency keys and ``admission`` are handled by the router as in
+    ResourceOperations; since the router does not know the type of a resource
+    by name, only creates count against per-type limits.
+    """
+
+    def __init__(self, factory_registry: ResourceFactoryRegistry, logging_observer: Optional[ResourceObserver] = None,
+                 shard_count: Optional[int] = None, data_directory: Optional[str] = None, max_batch: int = 1024,
+                 start_method: str = "spawn", idempotency: Optional[IdempotencyCache] = None,
+                 admission: Optional[AdmissionController] = None):
+        super().__init__(idempotency, admission)
+        self._factory_registry = factory_registry
+        self._logging_observer = logging_observer
+        self._shard_count = max(shard_count or os.cpu_count() or 1, 1)
+        if data_directory:
+            self._check_layout(data_directory)
+        context = multiprocessing.get_context(start_method)
+        self._shards: List[_ShardClient] = []
+        # Event stand-ins by resource name, per shard, so each router thread only touches its own
+        self._event_resources: List['weakref.WeakValueDictionary[str, ShardResource]'] = [
+            weakref.WeakValueDictionary() for _ in range(self._shard_count)]
+        for index in range(self._shard_count):
+            router_end, worker_end = context.Pipe()
+            directory = os.path.join(data_directory, f"shard-{index}") if data_directory else None
+            process = context.Process(target=_serve_shard, name=f"cloudconnect-shard-{index}", daemon=True,
+                                      args=(worker_end, factory_registry, directory, logging_observer is not None))
+            process.start()
+            worker_end.close()
+            self._shards.append(_ShardClient(index, router_end, process, max(max_batch, 1),
+                                             partial(self._deliver, index)))
+        self._closed = False
+        _OPEN_SERVICES.add(self)
+
+    @property
+    def shard_count(self) -> int:
+        return self._shard_count
+
+    def _check_layout(self, data_directory: str) -> None:
+        os.makedirs(data_directory, exist_ok=True)
+        path = os.path.join(data_directory, _SHARD_FILE)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                stored = json.load(f)["shard_count"]
+            if stored != self._shard_count:
+                raise ValueError(f"'{data_directory}' holds {stored} shards; cannot open it with {self._shard_count}")
+        else:
+            with open(path, 'w') as f:
+                json.dump({"shard_count": self._shard_count}, f)
+
+    def _shard_for(self, name: str) -> _ShardClient:
+        return self._shards[shard_of(ResourceId(name), self._shard_count)]
+
+    def _call(self, name: str, method: str, *args):
+        return self._shard_for(name).submit(method, *args).result()
+
+    def _snapshot(self, record: Dict) -> Resource:
+        from infrastructure.persistence.durable_repository import decode_resource
+        return decode_resource(record, self._factory_registry)
+
+    def _deliver(self, index: int, events: List[ShippedEvent]) -> None:
+        resources = self._event_resources[index]
+        batch = []
+        for event, resource_type, name, message in events:
+            resource = resources.get(name)
+            if resource is None or resource.get_resource_type() != resource_type:
+                resource = resources[name] = ShardResource(ResourceId(name), resource_type)
+            batch.append((event, resource, message))
+        on_batch = getattr(self._logging_observer, 'on_batch', None)
+        if on_batch:
+            on_batch(batch)
+        else:
+            dispatch_events(self._logging_observer, batch)
+
+    def _create_resource(self, resource_type: str, name: str, kwargs: Dict) -> Resource:
+        return self._snapshot(self._call(name, 'create_resource', resource_type, name, kwargs))
+
+    def get_resource(self, name: str) -> Resource:
+        return self._snapshot(self._call(name, 'get_resource', name))
+
+    def _start_resource(self, name: str) -> None:
+        self._call(name, 'start_resource', name)
+
+    def _stop_resource(self, name: str) -> None:
+        self._call(name, 'stop_resource', name)
+
+    def _delete_resource(self, name: str) -> None:
+        self._call(name, 'delete_resource', name)
+
+    def _scale_resource(self, name: str, replica_count: int) -> None:
+        self._call(name, 'scale_resource', name, replica_count)
+
+    def list_resources(self, **filters) -> List[Resource]:
+        futures = [shard.submit('list_resources', filters) for shard in self._shards]
+        records = [record for future in futures for record in future.result()]
+        records.sort(key=lambda record: record["n"])
+        return [self._snapshot(record) for record in records]
+
+    def fleet_summary(self) -> Dict:
+        # Each shard ships its raw totals, which add up; only the merged totals are summarized
+        futures = [shard.submit('fleet_totals') for shard in self._shards]
+        return FleetRollup.merged(future.result() for future in futures).summary()
+
+    def _create_many(self, specs: List[Tuple[str, str, Dict]], atomic: bool) -> List[OperationResult]:
+        return self._scatter('create', specs, [name for _, name, _ in specs], atomic)
+
+    def _transition_many(self, action: str, names: List[str], atomic: bool) -> List[OperationResult]:
+        return self._scatter(action, names, names, atomic)
+
+    def _scatter(self, action: str, items: List, names: List[str], atomic: bool) -> List[OperationResult]:
+        """Split a bulk operation per shard, run the parts in parallel and reassemble the results in input order"""
+        results: List[Optional[OperationResult]] = [None] * len(items)
+        parts: Dict[int, List[int]] = {}
+        for position, name in enumerate(names):
+            try:
+                parts.setdefault(shard_of(ResourceId(name), self._shard_count), []).append(position)
+            except ValueError as e:
+                results[position] = OperationResult(name, error=e)
+        if atomic and any(result is not None for result in results):
+            return self._unapplied(results, names)
+        if atomic and len(parts) > 1:
+            futures = {index: self._shards[index].submit('check_many', action, [items[p] for p in positions])
+                       for index, positions in parts.items()}
+            failed = False
+            for index, future in futures.items():
+                for position, error in zip(parts[index], future.result()):
+                    if error is not None:
+                        results[position] = OperationResult(names[position], error=error)
+                        failed = True
+            if failed:
+                return self._unapplied(results, names)
+        futures = {index: self._shards[index].submit(f"{action}_many", [items[p] for p in positions], atomic)
+                   for index, positions in parts.items()}
+        for index, future in futures.items():
+            for position, (name, applied, detail, error) in zip(parts[index], future.result()):
+                if action == 'create':
+                    result = _ShardOperationResult(name, applied, error, self._snapshot, record=detail)
+                else:
+                    result = _ShardOperationResult(name, applied, error, self.get_resource, resource_type=detail)
+                results[position] = result
+        return results
+
+    @staticmethod
+    def _unapplied(results: List[Optional[OperationResult]], names: List[str]) -> List[OperationResult]:
+        return [result or OperationResult(name) for result, name in zip(results, names)]
+
+    def stats(self) -> Dict[int, Dict]:
+        """Forwarded calls and round trips per shard; calls / batches is the achieved batching factor"""
+        return {shard.index: {"calls": shard.calls, "batches": shard.batches,
+                              "alive": shard.error is None and shard.process.is_alive()}
+                for shard in self._shards}
+
+    def close(self) -> None:
+        """Stop the workers; durable shards flush and close their repositories"""
+        if self._closed:
+            return
+        self._closed = True
+        for shard in self._shards:
+            shard.close()
+        _OPEN_SERVICES.discard(self)
+
+    def __enter__(self) -> 'ShardedResourceManagementService':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _ShardOperationResult(OperationResult):
+    """OperationResult whose resource snapshot is built only when it is read.
+
+    Creates carry the encoded resource; transitions carry just its type and
+    fetch the current snapshot from the shard on first access.
+    """
+
+    def __init__(self, name: str, applied: bool, error: Optional[Exception], load: Callable,
+                 record: Optional[Dict] = None, resource_type: Optional[str] = None):
+        super().__init__(name, applied, None, error)
+        self._load = load
+        self._record = record
+        self._resource_type = record["t"] if record else resource_type
+
+    @property
+    def resource(self) -> Optional[Resource]:
+        if self._resource is None and self._resource_type is not None:
+            self._resource = self._load(self._record) if self._record else self._load(self.name)
+            self._record = None
+        return self._resource
+
+    @resource.setter
+    def resource(self, resource: Optional[Resource]) -> None:
+        self._resource = resource
+
+    @property
+    def resource_type(self) -> Optional[str]:
+        return self._resource_type
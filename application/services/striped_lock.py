@@ -0,0 +1,40 @@
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterable, Iterator
+
+
+class StripedLock:
+    """Fixed pool of locks selected by key hash.
+
+    Keys that map to the same stripe are serialized; keys on different stripes
+    proceed in parallel. Multi-key acquisition always takes stripes in index
+    order so concurrent batches cannot deadlock.
+    """
+
+    def __init__(self, stripes: int = 64):
+        if stripes < 1:
+            raise ValueError("Stripe count must be at least 1")
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    @property
+    def stripes(self) -> int:
+        return len(self._locks)
+
+    def index(self, key: Hashable) -> int:
+        return hash(key) % len(self._locks)
+
+    def for_key(self, key: Hashable) -> threading.Lock:
+        return self._locks[self.index(key)]
+
+    @contextmanager
+    def acquire_all(self, keys: Iterable[Hashable]) -> Iterator[None]:
+        indices = sorted({self.index(key) for key in keys})
+        acquired = []
+        try:
+            for index in indices:
+                self._locks[index].acquire()
+                acquired.append(index)
+            yield
+        finally:
+            for index in reversed(acquired):
+                self._locks[index].release()
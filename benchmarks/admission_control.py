@@ -0,0 +1,107 @@
+import argparse
+import statistics
+import threading
+import time
+from typing import Dict, List, Optional
+from application.observers.resource_observer import ResourceObserver
+from application.services.admission_control import AdmissionController, OverloadPolicy, RateLimit, acting_as
+from application.services.resource_management_service import ResourceManagementService
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.exceptions import ThrottledError
+from domain.repositories.resource_repository import ResourceRepository
+
+
+class _NoOpObserver(ResourceObserver):
+    def on_resource_started(self, resource, message: str) -> None:
+        pass
+
+    def on_resource_stopped(self, resource, message: str) -> None:
+        pass
+
+    def on_resource_deleted(self, resource, message: str) -> None:
+        pass
+
+
+def overhead(count: int) -> None:
+    """Cost of the admission check on start/stop calls"""
+    configurations = (
+        ("no admission control", None),
+        ("per-caller rate limit", AdmissionController(per_caller=RateLimit(1e9, 1e9))),
+        ("caller + type limits", AdmissionController(per_caller=RateLimit(1e9, 1e9),
+                                                     per_type={"CacheDB": RateLimit(1e9, 1e9)})),
+        ("limits + in-flight cap", AdmissionController(per_caller=RateLimit(1e9, 1e9), max_in_flight=64)),
+    )
+    specs = [resource_spec(i) for i in range(count)]
+    for label, admission in configurations:
+        service = ResourceManagementService(ResourceRepository(), build_registry(), _NoOpObserver(),
+                                            admission=admission)
+        service.create_many(specs)
+        with Timer() as t:
+            for _, name, _ in specs:
+                service.start_resource(name)
+                service.stop_resource(name)
+        report(label, 2 * count, t.elapsed)
+
+
+def flood(label: str, admission: Optional[AdmissionController], duration: float, work: float,
+          flooding_threads: int) -> None:
+    """One caller floods from many threads while another sends one request at a time.
+
+    Each admitted operation holds the backend for ``work`` seconds, as a slow disk or downstream call would.
+    """
+    backend = threading.Lock()
+    latencies: Dict[str, List[float]] = {"flooder": [], "light": []}
+    rejected = {"flooder": 0, "light": 0}
+    deadline = time.perf_counter() + duration
+
+    def client(caller: str) -> None:
+        with acting_as(caller):
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    permit = admission.admit({"AppService": 1}) if admission is not None else None
+                except ThrottledError as e:
+                    rejected[caller] += 1
+                    time.sleep(min(e.retry_after or work, 0.05))
+                    continue
+                try:
+                    with backend:
+                        time.sleep(work)
+                finally:
+                    if permit is not None:
+                        permit.__exit__(None, None, None)
+                latencies[caller].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=("flooder",)) for _ in range(flooding_threads)]
+    threads.append(threading.Thread(target=client, args=("light",)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(label)
+    for caller, samples in latencies.items():
+        quantiles = statistics.quantiles(samples, n=100) if len(samples) > 1 else [0.0] * 99
+        print(f"  {caller:<8} {len(samples) / duration:8.1f} ops/s  p50 {quantiles[49] * 1000:8.1f} ms  "
+              f"p99 {quantiles[98] * 1000:8.1f} ms  rejected {rejected[caller]:,}")
+    if admission is not None:
+        print(f"  {admission.stats()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Admission control cost and its effect on a noisy neighbour")
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per flood scenario")
+    parser.add_argument("--work", type=float, default=0.002, help="seconds each operation holds the backend")
+    parser.add_argument("--threads", type=int, default=16, help="threads of the flooding caller")
+    args = parser.parse_args()
+    overhead(args.count)
+    capacity = 1 / args.work
+    flood("no admission control", None, args.duration, args.work, args.threads)
+    flood("fair queue, 2 in flight", AdmissionController(max_in_flight=2, policy=OverloadPolicy.QUEUE),
+          args.duration, args.work, args.threads)
+    flood(f"per-caller limit of {capacity / 2:.0f} ops/s, reject",
+          AdmissionController(per_caller=RateLimit(capacity / 2, 10)), args.duration, args.work, args.threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+import time
+from application.observers.resource_observer import LoggingObserver
+from application.services.async_resource_management_service import AsyncResourceManagementService
+from application.services.latency_simulator import FixedLatencySimulator
+from application.services.resource_management_service import ResourceManagementService
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.repositories.resource_repository import ResourceRepository
+from infrastructure.logging.logger import Logger
+
+
+def run_sync(specs, latency: FixedLatencySimulator, logger: Logger) -> float:
+    """Synchronous baseline: each operation blocks for its simulated latency"""
+    service = ResourceManagementService(ResourceRepository(), build_registry(), LoggingObserver(logger))
+    with Timer() as t:
+        for resource_type, name, kwargs in specs:
+            time.sleep(latency.delay(resource_type, 'create'))
+            service.create_resource(resource_type, name, **kwargs)
+        for resource_type, name, _ in specs:
+            time.sleep(latency.delay(resource_type, 'start'))
+            service.start_resource(name)
+    return t.elapsed
+
+
+async def run_async(specs, latency: FixedLatencySimulator, logger: Logger, concurrency: int) -> float:
+    service = AsyncResourceManagementService(ResourceRepository(), build_registry(), LoggingObserver(logger),
+                                             latency, max_concurrency=concurrency)
+    with Timer() as t:
+        await service.create_many(specs)
+        await service.start_many([name for _, name, _ in specs])
+    return t.elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput of the async service versus the sync service")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per simulated operation")
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--log-directory", default="bench_logs")
+    args = parser.parse_args()
+
+    latency = FixedLatencySimulator({}, default=args.latency)
+    specs = [resource_spec(i) for i in range(args.count)]
+    logger = Logger(args.log_directory, echo=False)
+    operations = args.count * 2
+    sync_elapsed = run_sync(specs, latency, logger)
+    report("sync service (create + start)", operations, sync_elapsed)
+    async_elapsed = asyncio.run(run_async(specs, latency, logger, args.concurrency))
+    report(f"async service, concurrency {args.concurrency}", operations, async_elapsed)
+    print(f"speed-up: {sync_elapsed / async_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+from benchmarks.common import Timer, report, resource_spec
+
+
+def write_commands(path: str, count: int) -> int:
+    """Create, start and stop ``count`` resources, then list them; returns the number of lines"""
+    lines = []
+    for i in range(count):
+        resource_type, name, kwargs = resource_spec(i)
+        config = {key: getattr(value, 'value', value) for key, value in kwargs.items()}
+        lines.append({"op": "create", "type": resource_type, "name": name, "config": config})
+    for op in ("start", "stop"):
+        lines.extend({"op": op, "name": f"res-{i}"} for i in range(count))
+    lines.append({"op": "list", "state": "Stopped"})
+    with open(path, 'w') as f:
+        f.write("\n".join(json.dumps(line) for line in lines) + "\n")
+    return len(lines)
+
+
+def run(count: int) -> None:
+    import main
+
+    directory = tempfile.mkdtemp(prefix="cloudconnect-batch-")
+    cwd = os.getcwd()
+    try:
+        os.chdir(directory)
+        lines = write_commands("commands.jsonl", count)
+        with open("results.jsonl", 'w') as output, contextlib.redirect_stdout(output), Timer() as t:
+            exit_code = main.main(["batch", "commands.jsonl"])
+        report("batch (durable repository)", lines, t.elapsed)
+        if exit_code:
+            raise SystemExit("batch reported failures")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end throughput of the JSON-lines batch mode")
+    parser.add_argument("--count", type=int, default=20_000)
+    args = parser.parse_args()
+    run(args.count)
+
+
+if __name__ == "__main__":
+    main()
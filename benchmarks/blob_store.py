@@ -0,0 +1,49 @@
+import argparse
+import os
+import shutil
+import tempfile
+from benchmarks.common import Timer
+from domain.engines.blob_store import BlobStore
+
+
+def run(small_size: int, small_count: int, large_size: int, large_count: int) -> None:
+    directory = tempfile.mkdtemp(prefix="cloudconnect-blobs-")
+    try:
+        print(f"{'workload':<34} {'upload MB/s':>12} {'stream MB/s':>12} {'mmap/view MB/s':>15}")
+        for encrypted in (False, True):
+            secret = b"benchmark" if encrypted else None
+            for label, size, count in (("small", small_size, small_count), ("large", large_size, large_count)):
+                root = os.path.join(directory, f"{label}-{encrypted}")
+                store = BlobStore(root, quota_bytes=size * count * 2, secret=secret)
+                payload = os.urandom(size)
+                total_mb = size * count / 1024 / 1024
+                with Timer() as upload:
+                    for i in range(count):
+                        store.put(f"blob-{i}", payload)
+                with Timer() as stream:
+                    for i in range(count):
+                        for _ in store.iter_chunks(f"blob-{i}"):
+                            pass
+                with Timer() as view:
+                    for i in range(count):
+                        with store.read_view(f"blob-{i}") as blob:
+                            blob[-1:].tobytes()
+                name = f"{count} x {size // 1024} KiB{' encrypted' if encrypted else ''}"
+                print(f"{name:<34} {total_mb / upload.elapsed:>12.1f} {total_mb / stream.elapsed:>12.1f} "
+                      f"{total_mb / view.elapsed:>15.1f}")
+    finally:
+        shutil.rmtree(directory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Blob store throughput for small and large objects")
+    parser.add_argument("--small-size", type=int, default=4 * 1024)
+    parser.add_argument("--small-count", type=int, default=2000)
+    parser.add_argument("--large-size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--large-count", type=int, default=4)
+    args = parser.parse_args()
+    run(args.small_size, args.small_count, args.large_size, args.large_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import shutil
+import tempfile
+from application.observers.resource_observer import LoggingObserver
+from application.services.resource_management_service import ResourceManagementService
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.repositories.resource_repository import ResourceRepository
+from infrastructure.logging.logger import Logger
+
+
+def build_service(log_directory: str) -> ResourceManagementService:
+    logger = Logger(log_directory, echo=False)
+    return ResourceManagementService(ResourceRepository(), build_registry(), LoggingObserver(logger))
+
+
+def run(count: int) -> None:
+    specs = [resource_spec(i) for i in range(count)]
+    names = [name for _, name, _ in specs]
+    directory = tempfile.mkdtemp(prefix="cloudconnect-bulk-")
+    try:
+        service = build_service(f"{directory}/single")
+        with Timer() as t:
+            for resource_type, name, kwargs in specs:
+                service.create_resource(resource_type, name, **kwargs)
+        report("create_resource loop", count, t.elapsed)
+        for label, operation in (("start", service.start_resource), ("stop", service.stop_resource),
+                                 ("delete", service.delete_resource)):
+            with Timer() as t:
+                for name in names:
+                    operation(name)
+            report(f"{label}_resource loop", count, t.elapsed)
+
+        service = build_service(f"{directory}/bulk")
+        with Timer() as t:
+            service.create_many(specs)
+        report("create_many", count, t.elapsed)
+        for label, operation in (("start", service.start_many), ("stop", service.stop_many),
+                                 ("delete", service.delete_many)):
+            with Timer() as t:
+                operation(names)
+            report(f"{label}_many", count, t.elapsed)
+    finally:
+        shutil.rmtree(directory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-item cost of bulk operations versus single-item calls")
+    parser.add_argument("--count", type=int, default=10_000)
+    args = parser.parse_args()
+    run(args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import random
+import time
+from domain.engines.cache_engine import CacheEngine
+from domain.value_objects import EvictionPolicy
+
+
+def percentile(samples, fraction: float) -> float:
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def run(operations: int, keys: int, capacity_mb: int, value_size: int, read_ratio: float, seed: int) -> None:
+    rng = random.Random(seed)
+    # Skewed key popularity so the policies differ in hit rate
+    workload = [(rng.random() < read_ratio, f"key-{int(keys * rng.random() ** 3)}")
+                for _ in range(operations)]
+    value = b"x" * value_size
+    print(f"{'policy':<6} {'ops/s':>12} {'p50 us':>8} {'p99 us':>8} {'hit rate':>9} {'evictions':>10}")
+    for policy in EvictionPolicy:
+        engine = CacheEngine(capacity_mb * 1024 * 1024, policy, default_ttl=3600, sweep_interval=None)
+        latencies = []
+        clock = time.perf_counter_ns
+        start = clock()
+        for is_read, key in workload:
+            before = clock()
+            if is_read:
+                if engine.get(key) is None:
+                    engine.set(key, value)
+            else:
+                engine.set(key, value)
+            latencies.append(clock() - before)
+        elapsed = (clock() - start) / 1e9
+        latencies.sort()
+        stats = engine.stats()
+        print(f"{policy.value:<6} {operations / elapsed:>12,.0f} {percentile(latencies, 0.5) / 1000:>8.2f} "
+              f"{percentile(latencies, 0.99) / 1000:>8.2f} {stats['hit_rate']:>9.1%} {stats['evictions']:>10}")
+        engine.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput, latency and hit rate of each cache eviction policy")
+    parser.add_argument("--operations", type=int, default=500_000)
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--capacity-mb", type=int, default=2)
+    parser.add_argument("--value-size", type=int, default=256)
+    parser.add_argument("--read-ratio", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    run(args.operations, args.keys, args.capacity_mb, args.value_size, args.read_ratio, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+from collections import Counter
+from benchmarks.common import Timer, build_registry, resource_spec
+from domain.repositories.columnar_resource_repository import ColumnarResourceRepository
+from domain.repositories.resource_repository import ResourceRepository
+from domain.value_objects import ResourceId, Region
+
+
+def timed(label: str, action) -> None:
+    with Timer() as t:
+        result = action()
+    print(f"{label:<66} {t.elapsed * 1000:9.2f} ms  {result}")
+
+
+def run(count: int) -> None:
+    registry = build_registry()
+    objects = ResourceRepository()
+    columns = ColumnarResourceRepository()
+    with Timer() as t:
+        for i in range(count):
+            resource_type, name, kwargs = resource_spec(i)
+            resource = registry.create_resource(resource_type, ResourceId(name), **kwargs)
+            objects.add(resource)
+            columns.add(registry.create_resource(resource_type, ResourceId(name), **kwargs))
+            if i % 4 == 0:
+                resource.start()
+                columns.get(resource.id).start()
+    print(f"loaded {count} resources into both repositories in {t.elapsed:.1f} s\n")
+
+    timed("object scan: count per state",
+          lambda: dict(Counter(resource.state for resource in objects.all())))
+    timed("columnar: count per state", lambda: columns.count_by('state'))
+
+    timed("object scan: Started AppServices per region",
+          lambda: dict(Counter(r.config['region'] for r in objects.all()
+                               if r.get_resource_type() == 'AppService' and r.state == 'Started')))
+    timed("columnar: Started AppServices per region",
+          lambda: columns.count_by('region', resource_type='AppService', state='Started'))
+
+    def scan_capacity():
+        totals = Counter()
+        for resource in objects.all():
+            if resource.get_resource_type() == 'CacheDB':
+                config = resource.config
+                totals[config['eviction_policy']] += config['capacity_mb']
+        return dict(totals)
+    timed("object scan: total CacheDB capacity by eviction policy", scan_capacity)
+    timed("columnar: total CacheDB capacity by eviction policy",
+          lambda: columns.sum_by('capacity_mb', 'eviction_policy'))
+
+    timed("secondary index: count WestEurope AppServices with <= 3 replicas",
+          lambda: objects.count(region=Region.WEST_EUROPE, replica_count=(None, 3)))
+    timed("columnar: count WestEurope AppServices with <= 3 replicas",
+          lambda: columns.count(region=Region.WEST_EUROPE, replica_count=(None, 3)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fleet analytics on the columnar store versus object scans")
+    parser.add_argument("--count", type=int, default=300_000)
+    args = parser.parse_args()
+    run(args.count)
+
+
+if __name__ == "__main__":
+    main()
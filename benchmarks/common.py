@@ -0,0 +1,48 @@
+import time
+from typing import Dict, Tuple
+from application.factories.resource_factory import (
+    ResourceFactoryRegistry,
+    AppServiceFactory,
+    StorageAccountFactory,
+    CacheDBFactory
+)
+from domain.value_objects import Runtime, Region, EvictionPolicy
+
+RESOURCE_TYPES = ('AppService', 'StorageAccount', 'CacheDB')
+
+
+def build_registry() -> ResourceFactoryRegistry:
+    registry = ResourceFactoryRegistry()
+    registry.register('AppService', AppServiceFactory())
+    registry.register('StorageAccount', StorageAccountFactory())
+    registry.register('CacheDB', CacheDBFactory())
+    return registry
+
+
+def resource_spec(i: int) -> Tuple[str, str, Dict]:
+    """Deterministic (type, name, kwargs) for the i-th synthetic resource"""
+    resource_type = RESOURCE_TYPES[i % 3]
+    name = f"res-{i}"
+    if resource_type == 'AppService':
+        kwargs = {"runtime": list(Runtime)[(i // 3) % 3], "region": list(Region)[(i // 9) % 3],
+                  "replica_count": i % 10 + 1}
+    elif resource_type == 'StorageAccount':
+        kwargs = {"encryption_enabled": i % 2 == 0, "access_key": "k" * 16, "max_size_gb": i % 1000 + 1}
+    else:
+        kwargs = {"ttl_seconds": i % 3600 + 1, "capacity_mb": i % 1024 + 1,
+                  "eviction_policy": list(EvictionPolicy)[(i // 3) % 3]}
+    return resource_type, name, kwargs
+
+
+class Timer:
+    def __enter__(self) -> 'Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elapsed = time.perf_counter() - self.start
+
+
+def report(label: str, count: int, elapsed: float) -> None:
+    rate = count / elapsed if elapsed else float('inf')
+    print(f"{label:<40} {count:>10} ops  {elapsed:8.3f} s  {rate:12,.0f} ops/s")
@@ -0,0 +1,127 @@
+import argparse
+import random
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from application.observers.resource_observer import ResourceObserver
+from application.services.concurrent_resource_management_service import ConcurrentResourceManagementService
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.entities.resource import Resource
+from domain.exceptions import DuplicateResourceError, InvalidStateTransitionError
+from domain.repositories.resource_repository import ResourceRepository
+
+
+class CountingObserver(ResourceObserver):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.events = Counter()
+
+    def _record(self, resource: Resource, event: str) -> None:
+        with self._lock:
+            self.events[(resource.id.value, event)] += 1
+
+    def on_resource_started(self, resource: Resource, message: str) -> None:
+        self._record(resource, 'start')
+
+    def on_resource_stopped(self, resource: Resource, message: str) -> None:
+        self._record(resource, 'stop')
+
+    def on_resource_deleted(self, resource: Resource, message: str) -> None:
+        self._record(resource, 'delete')
+
+
+def expected_state(starts: int, stops: int, deletes: int) -> str:
+    if deletes:
+        return "Deleted"
+    if starts == 0:
+        return "Created"
+    return "Started" if starts > stops else "Stopped"
+
+
+def run(resources: int, threads: int, operations: int, seed: int) -> bool:
+    observer = CountingObserver()
+    service = ConcurrentResourceManagementService(ResourceRepository(), build_registry(), observer)
+    specs = [resource_spec(i) for i in range(resources)]
+    names = [name for _, name, _ in specs]
+    successes = Counter()
+    created = Counter()
+    lock = threading.Lock()
+
+    def create_worker(worker: int) -> None:
+        for resource_type, name, kwargs in specs:
+            try:
+                service.create_resource(resource_type, name, **kwargs)
+            except DuplicateResourceError:
+                continue
+            with lock:
+                created[name] += 1
+
+    def transition_worker(worker: int) -> None:
+        rng = random.Random(seed + worker)
+        local = Counter()
+        operations_by_action = {'start': service.start_resource, 'stop': service.stop_resource,
+                                'delete': service.delete_resource}
+        actions = ['start'] * 6 + ['stop'] * 5 + ['delete']
+        for _ in range(operations):
+            name = rng.choice(names)
+            action = rng.choice(actions)
+            try:
+                operations_by_action[action](name)
+            except InvalidStateTransitionError:
+                continue
+            local[(name, action)] += 1
+        with lock:
+            successes.update(local)
+
+    with ThreadPoolExecutor(threads) as pool, Timer() as t:
+        list(pool.map(create_worker, range(threads)))
+    report(f"racing creates ({threads} threads)", resources * threads, t.elapsed)
+    with ThreadPoolExecutor(threads) as pool, Timer() as t:
+        list(pool.map(transition_worker, range(threads)))
+    report(f"random transitions ({threads} threads)", operations * threads, t.elapsed)
+
+    failures = []
+    for name in names:
+        if created[name] != 1:
+            failures.append(f"{name}: created {created[name]} times")
+        counts = {action: successes[(name, action)] for action in ('start', 'stop', 'delete')}
+        if not 0 <= counts['start'] - counts['stop'] <= 1 or counts['delete'] > 1:
+            failures.append(f"{name}: impossible transition sequence {counts}")
+        for action, count in counts.items():
+            if observer.events[(name, action)] != count:
+                failures.append(f"{name}: {count} successful {action}s but "
+                                f"{observer.events[(name, action)]} notifications")
+    states = {r.id.value: r.state for r in service.list_resources()}
+    for name in names:
+        expected = expected_state(successes[(name, 'start')], successes[(name, 'stop')],
+                                  successes[(name, 'delete')])
+        if states[name] != expected:
+            failures.append(f"{name}: state {states[name]}, expected {expected}")
+    for state in ("Created", "Started", "Stopped", "Deleted"):
+        indexed = len(service.list_resources(state=state))
+        actual = sum(1 for value in states.values() if value == state)
+        if indexed != actual:
+            failures.append(f"state index has {indexed} {state} resources, actual {actual}")
+
+    for failure in failures[:20]:
+        print(f"FAIL {failure}")
+    print("OK" if not failures else f"{len(failures)} consistency failures")
+    return not failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stress ConcurrentResourceManagementService from many threads")
+    parser.add_argument("--resources", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--operations", type=int, default=20_000, help="transitions per thread")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--switch-interval", type=float, default=1e-5,
+                        help="interpreter thread switch interval; smaller values force more interleaving")
+    args = parser.parse_args()
+    sys.setswitchinterval(args.switch_interval)
+    sys.exit(0 if run(args.resources, args.threads, args.operations, args.seed) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import shutil
+import tempfile
+from application.observers.resource_observer import LoggingObserver
+from application.services.concurrent_resource_management_service import ConcurrentResourceManagementService
+from application.services.dependency_scheduler import DependencyGraph, DependencyScheduler
+from application.services.latency_simulator import JitteredLatencySimulator
+from benchmarks.common import build_registry, resource_spec
+from domain.repositories.resource_repository import ResourceRepository
+from infrastructure.logging.logger import Logger
+
+LATENCIES = {
+    'AppService': {'start': 0.020, 'stop': 0.010},
+    'StorageAccount': {'start': 0.010, 'stop': 0.005},
+    'CacheDB': {'start': 0.015, 'stop': 0.005},
+}
+
+
+def build_stack(service: ConcurrentResourceManagementService, stacks: int) -> DependencyGraph:
+    """Per stack: a StorageAccount and a CacheDB, two AppServices on top, and a front AppService on those"""
+    graph = DependencyGraph()
+    for stack in range(stacks):
+        names = {}
+        for role, i in (("storage", stack * 9 + 1), ("cache", stack * 9 + 2), ("api", stack * 9),
+                        ("worker", stack * 9 + 3), ("front", stack * 9 + 6)):
+            resource_type, _, kwargs = resource_spec(i)
+            names[role] = f"{role}-{stack}"
+            service.create_resource(resource_type, names[role], **kwargs)
+        graph.declare(names["storage"])
+        graph.declare(names["cache"])
+        graph.declare(names["api"], [names["storage"], names["cache"]])
+        graph.declare(names["worker"], [names["storage"]])
+        graph.declare(names["front"], [names["api"], names["worker"]])
+    return graph
+
+
+def run(stacks: int, concurrency_levels, seed: int) -> None:
+    directory = tempfile.mkdtemp(prefix="cloudconnect-scheduler-")
+    try:
+        logger = Logger.buffered(os.path.join(directory, "logs"), echo=False)
+        service = ConcurrentResourceManagementService(ResourceRepository(), build_registry(), LoggingObserver(logger))
+        graph = build_stack(service, stacks)
+        print(f"{stacks * 5} resources in {stacks} stacks")
+        for concurrency in concurrency_levels:
+            scheduler = DependencyScheduler(service, graph, max_concurrency=concurrency,
+                                            latency=JitteredLatencySimulator(LATENCIES, seed=seed))
+            for report in (scheduler.start(), scheduler.stop()):
+                if not report.ok:
+                    raise SystemExit("\n".join(report.lines()))
+                print(f"concurrency {concurrency:>3} {report.action:<5} wall {report.elapsed:7.3f} s  "
+                      f"critical path {report.critical_path_seconds:6.3f} s over {len(report.critical_path)} ops")
+        logger.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Wall-clock time of dependency-ordered fleet start/stop")
+    parser.add_argument("--stacks", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.stacks, args.concurrency, args.seed)
+
+
+if __name__ == "__main__":
+    main()
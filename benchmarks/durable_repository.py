@@ -0,0 +1,56 @@
+import argparse
+import shutil
+import tempfile
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.value_objects import ResourceId
+from infrastructure.persistence.durable_repository import DurableResourceRepository
+
+
+def run(count: int, group_commit_size: int, fsync: bool) -> None:
+    registry = build_registry()
+    directory = tempfile.mkdtemp(prefix="cloudconnect-wal-")
+    try:
+        repository = DurableResourceRepository(directory, registry, group_commit_size=group_commit_size,
+                                               fsync=fsync, snapshot_every=None)
+        with Timer() as t:
+            for i in range(count):
+                resource_type, name, kwargs = resource_spec(i)
+                repository.add(registry.create_resource(resource_type, ResourceId(name), **kwargs))
+            repository.flush()
+        report("add (WAL append)", count, t.elapsed)
+
+        with Timer() as t:
+            for i in range(0, count, 2):
+                repository.get(ResourceId(f"res-{i}")).start()
+            repository.flush()
+        report("start (WAL state record)", (count + 1) // 2, t.elapsed)
+        repository.close()
+
+        with Timer() as t:
+            recovered = DurableResourceRepository(directory, registry, snapshot_every=None)
+        report("recovery from WAL only", len(recovered), t.elapsed)
+
+        with Timer() as t:
+            recovered.snapshot()
+        report("snapshot + compaction", len(recovered), t.elapsed)
+        recovered.close()
+
+        with Timer() as t:
+            recovered = DurableResourceRepository(directory, registry, snapshot_every=None)
+        report("recovery from snapshot", len(recovered), t.elapsed)
+        recovered.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write throughput and recovery time of DurableResourceRepository")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--group-commit-size", type=int, default=1024)
+    parser.add_argument("--fsync", action="store_true")
+    args = parser.parse_args()
+    run(args.count, args.group_commit_size, args.fsync)
+
+
+if __name__ == "__main__":
+    main()
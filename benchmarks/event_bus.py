@@ -0,0 +1,107 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from application.observers.event_bus import BackpressurePolicy, EventBus, LifecycleEvent
+from application.observers.resource_observer import LoggingObserver, ResourceObserver
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.value_objects import ResourceId
+from infrastructure.logging.logger import Logger
+
+
+class OrderCheckingSubscriber(ResourceObserver):
+    """Counts deliveries, optionally sleeps per batch, and checks that each resource alternates start/stop"""
+
+    def __init__(self, batch_delay: float = 0.0):
+        self.batch_delay = batch_delay
+        self.received = 0
+        self.out_of_order = 0
+        self._last = {}
+
+    def on_resource_started(self, resource, message: str) -> None:
+        self.on_batch([('started', resource, message)])
+
+    def on_resource_stopped(self, resource, message: str) -> None:
+        self.on_batch([('stopped', resource, message)])
+
+    def on_resource_deleted(self, resource, message: str) -> None:
+        self.on_batch([('deleted', resource, message)])
+
+    def on_batch(self, events) -> None:
+        if self.batch_delay:
+            time.sleep(self.batch_delay)
+        last = self._last
+        for event, resource, _ in events:
+            if last.get(resource.id) == event:
+                self.out_of_order += 1
+            last[resource.id] = event
+        self.received += len(events)
+
+
+def run(events: int, resources: int, batch: int) -> None:
+    registry = build_registry()
+    pool = [registry.create_resource(resource_type, ResourceId(name), **kwargs)
+            for resource_type, name, kwargs in map(resource_spec, range(resources))]
+    stream = [LifecycleEvent('started' if (i // resources) % 2 == 0 else 'stopped', pool[i % resources], "msg")
+              for i in range(events)]
+    chunks = [stream[i:i + batch] for i in range(0, events, batch)]
+
+    for label, policy, delay in (("block, fast subscriber", BackpressurePolicy.BLOCK, 0.0),
+                                 ("drop oldest, slow subscriber", BackpressurePolicy.DROP_OLDEST, 0.002),
+                                 ("coalesce, slow subscriber", BackpressurePolicy.COALESCE, 0.002)):
+        bus = EventBus()
+        subscriber = OrderCheckingSubscriber(delay)
+        bus.subscribe(subscriber, policy, capacity=8192)
+        with Timer() as t:
+            for chunk in chunks:
+                bus.publish_many(chunk)
+        report(f"publish ({label})", events, t.elapsed)
+        with Timer() as t:
+            bus.flush()
+        stats = list(bus.stats().values())[0]
+        print(f"    drained in {t.elapsed:.3f} s: delivered {stats['delivered']}, dropped {stats['dropped']}, "
+              f"coalesced {stats['coalesced']}, repeated events per resource {subscriber.out_of_order}")
+        bus.close()
+
+    bus = EventBus()
+    subscriber = OrderCheckingSubscriber()
+    bus.subscribe(subscriber)
+    with Timer() as t:
+        for event in stream:
+            bus.on_resource_started(event.resource, event.message)
+        bus.flush()
+    report("publish one at a time + drain", events, t.elapsed)
+    bus.close()
+
+    directory = tempfile.mkdtemp(prefix="cloudconnect-bus-")
+    try:
+        for label, use_bus in (("LoggingObserver inline", False), ("LoggingObserver via bus", True)):
+            logger = Logger(os.path.join(directory, label.replace(" ", "-")), echo=False)
+            observer = LoggingObserver(logger)
+            target = observer
+            if use_bus:
+                target = EventBus()
+                target.subscribe(observer)
+            with Timer() as t:
+                for event in stream[:50_000]:
+                    target.on_resource_started(event.resource, event.message)
+            report(f"{label}: caller time", 50_000, t.elapsed)
+            if use_bus:
+                target.close()
+            logger.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Event bus throughput, backpressure and ordering")
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--resources", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=100, help="events per publish_many call")
+    args = parser.parse_args()
+    run(args.events, args.resources, args.batch)
+
+
+if __name__ == "__main__":
+    main()
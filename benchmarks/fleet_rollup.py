@@ -0,0 +1,96 @@
+import argparse
+from collections import defaultdict
+from typing import Dict, Iterable
+from application.observers.resource_observer import ResourceObserver
+from application.services.resource_management_service import ResourceManagementService
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.entities.resource import Resource
+from domain.repositories.columnar_resource_repository import ColumnarResourceRepository
+from domain.repositories.fleet_rollup import FleetRollup
+from domain.repositories.resource_repository import ResourceRepository
+from domain.value_objects import ResourceId
+
+
+class _NoOpObserver(ResourceObserver):
+    def on_resource_started(self, resource, message: str) -> None:
+        pass
+
+    def on_resource_stopped(self, resource, message: str) -> None:
+        pass
+
+    def on_resource_deleted(self, resource, message: str) -> None:
+        pass
+
+
+def scan(resources: Iterable[Resource]) -> Dict:
+    """The same headline figures computed by visiting every resource"""
+    counts: Dict[str, int] = defaultdict(int)
+    replicas = gigabytes = megabytes = 0
+    for resource in resources:
+        counts[(resource.get_resource_type(), resource.state)] += 1
+        if resource.state == "Deleted":
+            continue
+        config = resource.config
+        replicas += config.get("replica_count", 0)
+        gigabytes += config.get("max_size_gb", 0)
+        megabytes += config.get("capacity_mb", 0)
+    return {"counts": dict(counts), "replicas": replicas, "gb": gigabytes, "mb": megabytes}
+
+
+def summaries(count: int, repeats: int) -> None:
+    for label, repository in (("memory", ResourceRepository()), ("columnar", ColumnarResourceRepository())):
+        service = ResourceManagementService(repository, build_registry(), _NoOpObserver())
+        service.create_many([resource_spec(i) for i in range(count)])
+        service.start_many([f"res-{i}" for i in range(0, count, 2)])
+        with Timer() as t:
+            for _ in range(repeats):
+                scan(repository.all())
+        report(f"{label} {count:,}: full scan", repeats, t.elapsed)
+        with Timer() as t:
+            for _ in range(repeats):
+                service.fleet_summary()
+        report(f"{label} {count:,}: rollup summary", repeats, t.elapsed)
+
+
+def update_cost(count: int) -> None:
+    """Cost the rollup adds to each change, against a transition through the service"""
+    specs = [resource_spec(i) for i in range(count)]
+    rollup = FleetRollup()
+    with Timer() as t:
+        for resource_type, _, kwargs in specs:
+            rollup.add(resource_type, "Created", _config(resource_type, kwargs))
+    report("rollup add", count, t.elapsed)
+    registry = build_registry()
+    resources = [registry.create_resource(resource_type, ResourceId(name), **kwargs)
+                 for resource_type, name, kwargs in specs]
+    with Timer() as t:
+        for resource in resources:
+            rollup.move(resource, "Created", "Started")
+    report("rollup move", count, t.elapsed)
+    service = ResourceManagementService(ResourceRepository(), build_registry(), _NoOpObserver())
+    service.create_many(specs)
+    with Timer() as t:
+        for _, name, _ in specs:
+            service.start_resource(name)
+    report("start_resource (includes rollup)", count, t.elapsed)
+
+
+def _config(resource_type: str, kwargs: Dict) -> Dict:
+    config = {key: getattr(value, "value", value) for key, value in kwargs.items()}
+    if resource_type == "AppService":
+        config.setdefault("replica_count", 1)
+    return config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fleet summary from incremental rollups versus a full scan")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    for count in args.sizes:
+        summaries(count, args.repeats)
+    update_cost(max(args.sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import http.client
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from benchmarks.common import resource_spec
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Client:
+    """One keep-alive connection; ``reconnect=True`` opens a new connection for every request instead"""
+
+    def __init__(self, url: str, reconnect: bool = False):
+        parts = urlsplit(url)
+        self._host, self._port = parts.hostname, parts.port
+        self._reconnect = reconnect
+        self._connection: Optional[http.client.HTTPConnection] = None
+
+    def request(self, method: str, path: str, body=None) -> Tuple[int, Dict]:
+        if self._connection is None or self._reconnect:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = http.client.HTTPConnection(self._host, self._port, timeout=30)
+        data = None if body is None else json.dumps(body)
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        self._connection.request(method, path, data, headers)
+        response = self._connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+
+
+def start_server(directory: str) -> Tuple[subprocess.Popen, str]:
+    process = subprocess.Popen([sys.executable, os.path.join(PROJECT_ROOT, "main.py"), "serve", "--port", "0"],
+                               cwd=directory, stdout=subprocess.PIPE, text=True,
+                               env=dict(os.environ, PYTHONPATH=PROJECT_ROOT))
+    line = process.stdout.readline()
+    if "http://" not in line:
+        process.kill()
+        raise RuntimeError(f"Server did not start: {line!r}")
+    return process, line.strip().split()[-1]
+
+
+def create_resources(url: str, count: int) -> None:
+    client = Client(url)
+    for start in range(0, count, 1000):
+        commands = []
+        for i in range(start, min(start + 1000, count)):
+            resource_type, name, kwargs = resource_spec(i)
+            config = {key: getattr(value, 'value', value) for key, value in kwargs.items()}
+            commands.append({"op": "create", "type": resource_type, "name": name, "config": config})
+        client.request("POST", "/batch", commands)
+    client.close()
+
+
+def run_load(url: str, clients: int, resources: int, duration: float, reconnect: bool = False,
+             batch_size: int = 0) -> Tuple[int, List[float], int, float]:
+    """Each client cycles start/stop over its own resources, reading one back every tenth request.
+
+    With ``batch_size`` every request is a /batch of that many transitions instead.
+    Returns (requests, latencies in seconds, failed requests, elapsed).
+    """
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+    failures = [0] * clients
+    deadline = time.perf_counter() + duration
+
+    def work(index: int) -> None:
+        client = Client(url, reconnect)
+        names = [f"res-{i}" for i in range(index, resources, clients)]
+        samples = latencies[index]
+        step = 0
+        try:
+            while time.perf_counter() < deadline:
+                action = "start" if (step // len(names)) % 2 == 0 else "stop"
+                if batch_size:
+                    chosen = [names[(step + i) % len(names)] for i in range(min(batch_size, len(names)))]
+                    step += len(chosen)
+                    request = ("POST", "/batch", [{"op": action, "name": name} for name in chosen])
+                else:
+                    name = names[step % len(names)]
+                    step += 1
+                    request = (("GET", f"/resources/{name}", None) if step % 10 == 0
+                               else ("POST", f"/resources/{name}/{action}", None))
+                start = time.perf_counter()
+                status, _ = client.request(*request)
+                samples.append(time.perf_counter() - start)
+                if status >= 500:
+                    failures[index] += 1
+        finally:
+            client.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    samples = [sample for client_samples in latencies for sample in client_samples]
+    return len(samples), samples, sum(failures), elapsed
+
+
+def print_report(label: str, requests: int, samples: List[float], failures: int, elapsed: float,
+                 operations_per_request: int = 1) -> None:
+    quantiles = statistics.quantiles(samples, n=100) if len(samples) > 1 else [samples[0]] * 99
+    rate = requests / elapsed
+    operations = f"  ({rate * operations_per_request:,.0f} ops/s)" if operations_per_request > 1 else ""
+    print(f"{label:<34} {rate:>9,.0f} req/s{operations}  p50 {quantiles[49] * 1000:7.2f} ms  "
+          f"p99 {quantiles[98] * 1000:7.2f} ms  max {max(samples) * 1000:7.2f} ms  5xx {failures}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load generator for the HTTP API (python main.py serve)")
+    parser.add_argument("--url", help="target server; by default one is started in a temporary directory")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent connections")
+    parser.add_argument("--resources", type=int, default=2000)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--batch-size", type=int, default=100, help="operations per /batch request")
+    args = parser.parse_args()
+
+    directory = None
+    process = None
+    url = args.url
+    if url is None:
+        directory = tempfile.mkdtemp(prefix="cloudconnect-http-")
+        process, url = start_server(directory)
+        print(f"started server at {url}")
+    try:
+        create_resources(url, args.resources)
+        scenarios = (("keep-alive, single operations", False, 0),
+                     ("new connection per request", True, 0),
+                     (f"keep-alive, /batch of {args.batch_size}", False, args.batch_size))
+        for label, reconnect, batch_size in scenarios:
+            requests, samples, failures, elapsed = run_load(url, args.clients, args.resources, args.duration,
+                                                            reconnect, batch_size)
+            print_report(label, requests, samples, failures, elapsed, batch_size or 1)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
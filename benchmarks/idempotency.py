@@ -0,0 +1,91 @@
+import argparse
+import os
+import shutil
+import tempfile
+from application.observers.resource_observer import LoggingObserver
+from application.services.idempotency_cache import IdempotencyCache
+from application.services.resource_management_service import ResourceManagementService
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.exceptions import DomainException
+from domain.repositories.resource_repository import ResourceRepository
+from infrastructure.logging.logger import Logger
+
+
+def log_lines(directory: str) -> int:
+    total = 0
+    for filename in os.listdir(directory):
+        with open(os.path.join(directory, filename), 'rb') as f:
+            total += sum(1 for _ in f)
+    return total
+
+
+def retry_storm(directory: str, count: int, retries: int, keyed: bool, capacity: int) -> None:
+    """Every create and start is sent ``retries`` extra times, as by clients retrying after a timeout"""
+    logger = Logger(directory, echo=False)
+    service = ResourceManagementService(ResourceRepository(), build_registry(), LoggingObserver(logger),
+                                        IdempotencyCache(capacity=capacity))
+    errors = 0
+    with Timer() as t:
+        for i in range(count):
+            resource_type, name, kwargs = resource_spec(i)
+            for attempt in range(retries + 1):
+                try:
+                    service.create_resource(resource_type, name, idempotency_key=f"create-{i}" if keyed else None,
+                                            **kwargs)
+                except DomainException:
+                    errors += 1
+            for attempt in range(retries + 1):
+                try:
+                    service.start_resource(name, f"start-{i}" if keyed else None)
+                except DomainException:
+                    errors += 1
+    label = "keyed" if keyed else "unkeyed"
+    report(f"retry storm, {label}", count * 2 * (retries + 1), t.elapsed)
+    stats = service.idempotency.stats()
+    print(f"  errors {errors:,}  log lines {log_lines(directory):,}  hit rate {stats['hit_rate']:.0%}  "
+          f"cached {stats['size']:,}/{stats['capacity']:,}  evictions {stats['evictions']:,}")
+
+
+def overhead(count: int) -> None:
+    """Cost of a key on a call that runs, and of a replay"""
+    specs = [resource_spec(i) for i in range(count)]
+    for keyed in (False, True):
+        service = ResourceManagementService(ResourceRepository(), build_registry(), LoggingObserver(_NullLogger()),
+                                            IdempotencyCache(capacity=count))
+        service.create_many(specs)
+        with Timer() as t:
+            for i, (_, name, _) in enumerate(specs):
+                service.start_resource(name, f"start-{i}" if keyed else None)
+        report("start_resource, keyed" if keyed else "start_resource", count, t.elapsed)
+        if keyed:
+            with Timer() as t:
+                for i, (_, name, _) in enumerate(specs):
+                    service.start_resource(name, f"start-{i}")
+            report("start_resource, replayed", count, t.elapsed)
+
+
+class _NullLogger:
+    def log(self, *args, **kwargs) -> None:
+        pass
+
+    def log_many(self, entries) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Retry storms with and without idempotency keys")
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--capacity", type=int, default=10_000, help="idempotency cache capacity")
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp(prefix="cloudconnect-idempotency-")
+    try:
+        overhead(args.count)
+        for keyed in (False, True):
+            retry_storm(os.path.join(directory, str(keyed)), args.count, args.retries, keyed, args.capacity)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
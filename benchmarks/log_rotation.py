@@ -0,0 +1,87 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from typing import List, Tuple
+from benchmarks.common import Timer, report
+from infrastructure.logging.logger import Logger
+from infrastructure.logging.rotation import RotationPolicy
+
+
+def directory_bytes(directory: str, suffix: str = "") -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+               if name.endswith(suffix))
+
+
+def fill(logger: Logger, count: int, resources: int) -> Tuple[List[datetime], float]:
+    """Log ``count`` entries in batches of 100; returns the time after each tenth and the slowest batch.
+
+    A resource named "rare" only logs during the first 5%.
+    """
+    marks = []
+    worst = 0.0
+    for i in range(0, count, 100):
+        entries = [("AppService" if j % 2 else "CacheDB", f"operation {j} completed", f"res-{j % resources}")
+                   for j in range(i, i + 100)]
+        if i < count // 20:
+            entries.append(("CacheDB", f"operation {i} completed", "rare"))
+        start = time.perf_counter()
+        logger.log_many(entries)
+        worst = max(worst, time.perf_counter() - start)
+        if (i + 100) % (count // 10) < 100:
+            marks.append(datetime.now())
+    logger.flush()
+    return marks, worst
+
+
+def run(count: int, resources: int, max_bytes: int) -> None:
+    directory = tempfile.mkdtemp(prefix="cloudconnect-rotation-")
+    try:
+        loggers = {}
+        for label, rotation in (("plain", None), ("rotated", RotationPolicy(max_bytes=max_bytes))):
+            logger = Logger.buffered(os.path.join(directory, label), echo=False, rotation=rotation,
+                                     flush_size=1024)
+            with Timer() as t:
+                marks, worst = fill(logger, count, resources)
+            report(f"write ({label})", count, t.elapsed)
+            print(f"    slowest batch of 100: {worst * 1000:.2f} ms")
+            loggers[label] = (logger, marks)
+
+        rotated, _ = loggers["rotated"]
+        with Timer() as t:
+            rotated._writer.rotator.wait()
+        print(f"compaction backlog drained in {t.elapsed:.3f} s: {rotated._writer.rotator.stats()}")
+        plain_bytes = directory_bytes(os.path.join(directory, "plain"))
+        segment_bytes = directory_bytes(os.path.join(directory, "rotated"), ".log.gz")
+        print(f"on disk: {plain_bytes:,} bytes plain, {segment_bytes:,} bytes in segments "
+              f"({plain_bytes / max(segment_bytes, 1):.1f}x smaller)")
+
+        queries = (("latest 20", lambda marks: {"limit": 20}),
+                   ("busy resource, latest 50", lambda marks: {"limit": 50, "resource_name": "res-1"}),
+                   ("rare resource, latest 50", lambda marks: {"limit": 50, "resource_name": "rare"}),
+                   ("window 20-30%, latest 100", lambda marks: {"limit": 100, "since": marks[1], "until": marks[2]}),
+                   ("first 10%, latest 100", lambda marks: {"limit": 100, "until": marks[0]}))
+        for label, query in queries:
+            for name, (logger, marks) in loggers.items():
+                with Timer() as t:
+                    found = len(logger.query_logs(**query(marks)))
+                print(f"query {label:<28} {name:<8} {found:>6} entries  {t.elapsed * 1000:9.2f} ms")
+        for logger, _ in loggers.values():
+            logger.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Log rotation cost and query speed over compressed segments")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--resources", type=int, default=10_000, help="distinct resource names")
+    parser.add_argument("--max-bytes", type=int, default=8 * 1024 * 1024, help="rotation size")
+    args = parser.parse_args()
+    run(args.entries, args.resources, args.max_bytes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from application.observers.resource_observer import LoggingObserver
+from application.services.concurrent_resource_management_service import ConcurrentResourceManagementService
+from application.services.manifest_reconciler import ManifestReconciler
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.repositories.resource_repository import ResourceRepository
+from infrastructure.logging.logger import Logger
+from infrastructure.manifest.manifest_loader import load_manifest
+
+# Target state per generation; each reachable from the previous one
+_STATES = (("Created", "Started", "Stopped"), ("Started", "Stopped", "Started"))
+
+
+def manifest_document(count: int, generation: int) -> dict:
+    """Synthetic manifest; generation 1 moves every state forward and rescales some AppServices"""
+    resources = []
+    for i in range(count):
+        resource_type, name, kwargs = resource_spec(i)
+        config = {key: getattr(value, 'value', value) for key, value in kwargs.items()}
+        if generation and resource_type == 'AppService' and i % 2:
+            config["replica_count"] = config["replica_count"] % 10 + 1
+        state = _STATES[generation][i % 3]
+        resources.append({"type": resource_type, "name": name, "state": state, "config": config})
+    return {"resources": resources}
+
+
+def run(count: int, workers: int, chunk_size: int) -> None:
+    directory = tempfile.mkdtemp(prefix="cloudconnect-manifest-")
+    try:
+        logger = Logger.buffered(os.path.join(directory, "logs"), echo=False)
+        service = ConcurrentResourceManagementService(ResourceRepository(), build_registry(), LoggingObserver(logger))
+        reconciler = ManifestReconciler(service, workers=workers, chunk_size=chunk_size)
+        for generation in range(3):
+            path = os.path.join(directory, f"manifest-{generation}.json")
+            with open(path, 'w') as f:
+                json.dump(manifest_document(count, min(generation, 1)), f)
+            with Timer() as t:
+                specs = load_manifest(path)
+            report(f"gen {generation}: load", count, t.elapsed)
+            with Timer() as t:
+                plan = reconciler.plan(specs)
+            report(f"gen {generation}: plan", count, t.elapsed)
+            print(f"    {plan.lines()[-1]}")
+            with Timer() as t:
+                results = reconciler.apply(plan)
+            report(f"gen {generation}: apply ({workers} workers)", len(plan.changes), t.elapsed)
+            failed = [result for result in results.values() if not result.ok]
+            if failed:
+                raise SystemExit(f"{len(failed)} changes failed, e.g. {failed[0]}")
+        logger.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load, plan and apply time of large manifests")
+    parser.add_argument("--count", type=int, default=30_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+    run(args.count, args.workers, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import shutil
+import tempfile
+from application.observers.resource_observer import LoggingObserver
+from application.services.resource_management_service import ResourceManagementService
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.repositories.resource_repository import ResourceRepository
+from infrastructure.logging.logger import Logger
+from infrastructure.metrics.instrumentation import Instrumentation
+from infrastructure.metrics.registry import MetricsRegistry
+
+
+def run(count: int, rounds: int) -> None:
+    directory = tempfile.mkdtemp(prefix="cloudconnect-metrics-")
+    try:
+        logger = Logger.buffered(os.path.join(directory, "logs"), echo=False)
+        registry = build_registry()
+        observer = LoggingObserver(logger)
+        service = ResourceManagementService(ResourceRepository(), registry, observer)
+        names = []
+        for i in range(count):
+            resource_type, name, kwargs = resource_spec(i)
+            service.create_resource(resource_type, name, **kwargs)
+            names.append(name)
+
+        metrics = MetricsRegistry()
+        instrumentation = Instrumentation(metrics)
+        for label, enabled in (("disabled", False), ("enabled", True), ("disabled again", False)):
+            if enabled:
+                instrumentation.factory_registry(registry)
+                instrumentation.service(service)
+                instrumentation.observer(observer)
+                instrumentation.logger(logger)
+            with Timer() as t:
+                for _ in range(rounds):
+                    for name in names:
+                        service.start_resource(name)
+                    for name in names:
+                        service.stop_resource(name)
+            report(f"start/stop, metrics {label}", 2 * count * rounds, t.elapsed)
+            instrumentation.remove()
+        logger.close()
+        for series in metrics.snapshot()["histograms"]["operation_duration_seconds"]:
+            print(f"  {series['labels']['operation']:<6} {series['labels']['resource_type']:<15} "
+                  f"p50 {series['p50_seconds'] * 1e6:7.1f} us  p99 {series['p99_seconds'] * 1e6:7.1f} us")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cost of operation metrics on service transitions")
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    run(args.count, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import wait
+from domain.engines.replica_pool import ReplicaPool
+from domain.value_objects import LoadBalancingPolicy
+
+
+def simulated_work(service_time: float):
+    def handler(request):
+        # Sleeping releases the GIL, so replicas overlap like real backends waiting on I/O
+        time.sleep(service_time * request)
+        return request
+    return handler
+
+
+def run(requests: int, replicas: int, service_ms: float, keys: int, resize_to: int, seed: int) -> None:
+    rng = random.Random(seed)
+    # Heavy-tailed request costs make the balancing policies diverge
+    costs = [min(rng.paretovariate(2.0), 20.0) for _ in range(requests)]
+    request_keys = [f"user-{rng.randrange(keys)}" for _ in range(requests)]
+    print(f"{'policy':<18} {'req/s':>10} {'max depth':>10} {'p50 ms':>8} {'p99 ms':>8} {'served':>8}")
+    for policy in LoadBalancingPolicy:
+        pool = ReplicaPool(replicas, simulated_work(service_ms / 1000), policy)
+        max_depth = 0
+        start = time.perf_counter()
+        futures = []
+        for i, (cost, key) in enumerate(zip(costs, request_keys)):
+            futures.append(pool.submit(cost, key))
+            if i == requests // 2 and resize_to:
+                # Resize mid-run; retired replicas drain what they already accepted
+                threading.Thread(target=pool.scale, args=(resize_to,)).start()
+            if i % 100 == 0:
+                max_depth = max([max_depth] + [stats["queue_depth"] for stats in pool.stats().values()])
+        wait(futures)
+        elapsed = time.perf_counter() - start
+        stats = pool.stats()
+        served = sum(1 for future in futures if future.result() is not None)
+        p50 = max(replica["p50_ms"] for replica in stats.values())
+        p99 = max(replica["p99_ms"] for replica in stats.values())
+        print(f"{policy.value:<18} {requests / elapsed:>10,.0f} {max_depth:>10} {p50:>8.1f} {p99:>8.1f} "
+              f"{served:>8}")
+        pool.close()
+        if served != requests:
+            raise SystemExit(f"{requests - served} requests were dropped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput and per-replica latency of each load-balancing policy")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--service-ms", type=float, default=0.5)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--resize-to", type=int, default=2, help="replica count to switch to halfway; 0 disables")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+    run(args.requests, args.replicas, args.service_ms, args.keys, args.resize_to, args.seed)
+
+
+if __name__ == "__main__":
+    main()
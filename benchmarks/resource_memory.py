@@ -0,0 +1,80 @@
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime
+from benchmarks.common import RESOURCE_TYPES, build_registry, resource_spec
+from domain.states import CREATED
+from domain.value_objects import ResourceId
+
+
+class _LegacyResourceId:
+    """Reference for the previous layout: instance __dict__ per id"""
+
+    def __init__(self, name: str):
+        self._name = name.strip()
+
+
+class _LegacyResource:
+    """Reference for the previous layout: __dict__, config dict, observer list and datetime per resource"""
+
+    def __init__(self, resource_id: _LegacyResourceId, config: dict):
+        self._id = resource_id
+        self._config = config
+        self._state = CREATED
+        self._created_at = datetime.now()
+        self._observers = []
+        self._first = None
+        self._second = None
+
+
+def _legacy_config(kwargs: dict) -> dict:
+    return {key: value.value if hasattr(value, 'value') else value for key, value in kwargs.items()}
+
+
+def measure(build, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def run(count: int) -> None:
+    registry = build_registry()
+    observer = object()  # stands in for the LoggingObserver shared by every resource
+
+    def compact(resource_type: str):
+        def build(i: int):
+            _, name, kwargs = resource_spec(i * 3 + RESOURCE_TYPES.index(resource_type))
+            resource = registry.create_resource(resource_type, ResourceId(name), **kwargs)
+            resource.attach_observer(observer)
+            return resource
+        return build
+
+    def legacy(resource_type: str):
+        def build(i: int):
+            _, name, kwargs = resource_spec(i * 3 + RESOURCE_TYPES.index(resource_type))
+            resource = _LegacyResource(_LegacyResourceId(name), _legacy_config(kwargs))
+            resource._observers.append(observer)
+            return resource
+        return build
+
+    print(f"{'resource type':<16} {'previous layout':>18} {'slotted':>10} {'reduction':>10}")
+    for resource_type in RESOURCE_TYPES:
+        before = measure(legacy(resource_type), count)
+        after = measure(compact(resource_type), count)
+        print(f"{resource_type:<16} {before:>12.0f} bytes {after:>4.0f} bytes {1 - after / before:>9.0%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bytes per resource for each resource type")
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+    run(args.count)
+
+
+if __name__ == "__main__":
+    main()
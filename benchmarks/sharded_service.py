@@ -0,0 +1,78 @@
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from application.services.resource_management_service import ResourceManagementService
+from application.services.sharded_resource_management_service import ShardedResourceManagementService
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from benchmarks.suite import _NoOpObserver
+from domain.repositories.resource_repository import ResourceRepository
+
+
+def cycle_bulk(service, names, chunk: int, rounds: int) -> int:
+    """Start and stop every resource ``rounds`` times in bulk calls of ``chunk`` names; returns the transitions"""
+    chunks = [names[i:i + chunk] for i in range(0, len(names), chunk)]
+    for _ in range(rounds):
+        for part in chunks:
+            service.start_many(part)
+        for part in chunks:
+            service.stop_many(part)
+    return 2 * rounds * len(names)
+
+
+def cycle_single(service, names, clients: int) -> int:
+    """Start and stop every resource with one call each, from ``clients`` threads at once"""
+    def work(part) -> None:
+        for name in part:
+            service.start_resource(name)
+            service.stop_resource(name)
+
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(work, [names[i::clients] for i in range(clients)]))
+    return 2 * len(names)
+
+
+def run(resources: int, max_shards: int, chunk: int, rounds: int, clients: int) -> None:
+    specs = [resource_spec(i) for i in range(resources)]
+    names = [name for _, name, _ in specs]
+
+    baseline = ResourceManagementService(ResourceRepository(), build_registry(), _NoOpObserver())
+    baseline.create_many(specs)
+    with Timer() as t:
+        count = cycle_bulk(baseline, names, chunk, rounds)
+    report("in-process bulk transitions", count, t.elapsed)
+
+    shard_counts = sorted({1, 2, 4, max_shards} & set(range(1, max_shards + 1)))
+    for shard_count in shard_counts:
+        with ShardedResourceManagementService(build_registry(), shard_count=shard_count) as service:
+            with Timer() as t:
+                service.create_many(specs)
+            report(f"{shard_count} shard(s): bulk create", resources, t.elapsed)
+            with Timer() as t:
+                count = cycle_bulk(service, names, chunk, rounds)
+            report(f"{shard_count} shard(s): bulk transitions", count, t.elapsed)
+            single = names[:max(resources // 10, 1)]
+            with Timer() as t:
+                count = cycle_single(service, single, clients)
+            report(f"{shard_count} shard(s): single calls x{clients}", count, t.elapsed)
+            with Timer() as t:
+                listed = len(service.list_resources(state="Stopped"))
+            report(f"{shard_count} shard(s): scatter-gather list", listed, t.elapsed)
+            calls = sum(stats["calls"] for stats in service.stats().values())
+            batches = sum(stats["batches"] for stats in service.stats().values())
+            print(f"    {calls} forwarded calls in {batches} round trips ({calls / max(batches, 1):.1f} per trip)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput of the sharded service from 1 to N worker processes")
+    parser.add_argument("--resources", type=int, default=100_000)
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="largest shard count to run")
+    parser.add_argument("--chunk", type=int, default=5_000, help="names per bulk call")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--clients", type=int, default=16, help="threads issuing single calls")
+    args = parser.parse_args()
+    print(f"{os.cpu_count()} CPU(s) available")
+    run(args.resources, args.shards, args.chunk, args.rounds, args.clients)
+
+
+if __name__ == "__main__":
+    main()
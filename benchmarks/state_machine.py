@@ -0,0 +1,101 @@
+import argparse
+from benchmarks.common import Timer, build_registry, report, resource_spec
+from domain.exceptions import InvalidStateTransitionError
+from domain.value_objects import ResourceId
+
+
+class _AllocatingStarted:
+    """Reference for the previous design: a fresh state object per transition"""
+
+    def start(self, holder: '_Holder') -> None:
+        raise InvalidStateTransitionError("Resource is already started")
+
+    def stop(self, holder: '_Holder') -> None:
+        holder.set_state(_AllocatingStopped())
+        holder.notify_stopped()
+
+
+class _AllocatingStopped:
+    def start(self, holder: '_Holder') -> None:
+        holder.set_state(_AllocatingStarted())
+        holder.notify_started()
+
+    def stop(self, holder: '_Holder') -> None:
+        raise InvalidStateTransitionError("Resource is already stopped")
+
+
+class _Holder:
+    def __init__(self):
+        self._state = _AllocatingStopped()
+        self._observers = []
+
+    def set_state(self, state) -> None:
+        self._state = state
+
+    def start(self) -> None:
+        self._state.start(self)
+
+    def stop(self) -> None:
+        self._state.stop(self)
+
+    def notify_started(self) -> None:
+        for observer in self._observers:
+            observer.on_resource_started(self, "")
+
+    def notify_stopped(self) -> None:
+        for observer in self._observers:
+            observer.on_resource_stopped(self, "")
+
+
+def run(count: int) -> None:
+    resource_type, name, kwargs = resource_spec(0)
+    resource = build_registry().create_resource(resource_type, ResourceId(name), **kwargs)
+
+    holder = _Holder()
+    with Timer() as t:
+        for _ in range(count // 2):
+            holder.start()
+            holder.stop()
+    report("allocating states: start/stop", count, t.elapsed)
+
+    with Timer() as t:
+        for _ in range(count // 2):
+            resource.start()
+            resource.stop()
+    report("flyweight table: start/stop", count, t.elapsed)
+
+    rejected = 0
+    with Timer() as t:
+        for _ in range(count):
+            try:
+                holder.stop()
+            except InvalidStateTransitionError:
+                rejected += 1
+    report("allocating states: rejected via exception", rejected, t.elapsed)
+
+    rejected = 0
+    with Timer() as t:
+        for _ in range(count):
+            try:
+                resource.stop()
+            except InvalidStateTransitionError:
+                rejected += 1
+    report("flyweight table: rejected via exception", rejected, t.elapsed)
+
+    rejected = 0
+    with Timer() as t:
+        for _ in range(count):
+            if not resource.can_transition('stop'):
+                rejected += 1
+    report("flyweight table: can_transition check", rejected, t.elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Transitions per second of the state machine")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.count)
+
+
+if __name__ == "__main__":
+    main()
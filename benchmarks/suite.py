@@ -0,0 +1,303 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from functools import partial
+from typing import Callable, Dict, List, Optional
+from application.observers.resource_observer import ResourceObserver
+from benchmarks.common import build_registry, resource_spec
+from domain.repositories.resource_repository import ResourceRepository
+from domain.value_objects import ResourceId
+from infrastructure.logging.logger import Logger
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Measurement:
+    """One benchmark result; ``value`` is a rate (higher is better) or a latency in seconds (lower is better)"""
+
+    def __init__(self, name: str, value: float, unit: str, higher_is_better: bool):
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "value": self.value, "unit": self.unit, "higher_is_better": self.higher_is_better}
+
+
+def _best_rate(operation: Callable[..., int], repeat: int, setup: Optional[Callable[[], tuple]] = None) -> float:
+    """Highest ops/s over ``repeat`` runs; ``operation`` returns the number of operations it performed.
+
+    ``setup`` runs untimed before every run and its result is passed to ``operation``.
+    """
+    rates = []
+    for _ in range(repeat):
+        arguments = setup() if setup else ()
+        gc.collect()
+        start = time.perf_counter()
+        count = operation(*arguments)
+        rates.append(count / (time.perf_counter() - start))
+    return max(rates)
+
+
+def _median_latency(operation: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+class _NoOpObserver(ResourceObserver):
+    def on_resource_started(self, resource, message: str) -> None:
+        pass
+
+    def on_resource_stopped(self, resource, message: str) -> None:
+        pass
+
+    def on_resource_deleted(self, resource, message: str) -> None:
+        pass
+
+
+def bench_factory(count: int, repeat: int) -> List[Measurement]:
+    registry = build_registry()
+    specs = [(resource_type, ResourceId(name), kwargs)
+             for resource_type, name, kwargs in map(resource_spec, range(count))]
+
+    def create() -> int:
+        for resource_type, resource_id, kwargs in specs:
+            registry.create_resource(resource_type, resource_id, **kwargs)
+        return count
+
+    return [Measurement("factory.create_resource", _best_rate(create, repeat), "ops/s", True)]
+
+
+def bench_transitions(count: int, repeat: int) -> List[Measurement]:
+    registry = build_registry()
+    resources = [registry.create_resource(resource_type, ResourceId(name), **kwargs)
+                 for resource_type, name, kwargs in map(resource_spec, range(count))]
+    for resource in resources:
+        resource.start()
+
+    def cycle() -> int:
+        for resource in resources:
+            resource.stop()
+            resource.start()
+        return 2 * count
+
+    return [Measurement("states.start_stop", _best_rate(cycle, repeat), "ops/s", True)]
+
+
+def bench_repository(sizes: List[int], repeat: int) -> List[Measurement]:
+    registry = build_registry()
+    measurements = []
+    for size in sizes:
+        fresh = partial(_fresh_repository, registry, size)
+        measurements.append(Measurement(f"repository.add[{size}]", _best_rate(_add_all, repeat, fresh),
+                                        "ops/s", True))
+        repository, resources = fresh()
+        _add_all(repository, resources)
+        get = partial(_get_all, repository, [resource.id for resource in resources])
+        measurements.append(Measurement(f"repository.get[{size}]", _best_rate(get, repeat), "ops/s", True))
+    return measurements
+
+
+def _fresh_repository(registry, size: int) -> tuple:
+    # New entities per run so observers attached by earlier repositories do not accumulate
+    return ResourceRepository(), [registry.create_resource(resource_type, ResourceId(name), **kwargs)
+                                  for resource_type, name, kwargs in map(resource_spec, range(size))]
+
+
+def _add_all(repository: ResourceRepository, resources: List) -> int:
+    for resource in resources:
+        repository.add(resource)
+    return len(resources)
+
+
+def _get_all(repository: ResourceRepository, ids: List[ResourceId]) -> int:
+    for resource_id in ids:
+        repository.get(resource_id)
+    return len(ids)
+
+
+def bench_logger(count: int, log_sizes: List[int], repeat: int) -> List[Measurement]:
+    measurements = []
+    directory = tempfile.mkdtemp(prefix="cloudconnect-suite-")
+    try:
+        for label, factory in (("direct", Logger), ("buffered", Logger.buffered)):
+            loggers = []
+
+            def log() -> int:
+                logger = factory(os.path.join(directory, f"{label}-{len(loggers)}"), echo=False)
+                loggers.append(logger)
+                for i in range(count):
+                    logger.log("AppService", "AppService started successfully", f"res-{i}")
+                logger.flush()
+                return count
+
+            measurements.append(Measurement(f"logger.log[{label}]", _best_rate(log, repeat), "ops/s", True))
+            for logger in loggers:
+                logger.close()
+
+        for size in log_sizes:
+            logger = Logger.buffered(os.path.join(directory, f"tail-{size}"), echo=False)
+            logger.log_many([("CacheDB", "CacheDB stopped successfully", f"res-{i}") for i in range(size)])
+            logger.flush()
+            measurements.append(Measurement(f"logger.get_logs[{size} lines]",
+                                            _median_latency(lambda: logger.get_logs(20), 5 * repeat), "s", False))
+            logger.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return measurements
+
+
+def bench_observer_fanout(count: int, fanouts: List[int], repeat: int) -> List[Measurement]:
+    registry = build_registry()
+    measurements = []
+    for fanout in fanouts:
+        resources = [registry.create_resource(resource_type, ResourceId(name), **kwargs)
+                     for resource_type, name, kwargs in map(resource_spec, range(count))]
+        observers = [_NoOpObserver() for _ in range(fanout)]
+        for resource in resources:
+            for observer in observers:
+                resource.attach_observer(observer)
+            resource.start()
+
+        def cycle() -> int:
+            for resource in resources:
+                resource.stop()
+                resource.start()
+            return 2 * count
+
+        measurements.append(Measurement(f"observer.fanout[{fanout}]", _best_rate(cycle, repeat), "ops/s", True))
+    return measurements
+
+
+def bench_cli_startup(repeat: int) -> List[Measurement]:
+    measurements = []
+    directory = tempfile.mkdtemp(prefix="cloudconnect-cli-")
+    environment = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    main_path = os.path.join(PROJECT_ROOT, "main.py")
+    try:
+        for label, argv in (("import", [sys.executable, "-c", "import main"]),
+                            ("logs", [sys.executable, main_path, "logs", "--limit", "1"]),
+                            ("list", [sys.executable, main_path, "list"])):
+            def launch() -> None:
+                subprocess.run(argv, cwd=directory, env=environment, check=True, stdout=subprocess.DEVNULL)
+
+            measurements.append(Measurement(f"cli.startup[{label}]", _median_latency(launch, repeat), "s", False))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return measurements
+
+
+def environment_metadata() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+    }
+
+
+def run_suite(quick: bool = False, full: bool = False, repeat: int = 3) -> Dict:
+    count = 2_000 if quick else 20_000
+    sizes = [10 ** 3, 10 ** 4] if quick else [10 ** 3, 10 ** 4, 10 ** 5] + ([10 ** 6] if full else [])
+    log_sizes = [10 ** 3, 10 ** 4] if quick else [10 ** 3, 10 ** 4, 10 ** 5]
+    groups = [
+        lambda: bench_factory(count, repeat),
+        lambda: bench_transitions(count, repeat),
+        lambda: bench_repository(sizes, repeat),
+        lambda: bench_logger(count, log_sizes, repeat),
+        lambda: bench_observer_fanout(count // 4, [1, 10, 100], repeat),
+        lambda: bench_cli_startup(repeat),
+    ]
+    measurements = []
+    for group in groups:
+        for measurement in group():
+            print(f"{measurement.name:<36} {measurement.value:>14,.6g} {measurement.unit}", flush=True)
+            measurements.append(measurement)
+    return {"environment": environment_metadata(), "results": [m.to_dict() for m in measurements]}
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Print a comparison table; returns the names of benchmarks that regressed beyond ``threshold``"""
+    previous = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    print(f"{'benchmark':<36} {'baseline':>14} {'current':>14} {'change':>8}")
+    for result in current["results"]:
+        before = previous.get(result["name"])
+        if before is None or not before["value"]:
+            print(f"{result['name']:<36} {'-':>14} {result['value']:>14,.6g} {'new':>8}")
+            continue
+        change = result["value"] / before["value"] - 1
+        worse = -change if result["higher_is_better"] else change
+        flag = ""
+        if worse > threshold:
+            regressions.append(result["name"])
+            flag = "  REGRESSION"
+        print(f"{result['name']:<36} {before['value']:>14,.6g} {result['value']:>14,.6g} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def _load(path: str) -> Dict:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite over the CloudConnect hot paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the suite and write JSON results")
+    run.add_argument("--output", default="benchmark-results.json")
+    run.add_argument("--quick", action="store_true", help="smaller workloads for a fast smoke run")
+    run.add_argument("--full", action="store_true", help="include the 10^6-resource repository run")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--baseline", help="compare against this results file after running")
+    run.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown (default 10%%)")
+    check = commands.add_parser("compare", help="compare two results files")
+    check.add_argument("baseline")
+    check.add_argument("current")
+    check.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        current = _load(args.current)
+        baseline = _load(args.baseline)
+    else:
+        current = run_suite(args.quick, args.full, args.repeat)
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nResults written to {args.output}")
+        if not args.baseline:
+            return 0
+        baseline = _load(args.baseline)
+    print()
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+import hashlib
+import io
+import mmap
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import quote, unquote
+from domain.exceptions import BlobIntegrityError, QuotaExceededError
+
+CHUNK_SIZE = 1024 * 1024
+_MAGIC = b"CCB2"
+_NONCE_PREFIX_SIZE = 8
+_TAG_SIZE = 16
+# Magic, chunk size and the nonce prefix of the blob
+_HEADER_SIZE = len(_MAGIC) + 4 + _NONCE_PREFIX_SIZE
+_KDF_ITERATIONS = 200_000
+# quote() only emits "%" before two hex digits, so these names can never collide with a blob name
+_TEMP_SUFFIX = ".%upload"
+_SALT_FILE = "%salt"
+
+Data = Union[bytes, bytearray, memoryview, Iterable[bytes], BinaryIO]
+
+
+def _aes_gcm():
+    try:
+        from cryptography.exceptions import InvalidTag
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    except ImportError:
+        raise ValueError("Encrypted blob stores require the 'cryptography' package") from None
+    return AESGCM, InvalidTag
+
+
+class _SealedChunks:
+    """AES-256-GCM applied per fixed-size chunk, so any byte range can be read without the rest of the blob.
+    
+    Chunk ``i`` is sealed under the blob's random nonce prefix followed by
+    ``i``, and whether it is the last chunk is authenticated with it, so chunks
+    cannot be reordered, moved between blobs or cut off the end unnoticed.
+    """
+    
+    def __init__(self, key: bytes, nonce_prefix: bytes, chunk_size: int):
+        aes_gcm, self._invalid_tag = _aes_gcm()
+        self._aead = aes_gcm(key)
+        self.nonce_prefix = nonce_prefix
+        self.chunk_size = chunk_size
+    
+    @property
+    def header(self) -> bytes:
+        return _MAGIC + self.chunk_size.to_bytes(4, 'little') + self.nonce_prefix
+    
+    def seal(self, index: int, data: bytes, last: bool) -> bytes:
+        return self._aead.encrypt(self._nonce(index), bytes(data), b'\x01' if last else b'\x00')
+    
+    def open(self, index: int, data: bytes, last: bool) -> bytes:
+        try:
+            return self._aead.decrypt(self._nonce(index), data, b'\x01' if last else b'\x00')
+        except self._invalid_tag:
+            raise BlobIntegrityError(f"Chunk {index} of an encrypted blob failed authentication") from None
+    
+    def _nonce(self, index: int) -> bytes:
+        return self.nonce_prefix + index.to_bytes(4, 'little')
+    
+    @staticmethod
+    def plaintext_size(file_size: int, chunk_size: int) -> int:
+        body = file_size - _HEADER_SIZE
+        # Every blob ends with a final chunk, empty for an empty blob
+        chunks = max(-(-body // (chunk_size + _TAG_SIZE)), 1)
+        return body - chunks * _TAG_SIZE
+
+
+def _read_header(file: BinaryIO, key: bytes) -> _SealedChunks:
+    header = file.read(_HEADER_SIZE)
+    if len(header) != _HEADER_SIZE or not header.startswith(_MAGIC):
+        raise BlobIntegrityError("Not an encrypted blob")
+    chunk_size = int.from_bytes(header[len(_MAGIC):len(_MAGIC) + 4], 'little')
+    return _SealedChunks(key, header[len(_MAGIC) + 4:], chunk_size)
+
+
+class BlobReader(io.RawIOBase):
+    """Seekable raw reader over a stored blob, decrypting and authenticating chunk by chunk when needed"""
+    
+    def __init__(self, path: str, key: Optional[bytes]):
+        super().__init__()
+        self._file = open(path, 'rb')
+        self._chunks: Optional[_SealedChunks] = None
+        self._size = os.fstat(self._file.fileno()).st_size
+        if key is not None:
+            try:
+                self._chunks = _read_header(self._file, key)
+            except BaseException:
+                self._file.close()
+                raise
+            self._size = _SealedChunks.plaintext_size(self._size, self._chunks.chunk_size)
+            self._chunk_count = max(-(-self._size // self._chunks.chunk_size), 1)
+            self._cached_index = -1
+            self._cached_chunk = b''
+        self._position = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        if self._chunks is None:
+            self._file.seek(self._position)
+            read = self._file.readinto(buffer)
+            self._position += read
+            return read
+        view = memoryview(buffer).cast('B')
+        filled = 0
+        while filled < len(view) and self._position < self._size:
+            index, start = divmod(self._position, self._chunks.chunk_size)
+            chunk = self._chunk(index)
+            length = min(len(chunk) - start, len(view) - filled)
+            view[filled:filled + length] = chunk[start:start + length]
+            filled += length
+            self._position += length
+        return filled
+    
+    def _chunk(self, index: int) -> bytes:
+        if index != self._cached_index:
+            sealed_size = self._chunks.chunk_size + _TAG_SIZE
+            self._file.seek(_HEADER_SIZE + index * sealed_size)
+            self._cached_chunk = self._chunks.open(index, self._file.read(sealed_size),
+                                                   index == self._chunk_count - 1)
+            self._cached_index = index
+        return self._cached_chunk
+    
+    def readall(self) -> bytes:
+        data = bytearray(max(self._size - self._position, 0))
+        read = self.readinto(data)
+        del data[read:]
+        return bytes(data)
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._position = max(offset, 0)
+        return self._position
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+class BlobWriter(io.RawIOBase):
+    """Streams an upload to a temporary file that ``commit`` publishes atomically.
+    
+    Quota is charged as bytes arrive, so an oversized upload fails as soon as
+    it crosses the limit instead of after it has been written in full. A writer
+    closed without ``commit`` (including one left to the garbage collector, or
+    a ``with`` block that raises) discards its upload.
+    """
+    
+    def __init__(self, store: 'BlobStore', name: str):
+        super().__init__()
+        self._store = store
+        self._name = name
+        self._path = store._path(name)
+        self._temp_path = self._path + _TEMP_SUFFIX
+        self._file = open(self._temp_path, 'wb')
+        self._chunks: Optional[_SealedChunks] = None
+        self._pending = bytearray()
+        self._sealed = 0
+        if store._key is not None:
+            self._chunks = _SealedChunks(store._key, os.urandom(_NONCE_PREFIX_SIZE), store._chunk_size)
+            self._file.write(self._chunks.header)
+        self._size = 0
+        self._reserved = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        length = len(memoryview(data).cast('B'))
+        self._store._reserve(length)
+        self._reserved += length
+        if self._chunks is None:
+            self._file.write(data)
+        else:
+            # A full chunk is only sealed once more data follows it, since the last chunk is sealed differently
+            pending = self._pending
+            pending.extend(data)
+            chunk_size = self._chunks.chunk_size
+            start = 0
+            while len(pending) - start > chunk_size:
+                self._file.write(self._chunks.seal(self._sealed, pending[start:start + chunk_size], False))
+                self._sealed += 1
+                start += chunk_size
+            del pending[:start]
+        self._size += length
+        return length
+    
+    def commit(self) -> None:
+        """Finish the upload and publish it under its name, replacing any blob of that name"""
+        if self.closed:
+            raise ValueError("Upload is already closed")
+        if self._chunks is not None:
+            self._file.write(self._chunks.seal(self._sealed, self._pending, True))
+        self._file.close()
+        super().close()
+        self._store._publish(self._name, self._temp_path, self._path, self._size, self._reserved)
+    
+    def close(self) -> None:
+        """Discard the upload unless it was committed"""
+        if self.closed:
+            return
+        self._file.close()
+        super().close()
+        os.remove(self._temp_path)
+        self._store._release(self._reserved)
+    
+    abort = close
+    
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.close()
+
+
+class BlobStore:
+    """Local-disk blob container for one storage account.
+    
+    Blobs are files under ``root``; their sizes are tracked in memory (read once
+    when the store is opened) so the ``quota_bytes`` check is incremental.
+    Uploads and downloads stream in chunks, and ``read_view`` maps large
+    plaintext blobs into memory without copying. With a ``secret`` every blob
+    is encrypted and authenticated with AES-256-GCM chunk by chunk as it
+    streams, under a key derived from the secret and a random per-store salt;
+    this needs the optional ``cryptography`` package.
+    """
+    
+    def __init__(self, root: str, quota_bytes: int, secret: Optional[bytes] = None,
+                 chunk_size: int = CHUNK_SIZE):
+        self._root = root
+        self._quota = quota_bytes
+        self._chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] = {}
+        self._used = 0
+        os.makedirs(root, exist_ok=True)
+        self._key = self._derive_key(secret) if secret is not None else None
+        for filename in os.listdir(root):
+            path = os.path.join(root, filename)
+            if filename.endswith(_TEMP_SUFFIX):
+                os.remove(path)
+                continue
+            if filename == _SALT_FILE:
+                continue
+            size = os.path.getsize(path)
+            if self._key is not None:
+                with open(path, 'rb') as f:
+                    size = _SealedChunks.plaintext_size(size, _read_header(f, self._key).chunk_size)
+            self._sizes[unquote(filename)] = size
+            self._used += size
+    
+    def _derive_key(self, secret: bytes) -> bytes:
+        _aes_gcm()
+        salt_path = os.path.join(self._root, _SALT_FILE)
+        try:
+            with open(salt_path, 'rb') as f:
+                salt = f.read()
+        except FileNotFoundError:
+            salt = os.urandom(16)
+            with open(salt_path + _TEMP_SUFFIX, 'wb') as f:
+                f.write(salt)
+            os.replace(salt_path + _TEMP_SUFFIX, salt_path)
+        return hashlib.pbkdf2_hmac('sha256', secret, salt, _KDF_ITERATIONS)
+    
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+    
+    @property
+    def quota_bytes(self) -> int:
+        return self._quota
+    
+    def list(self) -> List[str]:
+        return sorted(self._sizes)
+    
+    def size(self, name: str) -> int:
+        self._require(name)
+        return self._sizes[name]
+    
+    def exists(self, name: str) -> bool:
+        return name in self._sizes
+    
+    def open_upload(self, name: str) -> BlobWriter:
+        if not name:
+            raise ValueError("Blob name cannot be empty")
+        return BlobWriter(self, name)
+    
+    def put(self, name: str, data: Data) -> int:
+        """Store bytes, an iterable of chunks or a readable file object; returns the blob size"""
+        with self.open_upload(name) as writer:
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                view = memoryview(data)
+                for start in range(0, len(view), self._chunk_size):
+                    writer.write(view[start:start + self._chunk_size])
+            elif hasattr(data, 'read'):
+                for chunk in iter(lambda: data.read(self._chunk_size), b''):
+                    writer.write(chunk)
+            else:
+                for chunk in data:
+                    writer.write(chunk)
+        return self._sizes[name]
+    
+    def open(self, name: str) -> io.BufferedReader:
+        self._require(name)
+        return io.BufferedReader(BlobReader(self._path(name), self._key), self._chunk_size)
+    
+    def iter_chunks(self, name: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        chunk_size = chunk_size or self._chunk_size
+        with self.open(name) as reader:
+            for chunk in iter(lambda: reader.read(chunk_size), b''):
+                yield chunk
+    
+    def get(self, name: str) -> bytes:
+        with self.open(name) as reader:
+            return reader.read()
+    
+    @contextmanager
+    def read_view(self, name: str) -> Iterator[memoryview]:
+        """Whole blob as a memoryview for the duration of the block; plaintext blobs are memory-mapped, not copied"""
+        self._require(name)
+        if self._key is not None or self._sizes[name] == 0:
+            yield memoryview(self.get(name))
+            return
+        with open(self._path(name), 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+            try:
+                mapped.close()
+            except BufferError:
+                # A slice of the view outlived the block; the mapping is closed once it is released
+                pass
+    
+    def delete(self, name: str) -> None:
+        self._require(name)
+        os.remove(self._path(name))
+        with self._lock:
+            self._used -= self._sizes.pop(name)
+    
+    def destroy(self) -> None:
+        """Remove every blob and the store directory"""
+        shutil.rmtree(self._root, ignore_errors=True)
+        with self._lock:
+            self._sizes.clear()
+            self._used = 0
+    
+    def _path(self, name: str) -> str:
+        return os.path.join(self._root, quote(name, safe=''))
+    
+    def _require(self, name: str) -> None:
+        if name not in self._sizes:
+            raise KeyError(f"Blob '{name}' not found")
+    
+    def _reserve(self, size: int) -> None:
+        with self._lock:
+            if self._used + size > self._quota:
+                raise QuotaExceededError(f"Storage quota of {self._quota} bytes exceeded")
+            self._used += size
+    
+    def _release(self, size: int) -> None:
+        with self._lock:
+            self._used -= size
+    
+    def _publish(self, name: str, temp_path: str, path: str, size: int, reserved: int) -> None:
+        os.replace(temp_path, path)
+        with self._lock:
+            self._used += size - reserved - self._sizes.get(name, 0)
+            self._sizes[name] = size
@@ -0,0 +1,273 @@
+import heapq
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from domain.value_objects import EvictionPolicy
+
+Value = Union[bytes, bytearray, memoryview]
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'expires_at')
+    
+    def __init__(self, value: bytes, size: int, expires_at: float):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+
+
+class _LRUOrder:
+    """Evicts the least recently read or written key"""
+    
+    def __init__(self):
+        self._order: 'OrderedDict[str, None]' = OrderedDict()
+    
+    def insert(self, key: str) -> None:
+        self._order[key] = None
+    
+    def update(self, key: str) -> None:
+        self._order.move_to_end(key)
+    
+    def access(self, key: str) -> None:
+        self._order.move_to_end(key)
+    
+    def remove(self, key: str) -> None:
+        del self._order[key]
+    
+    def victim(self, keep: Optional[str] = None) -> str:
+        for key in self._order:
+            if key != keep:
+                return key
+        raise KeyError("No entry can be evicted")
+
+
+class _FIFOOrder(_LRUOrder):
+    """Evicts the oldest inserted key; reads and overwrites keep its position"""
+    
+    def update(self, key: str) -> None:
+        pass
+    
+    def access(self, key: str) -> None:
+        pass
+
+
+class _LFUOrder:
+    """Evicts the least frequently used key, least recent first among equals.
+    
+    Keys sit in one insertion-ordered bucket per use count and the smallest
+    non-empty count is tracked, so reads, writes and evictions are O(1); only
+    removing the last key of the lowest bucket rescans the bucket counts.
+    """
+    
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._buckets: Dict[int, 'OrderedDict[str, None]'] = {}
+        self._min_count = 0
+    
+    def insert(self, key: str) -> None:
+        self._counts[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+    
+    def update(self, key: str) -> None:
+        self.access(key)
+    
+    def access(self, key: str) -> None:
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+    
+    def remove(self, key: str) -> None:
+        count = self._counts.pop(key)
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = min(self._buckets, default=0)
+    
+    def victim(self, keep: Optional[str] = None) -> str:
+        for key in self._buckets[self._min_count]:
+            if key != keep:
+                return key
+        # Only the kept key has the lowest count; fall back to the next bucket up
+        for count in sorted(self._buckets):
+            for key in self._buckets[count]:
+                if key != keep:
+                    return key
+        raise KeyError("No entry can be evicted")
+
+
+class _Sweeper:
+    """One daemon thread that periodically sweeps every open engine"""
+    
+    def __init__(self):
+        self._engines: 'weakref.WeakSet[CacheEngine]' = weakref.WeakSet()
+        self._interval: Optional[float] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def register(self, engine: 'CacheEngine', interval: float) -> None:
+        with self._lock:
+            self._engines.add(engine)
+            if self._interval is None or interval < self._interval:
+                self._interval = interval
+                self._wakeup.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cache-sweeper", daemon=True)
+                self._thread.start()
+    
+    def unregister(self, engine: 'CacheEngine') -> None:
+        with self._lock:
+            self._engines.discard(engine)
+    
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            with self._lock:
+                engines = list(self._engines)
+            for engine in engines:
+                engine.sweep()
+
+
+_SWEEPER = _Sweeper()
+
+_ORDERS = {
+    EvictionPolicy.LRU: _LRUOrder,
+    EvictionPolicy.FIFO: _FIFOOrder,
+    EvictionPolicy.LFU: _LFUOrder,
+}
+
+
+class CacheEngine:
+    """In-process key/value store with a byte budget, eviction policy and TTL.
+    
+    Capacity counts the UTF-8 key plus the value bytes of every entry. Expired
+    entries are dropped when read, and a background thread shared by all
+    engines pops each engine's expiry heap every ``sweep_interval`` seconds.
+    """
+    
+    def __init__(self, capacity_bytes: int, eviction_policy: EvictionPolicy, default_ttl: float,
+                 sweep_interval: Optional[float] = 1.0, clock: Callable[[], float] = time.monotonic):
+        if capacity_bytes < 1:
+            raise ValueError("Capacity must be at least 1 byte")
+        self._capacity = capacity_bytes
+        self._policy = eviction_policy
+        self._default_ttl = default_ttl
+        self._clock = clock
+        self._entries: Dict[str, _Entry] = {}
+        self._order = _ORDERS[eviction_policy]()
+        self._expiries: List[Tuple[float, str]] = []
+        self._used = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "sets": 0, "deletes": 0, "evictions": 0, "expirations": 0}
+        if sweep_interval:
+            _SWEEPER.register(self, sweep_interval)
+    
+    @property
+    def eviction_policy(self) -> EvictionPolicy:
+        return self._policy
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._order.access(key)
+            self._stats["hits"] += 1
+            return entry.value
+    
+    def set(self, key: str, value: Value, ttl: Optional[float] = None) -> None:
+        value = bytes(value)
+        size = len(key.encode('utf-8')) + len(value)
+        if size > self._capacity:
+            raise ValueError(f"Entry of {size} bytes exceeds cache capacity of {self._capacity} bytes")
+        expires_at = self._clock() + (self._default_ttl if ttl is None else ttl)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._order.update(key)
+                self._evict_until_fits(size - entry.size, key)
+                self._used += size - entry.size
+                entry.value, entry.size, entry.expires_at = value, size, expires_at
+            else:
+                self._evict_until_fits(size, None)
+                self._entries[key] = _Entry(value, size, expires_at)
+                self._used += size
+                self._order.insert(key)
+            heapq.heappush(self._expiries, (expires_at, key))
+            if len(self._expiries) > 2 * len(self._entries) + 64:
+                self._compact_expiries()
+            self._stats["sets"] += 1
+    
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self._stats["deletes"] += 1
+            return True
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(items=len(self._entries), used_bytes=self._used, capacity_bytes=self._capacity)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+    
+    def sweep(self) -> int:
+        """Drop every expired entry now; returns how many were removed"""
+        removed = 0
+        with self._lock:
+            now = self._clock()
+            while self._expiries and self._expiries[0][0] <= now:
+                expires_at, key = heapq.heappop(self._expiries)
+                entry = self._entries.get(key)
+                # Stale heap records are left behind when a key is overwritten or removed
+                if entry is not None and entry.expires_at == expires_at:
+                    self._remove(key)
+                    removed += 1
+            self._stats["expirations"] += removed
+        return removed
+    
+    def close(self) -> None:
+        _SWEEPER.unregister(self)
+        with self._lock:
+            self._entries.clear()
+            self._order = _ORDERS[self._policy]()
+            self._expiries = []
+            self._used = 0
+    
+    def _compact_expiries(self) -> None:
+        """Rebuild the expiry heap without the stale records of overwritten or removed keys"""
+        self._expiries = [(entry.expires_at, key) for key, entry in self._entries.items()]
+        heapq.heapify(self._expiries)
+    
+    def _evict_until_fits(self, extra: int, keep: Optional[str]) -> None:
+        while self._used + extra > self._capacity:
+            self._remove(self._order.victim(keep))
+            self._stats["evictions"] += 1
+    
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._order.remove(key)
+        self._used -= entry.size
@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+_PENDING: ContextVar[Optional[List[Callable[[], None]]]] = ContextVar('cloudconnect_pending_releases', default=None)
+
+
+@contextmanager
+def deferred_release() -> Iterator[List[Callable[[], None]]]:
+    """Collect the releases requested inside the block (see ``release``) instead of running them.
+
+    Services wrap their locked sections in this and pass the collected list to
+    ``run_releases`` once the locks are released and the transition has gone
+    through, so slow cleanup never runs under a lock and a failed operation
+    leaves stored data alone.
+    """
+    pending: List[Callable[[], None]] = []
+    token = _PENDING.set(pending)
+    try:
+        yield pending
+    finally:
+        _PENDING.reset(token)
+
+
+def release(cleanup: Callable[[], None]) -> None:
+    """Run ``cleanup`` now, or later if called inside a ``deferred_release`` block"""
+    pending = _PENDING.get()
+    if pending is None:
+        cleanup()
+    else:
+        pending.append(cleanup)
+
+
+def run_releases(pending: List[Callable[[], None]]) -> None:
+    for cleanup in pending:
+        cleanup()
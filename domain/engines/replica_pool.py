@@ -0,0 +1,178 @@
+import itertools
+import queue
+import threading
+import time
+import zlib
+from bisect import bisect
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional
+from domain.value_objects import LoadBalancingPolicy
+
+Handler = Callable[[Any], Any]
+
+_RETIRE = object()
+_VIRTUAL_NODES = 64
+
+
+def echo_handler(request: Any) -> Any:
+    return request
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+class Replica:
+    """Worker thread serving requests from its own queue"""
+    
+    def __init__(self, replica_id: int, pool: 'ReplicaPool', latency_samples: int):
+        self.replica_id = replica_id
+        self._pool = pool
+        self._queue: queue.Queue = queue.Queue()
+        self._latencies: Deque[float] = deque(maxlen=latency_samples)
+        self._outstanding = 0
+        self._served = 0
+        self._failed = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"replica-{replica_id}", daemon=True)
+        self._thread.start()
+    
+    @property
+    def outstanding(self) -> int:
+        return self._outstanding
+    
+    def submit(self, request: Any, future: Future) -> None:
+        with self._lock:
+            self._outstanding += 1
+        self._queue.put((request, future, time.perf_counter()))
+    
+    def retire(self) -> None:
+        """Stop after every request already queued has been served"""
+        self._queue.put(_RETIRE)
+    
+    def join(self) -> None:
+        self._thread.join()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            outstanding, served, failed = self._outstanding, self._served, self._failed
+        return {
+            "queue_depth": self._queue.qsize(),
+            "outstanding": outstanding,
+            "served": served,
+            "failed": failed,
+            "p50_ms": _percentile(latencies, 0.50) * 1000,
+            "p90_ms": _percentile(latencies, 0.90) * 1000,
+            "p99_ms": _percentile(latencies, 0.99) * 1000,
+        }
+    
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _RETIRE:
+                return
+            request, future, enqueued = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self._pool.handler(request))
+                    failed = 0
+                except Exception as e:
+                    future.set_exception(e)
+                    failed = 1
+            else:
+                failed = 0
+            with self._lock:
+                self._outstanding -= 1
+                self._served += 1 - failed
+                self._failed += failed
+                self._latencies.append(time.perf_counter() - enqueued)
+
+
+class ReplicaPool:
+    """Load-balanced set of replica workers for a running AppService.
+    
+    Requests are routed by round-robin, least outstanding requests or a
+    consistent-hash ring keyed by the request key. Scaling down first removes
+    replicas from routing and then lets them drain, so in-flight requests are
+    never dropped.
+    """
+    
+    def __init__(self, replica_count: int, handler: Optional[Handler] = None,
+                 balancing: LoadBalancingPolicy = LoadBalancingPolicy.ROUND_ROBIN, latency_samples: int = 10000):
+        self.handler: Handler = handler or echo_handler
+        self._balancing = balancing
+        self._latency_samples = latency_samples
+        self._ids = itertools.count()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._replicas: List[Replica] = []
+        self._ring: List[int] = []
+        self._ring_replicas: List[Replica] = []
+        self._closed = False
+        self.scale(replica_count)
+    
+    @property
+    def replica_count(self) -> int:
+        return len(self._replicas)
+    
+    @property
+    def balancing(self) -> LoadBalancingPolicy:
+        return self._balancing
+    
+    def submit(self, request: Any, key: Optional[str] = None) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Replica pool is shut down")
+            replica = self._choose(request, key)
+            replica.submit(request, future)
+        return future
+    
+    def dispatch(self, request: Any, key: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+        return self.submit(request, key).result(timeout)
+    
+    def scale(self, replica_count: int) -> None:
+        retired: List[Replica] = []
+        with self._lock:
+            while len(self._replicas) < replica_count:
+                self._replicas.append(Replica(next(self._ids), self, self._latency_samples))
+            while len(self._replicas) > replica_count:
+                retired.append(self._replicas.pop())
+            self._build_ring()
+        for replica in retired:
+            replica.retire()
+    
+    def stats(self) -> Dict[int, Dict]:
+        with self._lock:
+            replicas = list(self._replicas)
+        return {replica.replica_id: replica.stats() for replica in replicas}
+    
+    def close(self, wait: bool = True) -> None:
+        with self._lock:
+            self._closed = True
+            replicas, self._replicas = self._replicas, []
+            self._build_ring()
+        for replica in replicas:
+            replica.retire()
+        if wait:
+            for replica in replicas:
+                replica.join()
+    
+    def _choose(self, request: Any, key: Optional[str]) -> Replica:
+        if self._balancing is LoadBalancingPolicy.LEAST_OUTSTANDING:
+            return min(self._replicas, key=lambda replica: replica.outstanding)
+        if self._balancing is LoadBalancingPolicy.CONSISTENT_HASH:
+            point = zlib.crc32(str(request if key is None else key).encode('utf-8'))
+            return self._ring_replicas[bisect(self._ring, point) % len(self._ring)]
+        return self._replicas[next(self._counter) % len(self._replicas)]
+    
+    def _build_ring(self) -> None:
+        points = sorted(((zlib.crc32(f"{replica.replica_id}-{vnode}".encode('utf-8')), replica)
+                         for replica in self._replicas for vnode in range(_VIRTUAL_NODES)),
+                        key=lambda point: point[0])
+        self._ring = [point for point, _ in points]
+        self._ring_replicas = [replica for _, replica in points]
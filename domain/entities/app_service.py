@@ -1,21 +1,117 @@
+import threading
 from datetime import datetime
+from typing import Dict, Optional
 from domain.entities.resource import Resource
-from domain.value_objects import ResourceId, Runtime, Region
+from domain.engines.release import release
+from domain.engines.replica_pool import Handler, ReplicaPool
+from domain.exceptions import ResourceNotRunningError
+from domain.states import ResourceState
+from domain.value_objects import ResourceId, Runtime, Region, LoadBalancingPolicy
+
+_POOL_LOCK = threading.Lock()
+
+
+def _validate_replica_count(replica_count: int) -> None:
+    if not 1 <= replica_count <= 10:
+        raise ValueError("Replica count must be between 1 and 10")
+
+
+class _Replicas:
+    """Request handler, balancing policy and replica pool of an AppService, kept in its engine slot"""
+    
+    __slots__ = ('handler', 'balancing', 'pool')
+    
+    def __init__(self):
+        self.handler: Optional[Handler] = None
+        self.balancing = LoadBalancingPolicy.ROUND_ROBIN
+        self.pool: Optional[ReplicaPool] = None
 
 
 class AppService(Resource):
+    __slots__ = ('_runtime', '_region', '_replica_count')
+    
     def __init__(self, resource_id: ResourceId, runtime: Runtime, region: Region, replica_count: int):
-        if not 1 <= replica_count <= 10:
-            raise ValueError("Replica count must be between 1 and 10")
+        _validate_replica_count(replica_count)
         
-        config = {
-            "runtime": runtime.value,
-            "region": region.value,
-            "replica_count": replica_count
-        }
-        super().__init__(resource_id, config)
+        super().__init__(resource_id)
         self._runtime = runtime
         self._region = region
+        self._replica_count = replica_count
+    
+    @property
+    def runtime(self) -> Runtime:
+        return self._runtime
+    
+    @property
+    def region(self) -> Region:
+        return self._region
+    
+    @property
+    def replica_count(self) -> int:
+        return self._replica_count
+    
+    @property
+    def config(self) -> Dict:
+        return {
+            "runtime": self._runtime.value,
+            "region": self._region.value,
+            "replica_count": self._replica_count
+        }
+    
+    @property
+    def replicas(self) -> ReplicaPool:
+        """Replica workers of a started service, exposing submit/dispatch and stats; created on first use"""
+        if self.state != "Started":
+            raise ResourceNotRunningError(f"AppService '{self.id}' is not started")
+        replicas = self._replicas()
+        if replicas.pool is None:
+            with _POOL_LOCK:
+                if replicas.pool is None:
+                    replicas.pool = ReplicaPool(self._replica_count, replicas.handler, replicas.balancing)
+        return replicas.pool
+    
+    def set_handler(self, handler: Handler, balancing: Optional[LoadBalancingPolicy] = None) -> None:
+        """Set the request handler of the replicas; a balancing policy takes effect from the next start"""
+        replicas = self._replicas()
+        replicas.handler = handler
+        if balancing is not None:
+            replicas.balancing = balancing
+        if replicas.pool is not None:
+            replicas.pool.handler = handler
+    
+    def scale(self, replica_count: int) -> None:
+        """Change the replica count; a running pool grows or drains replicas without dropping requests"""
+        _validate_replica_count(replica_count)
+        self._replica_count = replica_count
+        if self._engine is not None and self._engine.pool is not None:
+            self._engine.pool.scale(replica_count)
+    
+    def stop(self, notify: bool = True) -> None:
+        super().stop(notify)
+        self._close_pool()
+    
+    def delete(self, notify: bool = True) -> None:
+        super().delete(notify)
+        self._close_pool()
+    
+    def restore(self, state: ResourceState, created_at: float) -> None:
+        super().restore(state, created_at)
+        self._close_pool()
+    
+    def _replicas(self) -> _Replicas:
+        if self._engine is None:
+            with _POOL_LOCK:
+                if self._engine is None:
+                    self._engine = _Replicas()
+        return self._engine
+    
+    def _close_pool(self) -> None:
+        # Draining waits for in-flight requests, so through a service it happens after the locks are released
+        if self._engine is None:
+            return
+        pool, self._engine.pool = self._engine.pool, None
+        if pool is not None:
+            release(pool.close)
     
     def get_resource_type(self) -> str:
         return "AppService"
@@ -28,4 +124,4 @@ class AppService(Resource):
         return "AppService stopped successfully"
     
     def _get_delete_message(self) -> str:
-        return "AppService marked as deleted"
\ No newline at end of file
+        return "AppService marked as deleted"
@@ -1,22 +1,81 @@
+import threading
 from datetime import datetime
+from typing import Dict, Optional
 from domain.entities.resource import Resource
+from domain.engines.cache_engine import CacheEngine
+from domain.exceptions import ResourceNotRunningError
+from domain.states import ResourceState
 from domain.value_objects import ResourceId, EvictionPolicy
 
+_ENGINE_LOCK = threading.Lock()
+
+
 class CacheDB(Resource):
+    __slots__ = ('_ttl_seconds', '_capacity_mb', '_eviction_policy')
+    
+    # Seconds between background sweeps of expired entries; None disables the sweeper
+    sweep_interval: Optional[float] = 1.0
+    
     def __init__(self, resource_id: ResourceId, ttl_seconds: int, capacity_mb: int, eviction_policy: EvictionPolicy):
         if not 1 <= ttl_seconds <= 86400:
             raise ValueError("TTL must be between 1 and 86400 seconds")
         if not 1 <= capacity_mb <= 10000:
             raise ValueError("Capacity must be between 1 and 10000 MB")
         
-        config = {
-            "ttl_seconds": ttl_seconds,
-            "capacity_mb": capacity_mb,
-            "eviction_policy": eviction_policy.value
-        }
-        super().__init__(resource_id, config)
+        super().__init__(resource_id)
+        self._ttl_seconds = ttl_seconds
+        self._capacity_mb = capacity_mb
         self._eviction_policy = eviction_policy
     
+    @property
+    def ttl_seconds(self) -> int:
+        return self._ttl_seconds
+    
+    @property
+    def capacity_mb(self) -> int:
+        return self._capacity_mb
+    
+    @property
+    def eviction_policy(self) -> EvictionPolicy:
+        return self._eviction_policy
+    
+    @property
+    def config(self) -> Dict:
+        return {
+            "ttl_seconds": self._ttl_seconds,
+            "capacity_mb": self._capacity_mb,
+            "eviction_policy": self._eviction_policy.value
+        }
+    
+    @property
+    def cache(self) -> CacheEngine:
+        """Key/value engine of a started cache, exposing get/set/delete and stats; created on first use"""
+        if self.state != "Started":
+            raise ResourceNotRunningError(f"CacheDB '{self.id}' is not started")
+        if self._engine is None:
+            with _ENGINE_LOCK:
+                if self._engine is None:
+                    self._engine = CacheEngine(self._capacity_mb * 1024 * 1024, self._eviction_policy,
+                                               self._ttl_seconds, self.sweep_interval)
+        return self._engine
+    
+    def stop(self, notify: bool = True) -> None:
+        super().stop(notify)
+        self._close_engine()
+    
+    def delete(self, notify: bool = True) -> None:
+        super().delete(notify)
+        self._close_engine()
+    
+    def restore(self, state: ResourceState, created_at: float) -> None:
+        super().restore(state, created_at)
+        self._close_engine()
+    
+    def _close_engine(self) -> None:
+        engine, self._engine = self._engine, None
+        if engine is not None:
+            engine.close()
+    
     def get_resource_type(self) -> str:
         return "CacheDB"
     
@@ -1,19 +1,32 @@
+import time
+import weakref
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Dict, List
+from typing import Any, Dict, List, Sequence, Tuple
 from domain.value_objects import ResourceId
-from domain.states import ResourceState, CreatedState
+from domain.states import ResourceState, CREATED
+
+
+class _ObserverSet(list):
+    """Observers shared by every resource attached to the same ones; never modified once built"""
+    __slots__ = ('__weakref__',)
+
+
+# Observer sets by the ids of their members; an entry goes away with the last resource using it
+_OBSERVER_SETS: 'weakref.WeakValueDictionary[Tuple[int, ...], _ObserverSet]' = weakref.WeakValueDictionary()
 
 
 class Resource(ABC):
     """Base entity for all cloud resources"""
     
-    def __init__(self, resource_id: ResourceId, config: Dict):
+    # _engine holds the runtime state of a started resource (cache engine, blob store, replicas), created on first use
+    __slots__ = ('_id', '_state', '_created_at', '_observers', '_engine', '__weakref__')
+    
+    def __init__(self, resource_id: ResourceId):
         self._id = resource_id
-        self._config = config
-        self._state: ResourceState = CreatedState()
-        self._created_at = datetime.now()
-        self._observers: List['ResourceObserver'] = []
+        self._state: ResourceState = CREATED
+        self._created_at = time.time()
+        self._observers: Sequence['ResourceObserver'] = ()
+        self._engine: Any = None
     
     @property
     def id(self) -> ResourceId:
@@ -23,20 +36,80 @@ class Resource(ABC):
     def state(self) -> str:
         return self._state.get_state_name()
     
+    @property
+    @abstractmethod
+    def config(self) -> Dict:
+        pass
+    
+    @property
+    def created_at(self) -> float:
+        """Creation time as a Unix epoch timestamp"""
+        return self._created_at
+    
     def set_state(self, state: ResourceState) -> None:
         self._state = state
     
-    def start(self) -> None:
-        self._state.start(self)
+    def restore(self, state: ResourceState, created_at: float) -> None:
+        """Reapply persisted lifecycle data without notifying observers"""
+        self._state = state
+        self._created_at = created_at
+    
+    # Transitions read the shared state table directly instead of dispatching through the state object
+    def start(self, notify: bool = True) -> None:
+        next_state = self._state.next_states['start']
+        if next_state is None:
+            self._state.reject('start')
+        self._state = next_state
+        if notify:
+            self.notify_started()
+    
+    def stop(self, notify: bool = True) -> None:
+        next_state = self._state.next_states['stop']
+        if next_state is None:
+            self._state.reject('stop')
+        self._state = next_state
+        if notify:
+            self.notify_stopped()
     
-    def stop(self) -> None:
-        self._state.stop(self)
+    def delete(self, notify: bool = True) -> None:
+        next_state = self._state.next_states['delete']
+        if next_state is None:
+            self._state.reject('delete')
+        self._state = next_state
+        if notify:
+            self.notify_deleted()
     
-    def delete(self) -> None:
-        self._state.delete(self)
+    def can_transition(self, action: str) -> bool:
+        """Whether 'start', 'stop' or 'delete' is permitted now, without raising"""
+        return self._state.can(action)
+    
+    def check_transition(self, action: str) -> None:
+        """Raise the InvalidStateTransitionError the transition would raise, without applying it"""
+        if not self._state.can(action):
+            self._state.reject(action)
     
     def attach_observer(self, observer: 'ResourceObserver') -> None:
-        self._observers.append(observer)
+        """Attach an observer; one that is already attached is not attached again"""
+        if any(attached is observer for attached in self._observers):
+            return
+        observers = (*self._observers, observer)
+        key = tuple(map(id, observers))
+        shared = _OBSERVER_SETS.get(key)
+        if shared is None:
+            shared = _OBSERVER_SETS.setdefault(key, _ObserverSet(observers))
+        self._observers = shared
+    
+    @property
+    def observers(self) -> List['ResourceObserver']:
+        return list(self._observers)
+    
+    def get_event_message(self, event: str) -> str:
+        """Message for a 'started', 'stopped' or 'deleted' event"""
+        if event == 'started':
+            return self._get_start_message()
+        if event == 'stopped':
+            return self._get_stop_message()
+        return self._get_delete_message()
     
     def notify_started(self) -> None:
         for observer in self._observers:
@@ -1,22 +1,79 @@
+import os
+import functools
+import shutil
+import threading
 from datetime import datetime
+from typing import Dict
+from urllib.parse import quote
 from domain.entities.resource import Resource
+from domain.engines.blob_store import BlobStore
+from domain.engines.release import release
+from domain.exceptions import ResourceNotRunningError
 from domain.value_objects import ResourceId
 
+_STORE_LOCK = threading.Lock()
+
 
 class StorageAccount(Resource):
+    __slots__ = ('_encryption_enabled', '_access_key', '_max_size_gb')
+    
+    # Directory holding one blob folder per storage account
+    blob_root = "blobs"
+    
     def __init__(self, resource_id: ResourceId, encryption_enabled: bool, access_key: str, max_size_gb: int):
         if not 1 <= max_size_gb <= 10000:
             raise ValueError("Max size must be between 1 and 10000 GB")
         if not access_key or len(access_key) < 16:
             raise ValueError("Access key must be at least 16 characters")
         
-        config = {
-            "encryption_enabled": encryption_enabled,
-            "access_key": access_key,
-            "max_size_gb": max_size_gb
-        }
-        super().__init__(resource_id, config)
+        super().__init__(resource_id)
         self._encryption_enabled = encryption_enabled
+        self._access_key = access_key
+        self._max_size_gb = max_size_gb
+    
+    @property
+    def encryption_enabled(self) -> bool:
+        return self._encryption_enabled
+    
+    @property
+    def max_size_gb(self) -> int:
+        return self._max_size_gb
+    
+    @property
+    def config(self) -> Dict:
+        return {
+            "encryption_enabled": self._encryption_enabled,
+            "access_key": self._access_key,
+            "max_size_gb": self._max_size_gb
+        }
+    
+    @property
+    def blobs(self) -> BlobStore:
+        """Blob store of a started account; blobs persist across stop/start and are removed on delete"""
+        if self.state != "Started":
+            raise ResourceNotRunningError(f"StorageAccount '{self.id}' is not started")
+        if self._engine is None:
+            with _STORE_LOCK:
+                if self._engine is None:
+                    self._engine = self._open_store()
+        return self._engine
+    
+    def stop(self, notify: bool = True) -> None:
+        super().stop(notify)
+        self._engine = None
+    
+    def delete(self, notify: bool = True) -> None:
+        super().delete(notify)
+        self._engine = None
+        # Through a service this runs once the delete has gone through, outside its locks
+        release(functools.partial(shutil.rmtree, self._store_root(), ignore_errors=True))
+    
+    def _store_root(self) -> str:
+        return os.path.join(self.blob_root, quote(self.id.value, safe=''))
+    
+    def _open_store(self) -> BlobStore:
+        secret = self._access_key.encode('utf-8') if self._encryption_enabled else None
+        return BlobStore(self._store_root(), self._max_size_gb * 1024 ** 3, secret)
     
     def get_resource_type(self) -> str:
         return "StorageAccount"
@@ -30,4 +87,4 @@ class StorageAccount(Resource):
         return "StorageAccount stopped successfully"
     
     def _get_delete_message(self) -> str:
-        return "StorageAccount marked as deleted"
\ No newline at end of file
+        return "StorageAccount marked as deleted"
@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class DomainException(Exception):
     """Base exception for domain errors"""
     pass
@@ -12,4 +15,33 @@ class ResourceNotFoundException(DomainException):
 
 
 class DuplicateResourceError(DomainException):
-    pass
\ No newline at end of file
+    pass
+
+
+class ResourceNotRunningError(DomainException):
+    pass
+
+
+class QuotaExceededError(DomainException):
+    pass
+
+
+class BlobIntegrityError(DomainException):
+    """An encrypted blob failed authentication: it was altered, truncated or encrypted with another key"""
+    pass
+
+
+class DependencyCycleError(DomainException):
+    pass
+
+
+class IdempotencyKeyReusedError(DomainException):
+    pass
+
+
+class ThrottledError(DomainException):
+    """Rejected by admission control; ``retry_after`` suggests when to try again, in seconds"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,281 @@
+import operator
+import weakref
+from array import array
+from collections import Counter
+from enum import Enum
+from functools import partial
+from itertools import compress
+from typing import Dict, Iterator, List, Optional, Tuple
+from domain.entities.resource import Resource
+from domain.entities.app_service import AppService
+from domain.entities.storage_account import StorageAccount
+from domain.entities.cache_db import CacheDB
+from domain.exceptions import DuplicateResourceError, ResourceNotFoundException
+from domain.repositories.resource_repository import ResourceRepository
+from domain.states import STATES_BY_NAME
+from domain.value_objects import ResourceId, Runtime, Region, EvictionPolicy
+
+_NONE = 255
+_TYPES = ("AppService", "StorageAccount", "CacheDB")
+_STATES = tuple(STATES_BY_NAME)
+_CODES = {
+    "resource_type": _TYPES,
+    "state": _STATES,
+    "region": tuple(region.value for region in Region),
+    "runtime": tuple(runtime.value for runtime in Runtime),
+    "eviction_policy": tuple(policy.value for policy in EvictionPolicy),
+}
+_NUMERIC = ("replica_count", "capacity_mb", "ttl_seconds", "max_size_gb", "created_at")
+# Numeric fields that only exist on one resource type; other rows hold 0 and must not match
+_NUMERIC_OWNER = {
+    "replica_count": "AppService",
+    "capacity_mb": "CacheDB",
+    "ttl_seconds": "CacheDB",
+    "max_size_gb": "StorageAccount",
+}
+
+
+def _code(field: str, value) -> int:
+    value = value.value if isinstance(value, Enum) else value
+    try:
+        return _CODES[field].index(value)
+    except ValueError:
+        raise ValueError(f"Unknown {field}: {value}")
+
+
+class ColumnarResourceRepository(ResourceRepository):
+    """Resource repository that stores every attribute in a typed array column.
+
+    Rows are addressed by an integer id assigned in insertion order and names
+    map to rows. Categorical fields are one-byte codes, so equality filters run
+    as C-level byte translations and combine as integer bit masks; aggregations
+    count or sum the selected rows without building entities. A ``Resource`` is
+    materialized only when ``get()`` is called, is shared while it stays
+    referenced or started, and writes its state changes back to the state column.
+    """
+    
+    records_state = True
+    
+    def __init__(self):
+        super().__init__()
+        self._rows: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._columns: Dict[str, array] = {
+            "resource_type": array('B'),
+            "state": array('B'),
+            "region": array('B'),
+            "runtime": array('B'),
+            "eviction_policy": array('B'),
+            "encryption_enabled": array('B'),
+            "replica_count": array('B'),
+            "capacity_mb": array('i'),
+            "ttl_seconds": array('i'),
+            "max_size_gb": array('i'),
+            "created_at": array('d'),
+        }
+        self._access_keys: Dict[int, str] = {}
+        self._materialized: 'weakref.WeakValueDictionary[int, Resource]' = weakref.WeakValueDictionary()
+        # Started resources stay materialized so runtime state such as a cache engine survives
+        self._running: Dict[int, Resource] = {}
+        self._observers: Tuple = ()
+    
+    def add(self, resource: Resource) -> None:
+        with self._lock:
+            name = resource.id.value
+            if name in self._rows:
+                raise DuplicateResourceError(f"Resource '{resource.id}' already exists")
+            row = len(self._names)
+            config = resource.config
+            columns = self._columns
+            columns["resource_type"].append(_code("resource_type", resource.get_resource_type()))
+            columns["state"].append(_code("state", resource.state))
+            for field in ("region", "runtime", "eviction_policy"):
+                columns[field].append(_code(field, config[field]) if field in config else _NONE)
+            columns["encryption_enabled"].append(int(config["encryption_enabled"]) if "encryption_enabled" in config
+                                                 else _NONE)
+            for field in ("replica_count", "capacity_mb", "ttl_seconds", "max_size_gb"):
+                columns[field].append(config.get(field, 0))
+            columns["created_at"].append(resource.created_at)
+            if "access_key" in config:
+                self._access_keys[row] = config["access_key"]
+            self._index.rollup.add(resource.get_resource_type(), resource.state, config)
+            self._names.append(name)
+            self._rows[name] = row
+            resource.attach_observer(self)
+            for observer in self._observers:
+                resource.attach_observer(observer)
+            self._materialized[row] = resource
+            if resource.state == "Started":
+                self._running[row] = resource
+    
+    def update(self, resource: Resource, previous_config: Dict) -> None:
+        with self._lock:
+            row = self._rows[resource.id.value]
+            config = resource.config
+            for field in ("replica_count", "capacity_mb", "ttl_seconds", "max_size_gb"):
+                if field in config:
+                    self._columns[field][row] = config[field]
+            self._index.rollup.reconfigure(resource.get_resource_type(), _STATES[self._columns["state"][row]],
+                                           previous_config, config)
+    
+    def get(self, resource_id: ResourceId) -> Resource:
+        row = self._rows.get(resource_id.value)
+        if row is None:
+            raise ResourceNotFoundException(f"Resource '{resource_id}' not found")
+        return self._materialize(row)
+    
+    def exists(self, resource_id: ResourceId) -> bool:
+        return resource_id.value in self._rows
+    
+    def all(self) -> Iterator[Resource]:
+        return (self._materialize(row) for row in range(len(self._names)))
+    
+    def attach_observer(self, observer) -> None:
+        with self._lock:
+            if any(attached is observer for attached in self._observers):
+                return
+            self._observers += (observer,)
+            for resource in list(self._materialized.values()):
+                resource.attach_observer(observer)
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    # --- entity materialization and state write-back ---
+    
+    def _materialize(self, row: int) -> Resource:
+        resource = self._materialized.get(row)
+        if resource is not None:
+            return resource
+        with self._lock:
+            resource = self._materialized.get(row)
+            if resource is None:
+                resource = self._build(row)
+                resource.attach_observer(self)
+                for observer in self._observers:
+                    resource.attach_observer(observer)
+                self._materialized[row] = resource
+        return resource
+    
+    def _build(self, row: int) -> Resource:
+        columns = self._columns
+        resource_id = ResourceId(self._names[row])
+        resource_type = _TYPES[columns["resource_type"][row]]
+        if resource_type == "AppService":
+            resource = AppService(resource_id, list(Runtime)[columns["runtime"][row]],
+                                  list(Region)[columns["region"][row]], columns["replica_count"][row])
+        elif resource_type == "StorageAccount":
+            resource = StorageAccount(resource_id, bool(columns["encryption_enabled"][row]),
+                                      self._access_keys[row], columns["max_size_gb"][row])
+        else:
+            resource = CacheDB(resource_id, columns["ttl_seconds"][row], columns["capacity_mb"][row],
+                               list(EvictionPolicy)[columns["eviction_policy"][row]])
+        resource.restore(STATES_BY_NAME[_STATES[columns["state"][row]]], columns["created_at"][row])
+        return resource
+    
+    def _write_back(self, resource: Resource) -> None:
+        with self._lock:
+            row = self._rows[resource.id.value]
+            previous = _STATES[self._columns["state"][row]]
+            if previous != resource.state:
+                self._index.rollup.move(resource, previous, resource.state)
+            self._columns["state"][row] = _code("state", resource.state)
+            if resource.state == "Started":
+                self._running[row] = resource
+            else:
+                self._running.pop(row, None)
+    
+    def on_resource_started(self, resource: Resource, message: str) -> None:
+        self._write_back(resource)
+    
+    def on_resource_stopped(self, resource: Resource, message: str) -> None:
+        self._write_back(resource)
+    
+    def on_resource_deleted(self, resource: Resource, message: str) -> None:
+        self._write_back(resource)
+    
+    def on_batch(self, events: List[Tuple[str, Resource, str]]) -> None:
+        for _, resource, _ in events:
+            self._write_back(resource)
+    
+    # --- vectorized filters and aggregations ---
+    
+    def _mask(self, **filters) -> Optional[bytes]:
+        """One byte per row, 1 where every filter holds; None when no filter was given"""
+        selected: Optional[int] = None
+        size = len(self._names)
+        for field, value in filters.items():
+            if value is None:
+                continue
+            column = self._columns.get(field)
+            if column is None:
+                raise ValueError(f"Unknown query field: {field}")
+            if field in _NUMERIC:
+                mask = self._range_mask(column, value)
+                if field in _NUMERIC_OWNER:
+                    owner_bits = int.from_bytes(self._mask(resource_type=_NUMERIC_OWNER[field]), 'little')
+                    mask = (int.from_bytes(mask, 'little') & owner_bits).to_bytes(size, 'little')
+            else:
+                table = bytearray(256)
+                table[int(bool(value)) if field == "encryption_enabled" else _code(field, value)] = 1
+                mask = column.tobytes().translate(table)
+            bits = int.from_bytes(mask, 'little')
+            selected = bits if selected is None else selected & bits
+        if selected is None:
+            return None
+        return selected.to_bytes(size, 'little')
+    
+    @staticmethod
+    def _range_mask(column: array, bounds: Tuple) -> bytes:
+        low, high = bounds
+        if low is None and high is None:
+            return b'\x01' * len(column)
+        if high is None:
+            return bytes(map(partial(operator.le, low), column))
+        if low is None:
+            return bytes(map(partial(operator.ge, high), column))
+        low_bits = int.from_bytes(bytes(map(partial(operator.le, low), column)), 'little')
+        high_bits = int.from_bytes(bytes(map(partial(operator.ge, high), column)), 'little')
+        return (low_bits & high_bits).to_bytes(len(column), 'little')
+    
+    def _selected_rows(self, **filters) -> Iterator[int]:
+        mask = self._mask(**filters)
+        rows = range(len(self._names))
+        return iter(rows) if mask is None else compress(rows, mask)
+    
+    def query(self, **filters) -> List[Resource]:
+        return [self._materialize(row) for row in self._selected_rows(**filters)]
+    
+    def names(self, **filters) -> List[str]:
+        """Names of matching resources without materializing entities"""
+        names = self._names
+        return [names[row] for row in self._selected_rows(**filters)]
+    
+    def count(self, **filters) -> int:
+        mask = self._mask(**filters)
+        return len(self._names) if mask is None else mask.count(1)
+    
+    def count_by(self, field: str, **filters) -> Dict[str, int]:
+        """Row counts per value of a categorical field, e.g. count_by('state', region=Region.EAST_US)"""
+        column = self._columns[field]
+        mask = self._mask(**filters)
+        counts = Counter(column if mask is None else compress(column, mask))
+        labels = _CODES[field]
+        return {labels[code]: count for code, count in counts.items() if code != _NONE}
+    
+    def sum_by(self, value_field: str, group_field: str, **filters) -> Dict[str, int]:
+        """Sum of a numeric column per value of a categorical field, e.g. sum_by('capacity_mb', 'eviction_policy')"""
+        values = self._columns[value_field]
+        base = self._mask(**filters)
+        totals = {}
+        for label in _CODES[group_field]:
+            mask = self._mask(**{group_field: label})
+            if base is not None:
+                mask = (int.from_bytes(mask, 'little') & int.from_bytes(base, 'little')).to_bytes(len(mask), 'little')
+            totals[label] = sum(compress(values, mask))
+        return totals
+    
+    def total(self, value_field: str, **filters) -> float:
+        values = self._columns[value_field]
+        mask = self._mask(**filters)
+        return sum(values if mask is None else compress(values, mask))
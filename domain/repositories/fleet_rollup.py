@@ -0,0 +1,173 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+from domain.entities.resource import Resource
+
+# Upper bounds, in seconds, of the CacheDB TTL distribution buckets; the last bucket is open-ended
+TTL_BUCKETS = (60, 300, 900, 3600, 86400)
+_METRICS = ("resources", "app_services", "replicas", "storage_accounts", "storage_gb", "cache_dbs", "cache_mb",
+            "cache_ttl_seconds")
+
+
+# Totals keyed by configuration, per resource type: (count metric, amount metric)
+_GROUPS = {"AppService": ("app_services", "replicas"), "StorageAccount": ("storage_accounts", "storage_gb"),
+           "CacheDB": ("cache_dbs", "cache_mb")}
+
+# What a resource adds to the totals of its type: (configuration key, amount, TTL seconds)
+Profile = Tuple[Tuple, int, int]
+
+
+def _ttl_bucket(ttl_seconds: int) -> str:
+    for bound in TTL_BUCKETS:
+        if ttl_seconds <= bound:
+            return f"<={bound}"
+    return f">{TTL_BUCKETS[-1]}"
+
+
+def _config_profile(resource_type: str, config: Dict) -> Profile:
+    if resource_type == "AppService":
+        return (config["region"], config["runtime"]), config["replica_count"], 0
+    if resource_type == "StorageAccount":
+        return (config["encryption_enabled"],), config["max_size_gb"], 0
+    if resource_type == "CacheDB":
+        ttl_seconds = config["ttl_seconds"]
+        return (config["eviction_policy"], _ttl_bucket(ttl_seconds)), config["capacity_mb"], ttl_seconds
+    return (), 0, 0
+
+
+def _resource_profile(resource_type: str, resource: Resource) -> Profile:
+    """Same as ``_config_profile``, read from the typed fields so that a transition builds no config dict"""
+    if resource_type == "AppService":
+        return (resource.region.value, resource.runtime.value), resource.replica_count, 0
+    if resource_type == "StorageAccount":
+        return (resource.encryption_enabled,), resource.max_size_gb, 0
+    if resource_type == "CacheDB":
+        ttl_seconds = resource.ttl_seconds
+        return (resource.eviction_policy.value, _ttl_bucket(ttl_seconds)), resource.capacity_mb, ttl_seconds
+    return (), 0, 0
+
+
+class FleetRollup:
+    """Running aggregates over a resource collection, kept current in constant time per change.
+
+    Each resource contributes to a handful of totals keyed by its type, state
+    and configuration (region and runtime, encryption, eviction policy and TTL
+    bucket). A change subtracts the old contribution and adds the new one, so
+    ``summary()`` only reads these totals and its cost does not depend on the
+    number of resources. Deleted resources stay in the totals under their state
+    but are left out of the provisioned figures.
+    """
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[Tuple, int]] = {metric: defaultdict(int) for metric in _METRICS}
+        self._lock = threading.Lock()
+
+    def add(self, resource_type: str, state: str, config: Dict) -> None:
+        profile = _config_profile(resource_type, config)
+        with self._lock:
+            self._apply(resource_type, state, profile, 1)
+
+    def move(self, resource: Resource, previous_state: str, state: str) -> None:
+        """Record a state transition"""
+        resource_type = resource.get_resource_type()
+        profile = _resource_profile(resource_type, resource)
+        with self._lock:
+            self._apply(resource_type, previous_state, profile, -1)
+            self._apply(resource_type, state, profile, 1)
+
+    def reconfigure(self, resource_type: str, state: str, previous_config: Dict, config: Dict) -> None:
+        previous, profile = _config_profile(resource_type, previous_config), _config_profile(resource_type, config)
+        with self._lock:
+            self._apply(resource_type, state, previous, -1)
+            self._apply(resource_type, state, profile, 1)
+
+    def _apply(self, resource_type: str, state: str, profile: Profile, sign: int) -> None:
+        totals = self._totals
+        totals["resources"][(resource_type, state)] += sign
+        groups = _GROUPS.get(resource_type)
+        if groups is None:
+            return
+        configuration, amount, ttl_seconds = profile
+        key = configuration + (state,)
+        totals[groups[0]][key] += sign
+        totals[groups[1]][key] += sign * amount
+        if ttl_seconds:
+            totals["cache_ttl_seconds"][key] += sign * ttl_seconds
+
+    def totals(self) -> Dict[str, Dict[Tuple, int]]:
+        """Copy of the raw totals; the totals of several rollups add up with ``merged``"""
+        with self._lock:
+            return {metric: {key: value for key, value in values.items() if value}
+                    for metric, values in self._totals.items()}
+
+    @classmethod
+    def merged(cls, totals: Iterable[Dict[str, Dict[Tuple, int]]]) -> 'FleetRollup':
+        rollup = cls()
+        for part in totals:
+            for metric, values in part.items():
+                target = rollup._totals[metric]
+                for key, value in values.items():
+                    target[key] += value
+        return rollup
+
+    def summary(self) -> Dict:
+        """JSON-ready fleet summary: counts by type and state, and capacity per resource type"""
+        totals = self.totals()
+        by_type: Dict[str, Dict[str, int]] = {}
+        by_state: Dict[str, int] = defaultdict(int)
+        for (resource_type, state), count in sorted(totals["resources"].items()):
+            by_type.setdefault(resource_type, {})[state] = count
+            by_state[state] += count
+
+        app_service = {"services": 0, "running": 0, "replicas": 0, "running_replicas": 0}
+        by_region: Dict[str, Dict[str, int]] = {}
+        by_runtime: Dict[str, Dict[str, int]] = {}
+        for (region, runtime, state), count in sorted(totals["app_services"].items()):
+            if state == "Deleted":
+                continue
+            replicas = totals["replicas"].get((region, runtime, state), 0)
+            running = state == "Started"
+            if region not in by_region:
+                by_region[region] = {"services": 0, "replicas": 0, "running_replicas": 0}
+            if runtime not in by_runtime:
+                by_runtime[runtime] = {"services": 0, "replicas": 0, "running_replicas": 0}
+            for group in (app_service, by_region[region], by_runtime[runtime]):
+                group["services"] += count
+                group["replicas"] += replicas
+                if running:
+                    group["running_replicas"] += replicas
+            if running:
+                app_service["running"] += count
+        app_service["by_region"] = by_region
+        app_service["by_runtime"] = by_runtime
+
+        accounts = encrypted = gigabytes = 0
+        for (encryption_enabled, state), count in totals["storage_accounts"].items():
+            if state == "Deleted":
+                continue
+            accounts += count
+            gigabytes += totals["storage_gb"].get((encryption_enabled, state), 0)
+            if encryption_enabled:
+                encrypted += count
+        storage_account = {"accounts": accounts, "provisioned_gb": gigabytes, "encrypted": encrypted,
+                           "encryption_ratio": encrypted / accounts if accounts else 0.0}
+
+        databases = megabytes = ttl_total = 0
+        mb_by_policy: Dict[str, int] = {}
+        ttl_distribution = {_ttl_bucket(bound): 0 for bound in TTL_BUCKETS + (TTL_BUCKETS[-1] + 1,)}
+        for (policy, bucket, state), count in sorted(totals["cache_dbs"].items()):
+            if state == "Deleted":
+                continue
+            capacity = totals["cache_mb"].get((policy, bucket, state), 0)
+            databases += count
+            megabytes += capacity
+            ttl_total += totals["cache_ttl_seconds"].get((policy, bucket, state), 0)
+            mb_by_policy[policy] = mb_by_policy.get(policy, 0) + capacity
+            ttl_distribution[bucket] += count
+        cache_db = {"databases": databases, "provisioned_mb": megabytes, "mb_by_eviction_policy": mb_by_policy,
+                    "mean_ttl_seconds": ttl_total / databases if databases else 0.0,
+                    "ttl_distribution": ttl_distribution}
+
+        provisioned = sum(count for state, count in by_state.items() if state != "Deleted")
+        return {"resources": {"total": provisioned, "by_type": by_type, "by_state": dict(by_state)},
+                "app_service": app_service, "storage_account": storage_account, "cache_db": cache_db}
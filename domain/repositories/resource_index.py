@@ -0,0 +1,142 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from domain.value_objects import ResourceId
+from domain.entities.resource import Resource
+from domain.repositories.fleet_rollup import FleetRollup
+
+EQUALITY_FIELDS = ("resource_type", "state", "region", "runtime", "eviction_policy")
+RANGE_FIELDS = ("capacity_mb", "max_size_gb", "replica_count")
+
+Range = Tuple[Optional[int], Optional[int]]
+
+
+def _normalize(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def _range_key(entry: Tuple[int, ResourceId]) -> int:
+    return entry[0]
+
+
+class ResourceIndex:
+    """Secondary indexes over a resource collection.
+
+    Equality indexes map a field value to the ids holding it; range indexes keep
+    (value, id) pairs sorted by value for bisection. The index is attached to every
+    indexed resource as an observer so state changes are applied as they happen,
+    and passes every change on to its ``rollup`` of fleet aggregates.
+    """
+
+    records_state = True
+
+    def __init__(self):
+        self._equality: Dict[str, Dict[str, Set[ResourceId]]] = {field: {} for field in EQUALITY_FIELDS}
+        self._ranges: Dict[str, List[Tuple[int, ResourceId]]] = {field: [] for field in RANGE_FIELDS}
+        self._states: Dict[ResourceId, str] = {}
+        self._lock = threading.Lock()
+        self.rollup = FleetRollup()
+
+    def add(self, resource: Resource) -> None:
+        with self._lock:
+            self._add(resource)
+        resource.attach_observer(self)
+
+    def _add(self, resource: Resource) -> None:
+        config = resource.config
+        self._equality["resource_type"].setdefault(resource.get_resource_type(), set()).add(resource.id)
+        self._equality["state"].setdefault(resource.state, set()).add(resource.id)
+        self._states[resource.id] = resource.state
+        self.rollup.add(resource.get_resource_type(), resource.state, config)
+        for field in EQUALITY_FIELDS[2:]:
+            if field in config:
+                self._equality[field].setdefault(config[field], set()).add(resource.id)
+        for field in RANGE_FIELDS:
+            if field in config:
+                insort(self._ranges[field], (config[field], resource.id), key=_range_key)
+
+    def reindex(self, resource: Resource, previous_config: Dict) -> None:
+        """Move a resource whose configuration changed from its previous index entries"""
+        with self._lock:
+            for field in EQUALITY_FIELDS[2:]:
+                if field in previous_config:
+                    self._equality[field].get(previous_config[field], set()).discard(resource.id)
+            for field in RANGE_FIELDS:
+                if field in previous_config:
+                    entries = self._ranges[field]
+                    start = bisect_left(entries, previous_config[field], key=_range_key)
+                    end = bisect_right(entries, previous_config[field], key=_range_key)
+                    for position in range(start, end):
+                        if entries[position][1] == resource.id:
+                            del entries[position]
+                            break
+            config = resource.config
+            for field in EQUALITY_FIELDS[2:]:
+                if field in config:
+                    self._equality[field].setdefault(config[field], set()).add(resource.id)
+            for field in RANGE_FIELDS:
+                if field in config:
+                    insort(self._ranges[field], (config[field], resource.id), key=_range_key)
+            self.rollup.reconfigure(resource.get_resource_type(), self._states.get(resource.id, resource.state),
+                                    previous_config, config)
+
+    def update_state(self, resource: Resource) -> None:
+        with self._lock:
+            self._update_state(resource)
+
+    def _update_state(self, resource: Resource) -> None:
+        previous = self._states.get(resource.id)
+        current = resource.state
+        if previous == current:
+            return
+        states = self._equality["state"]
+        if previous is not None:
+            states[previous].discard(resource.id)
+            self.rollup.move(resource, previous, current)
+        states.setdefault(current, set()).add(resource.id)
+        self._states[resource.id] = current
+
+    def on_resource_started(self, resource: Resource, message: str) -> None:
+        self.update_state(resource)
+
+    def on_resource_stopped(self, resource: Resource, message: str) -> None:
+        self.update_state(resource)
+
+    def on_resource_deleted(self, resource: Resource, message: str) -> None:
+        self.update_state(resource)
+
+    def on_batch(self, events: List[Tuple[str, Resource, str]]) -> None:
+        with self._lock:
+            for _, resource, _ in events:
+                self._update_state(resource)
+
+    def _range_ids(self, field: str, bounds: Range) -> Set[ResourceId]:
+        entries = self._ranges[field]
+        low, high = bounds
+        start = 0 if low is None else bisect_left(entries, low, key=_range_key)
+        end = len(entries) if high is None else bisect_right(entries, high, key=_range_key)
+        return {resource_id for _, resource_id in entries[start:end]}
+
+    def match(self, **filters) -> Optional[Set[ResourceId]]:
+        """Ids matching every given filter, or None when no filter was given"""
+        candidates: List[Iterable[ResourceId]] = []
+        with self._lock:
+            for field, value in filters.items():
+                if value is None:
+                    continue
+                if field in self._equality:
+                    candidates.append(self._equality[field].get(_normalize(value), set()))
+                elif field in self._ranges:
+                    candidates.append(self._range_ids(field, value))
+                else:
+                    raise ValueError(f"Unknown query field: {field}")
+            if not candidates:
+                return None
+            candidates.sort(key=len)
+            result = set(candidates[0])
+            for ids in candidates[1:]:
+                result.intersection_update(ids)
+                if not result:
+                    break
+        return result
@@ -1,18 +1,36 @@
-from typing import Dict
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
 from domain.value_objects import ResourceId
 from domain.entities.resource import Resource
 from domain.exceptions import DuplicateResourceError, ResourceNotFoundException
+from domain.repositories.fleet_rollup import FleetRollup
+from domain.repositories.resource_index import ResourceIndex, Range
 
 class ResourceRepository:
     """Repository for managing resource persistence"""
     
     def __init__(self):
         self._resources: Dict[ResourceId, Resource] = {}
+        self._index = ResourceIndex()
+        self._lock = threading.RLock()
+        self._observers: Tuple = ()
     
     def add(self, resource: Resource) -> None:
-        if resource.id in self._resources:
-            raise DuplicateResourceError(f"Resource '{resource.id}' already exists")
+        with self._lock:
+            if resource.id in self._resources:
+                raise DuplicateResourceError(f"Resource '{resource.id}' already exists")
+            self._store(resource)
+    
+    def _store(self, resource: Resource) -> None:
         self._resources[resource.id] = resource
+        self._index.add(resource)
+        for observer in self._observers:
+            resource.attach_observer(observer)
+    
+    def update(self, resource: Resource, previous_config: Dict) -> None:
+        """Record a configuration change made to a stored resource"""
+        with self._lock:
+            self._index.reindex(resource, previous_config)
     
     def get(self, resource_id: ResourceId) -> Resource:
         resource = self._resources.get(resource_id)
@@ -21,4 +39,43 @@ class ResourceRepository:
         return resource
     
     def exists(self, resource_id: ResourceId) -> bool:
-        return resource_id in self._resources
\ No newline at end of file
+        return resource_id in self._resources
+    
+    def all(self) -> Iterator[Resource]:
+        return iter(list(self._resources.values()))
+    
+    def attach_observer(self, observer) -> None:
+        """Attach an observer to every stored resource and to each resource added later"""
+        with self._lock:
+            if any(attached is observer for attached in self._observers):
+                return
+            self._observers += (observer,)
+            for resource in self.all():
+                resource.attach_observer(observer)
+    
+    def query(self, resource_type: Optional[str] = None, state: Optional[str] = None, region=None, runtime=None,
+              eviction_policy=None, capacity_mb: Optional[Range] = None, max_size_gb: Optional[Range] = None,
+              replica_count: Optional[Range] = None) -> List[Resource]:
+        """Resources matching every given filter; range filters take (low, high) with None for an open end"""
+        ids = self._index.match(resource_type=resource_type, state=state, region=region, runtime=runtime,
+                                eviction_policy=eviction_policy, capacity_mb=capacity_mb,
+                                max_size_gb=max_size_gb, replica_count=replica_count)
+        if ids is None:
+            return list(self._resources.values())
+        return [self._resources[resource_id] for resource_id in ids]
+    
+    def count(self, **filters) -> int:
+        """Number of resources matching the same filters as query(), without materializing them"""
+        ids = self._index.match(**filters)
+        return len(self._resources) if ids is None else len(ids)
+    
+    def fleet_rollup(self) -> FleetRollup:
+        """Aggregates over every stored resource, maintained as resources are added and change"""
+        return self._index.rollup
+    
+    def close(self) -> None:
+        """Release what the store holds open; nothing for the in-memory store"""
+        pass
+    
+    def __len__(self) -> int:
+        return len(self._resources)
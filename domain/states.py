@@ -1,82 +1,97 @@
-from abc import ABC, abstractmethod
+from abc import ABC
+from typing import Dict, Optional, Tuple
+from domain.exceptions import InvalidStateTransitionError
 
 
 class ResourceState(ABC):
-    """Abstract base class for resource states"""
+    """Base class for resource states.
     
-    @abstractmethod
-    def start(self, resource: 'Resource') -> None:
-        pass
+    States are flyweights: each subclass has exactly one shared instance, and
+    every transition is looked up in the (state, action) table below, which is
+    the only place the lifecycle is defined.
+    """
     
-    @abstractmethod
-    def stop(self, resource: 'Resource') -> None:
-        pass
+    _name = ""
+    _instance = None
+    # Filled from the transition table below: action -> next state, or None when rejected
+    next_states: Dict[str, Optional['ResourceState']] = {}
     
-    @abstractmethod
-    def delete(self, resource: 'Resource') -> None:
-        pass
+    def __new__(cls):
+        if cls.__dict__.get('_instance') is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+    
+    def can(self, action: str) -> bool:
+        return self.next_states.get(action) is not None
+    
+    def reject(self, action: str) -> None:
+        raise InvalidStateTransitionError(_REJECTIONS[self, action])
     
-    @abstractmethod
     def get_state_name(self) -> str:
-        pass
+        return self._name
+    
+    def __repr__(self) -> str:
+        return f"<{self._name}State>"
 
 
 class CreatedState(ResourceState):
-    def start(self, resource: 'Resource') -> None:
-        resource.set_state(StartedState())
-        resource.notify_started()
-    
-    def stop(self, resource: 'Resource') -> None:
-        raise InvalidStateTransitionError("Cannot stop a resource that hasn't been started")
-    
-    def delete(self, resource: 'Resource') -> None:
-        resource.set_state(DeletedState())
-        resource.notify_deleted()
-    
-    def get_state_name(self) -> str:
-        return "Created"
+    _name = "Created"
 
 
 class StartedState(ResourceState):
-    def start(self, resource: 'Resource') -> None:
-        raise InvalidStateTransitionError("Resource is already started")
-    
-    def stop(self, resource: 'Resource') -> None:
-        resource.set_state(StoppedState())
-        resource.notify_stopped()
-    
-    def delete(self, resource: 'Resource') -> None:
-        raise InvalidStateTransitionError("Cannot delete: Resource must be stopped first")
-    
-    def get_state_name(self) -> str:
-        return "Started"
+    _name = "Started"
 
 
 class StoppedState(ResourceState):
-    def start(self, resource: 'Resource') -> None:
-        resource.set_state(StartedState())
-        resource.notify_started()
-    
-    def stop(self, resource: 'Resource') -> None:
-        raise InvalidStateTransitionError("Resource is already stopped")
-    
-    def delete(self, resource: 'Resource') -> None:
-        resource.set_state(DeletedState())
-        resource.notify_deleted()
-    
-    def get_state_name(self) -> str:
-        return "Stopped"
+    _name = "Stopped"
 
 
 class DeletedState(ResourceState):
-    def start(self, resource: 'Resource') -> None:
-        raise InvalidStateTransitionError("Cannot start a deleted resource")
-    
-    def stop(self, resource: 'Resource') -> None:
-        raise InvalidStateTransitionError("Cannot stop a deleted resource")
-    
-    def delete(self, resource: 'Resource') -> None:
-        raise InvalidStateTransitionError("Resource is already deleted")
-    
-    def get_state_name(self) -> str:
-        return "Deleted"
+    _name = "Deleted"
+
+
+CREATED = CreatedState()
+STARTED = StartedState()
+STOPPED = StoppedState()
+DELETED = DeletedState()
+
+# (state, action) -> next state; every pair not listed here is rejected
+_MATRIX: Dict[Tuple[ResourceState, str], ResourceState] = {
+    (CREATED, "start"): STARTED,
+    (CREATED, "delete"): DELETED,
+    (STARTED, "stop"): STOPPED,
+    (STOPPED, "start"): STARTED,
+    (STOPPED, "delete"): DELETED,
+}
+
+_REJECTIONS: Dict[Tuple[ResourceState, str], str] = {
+    (CREATED, "stop"): "Cannot stop a resource that hasn't been started",
+    (STARTED, "start"): "Resource is already started",
+    (STARTED, "delete"): "Cannot delete: Resource must be stopped first",
+    (STOPPED, "stop"): "Resource is already stopped",
+    (DELETED, "start"): "Cannot start a deleted resource",
+    (DELETED, "stop"): "Cannot stop a deleted resource",
+    (DELETED, "delete"): "Resource is already deleted",
+}
+
+for _state in (CREATED, STARTED, STOPPED, DELETED):
+    type(_state).next_states = {action: _MATRIX.get((_state, action)) for action in ("start", "stop", "delete")}
+
+STATES_BY_NAME: Dict[str, ResourceState] = {state.get_state_name(): state
+                                            for state in (CREATED, STARTED, STOPPED, DELETED)}
+
+# (state name, action) -> state name reached by a permitted transition
+TRANSITIONS: Dict[Tuple[str, str], str] = {(state.get_state_name(), action): next_state.get_state_name()
+                                           for (state, action), next_state in _MATRIX.items()}
+
+
+# Lifecycle event -> name of the state the resource entered when the event was emitted
+EVENT_STATES: Dict[str, str] = {'started': STARTED.get_state_name(), 'stopped': STOPPED.get_state_name(),
+                                'deleted': DELETED.get_state_name()}
+
+
+def state_from_name(name: str) -> ResourceState:
+    state = STATES_BY_NAME.get(name)
+    if not state:
+        raise ValueError(f"Unknown resource state: {name}")
+    return state
@@ -1,8 +1,11 @@
+import zlib
 from enum import Enum
 
 
 class ResourceId:
     """Value object for resource identification"""
+    __slots__ = ('_name',)
+    
     def __init__(self, name: str):
         if not name or not name.strip():
             raise ValueError("Resource name cannot be empty")
@@ -20,6 +23,10 @@ class ResourceId:
     def __hash__(self):
         return hash(self._name)
     
+    def stable_hash(self) -> int:
+        """Hash that, unlike hash(), is the same in every process and run"""
+        return zlib.crc32(self._name.encode('utf-8'))
+    
     def __str__(self):
         return self._name
 
@@ -40,3 +47,9 @@ class EvictionPolicy(Enum):
     LRU = "LRU"
     FIFO = "FIFO"
     LFU = "LFU"
+
+
+class LoadBalancingPolicy(Enum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_OUTSTANDING = "least_outstanding"
+    CONSISTENT_HASH = "consistent_hash"
@@ -1,12 +1,21 @@
+import json
+from typing import Optional
 from application.services.resource_management_service import ResourceManagementService
 from infrastructure.logging.logger import Logger
 from domain.value_objects import Runtime, Region, EvictionPolicy
 from domain.entities.resource import Resource
+from application.services.manifest_reconciler import ManifestReconciler
+from infrastructure.manifest.manifest_loader import load_manifest
+from infrastructure.metrics.registry import MetricsRegistry
 
 class CloudConnectCLI:
-    def __init__(self, service: ResourceManagementService, logger: Logger):
+    # Worker threads used to apply manifests; needs a thread-safe service when above 1
+    manifest_workers = 4
+    
+    def __init__(self, service: ResourceManagementService, logger: Logger, metrics: Optional[MetricsRegistry] = None):
         self._service = service
         self._logger = logger
+        self._metrics = metrics
     
     def run(self) -> None:
         print("\n" + "="*60)
@@ -29,6 +38,14 @@ class CloudConnectCLI:
                 elif choice == '5':
                     self._view_logs()
                 elif choice == '6':
+                    self._list_resources()
+                elif choice == '7':
+                    self._apply_manifest()
+                elif choice == '8':
+                    self._show_stats()
+                elif choice == '9':
+                    self._show_fleet_summary()
+                elif choice == '10':
                     print("\nExiting CloudConnect. Goodbye!")
                     break
                 else:
@@ -47,7 +64,11 @@ class CloudConnectCLI:
         print("3. Stop Resource")
         print("4. Delete Resource")
         print("5. View Logs")
-        print("6. Exit")
+        print("6. List Resources")
+        print("7. Apply Manifest")
+        print("8. Stats")
+        print("9. Fleet Summary")
+        print("10. Exit")
     
     def _create_resource(self) -> None:
         print("\n--- Create Resource ---")
@@ -196,4 +217,121 @@ class CloudConnectCLI:
             print("No logs available.")
         else:
             for log in logs:
-                print(log.strip())
\ No newline at end of file
+                print(log.strip())
+    
+    def _list_resources(self) -> None:
+        print("\n--- List Resources ---")
+        print("Press Enter to skip a filter.")
+        type_map = {'1': 'AppService', '2': 'StorageAccount', '3': 'CacheDB'}
+        state_map = {'1': 'Created', '2': 'Started', '3': 'Stopped', '4': 'Deleted'}
+        region_map = {'1': Region.EAST_US, '2': Region.WEST_EUROPE, '3': Region.CENTRAL_INDIA}
+        
+        resource_type = type_map.get(input("Type (1. AppService 2. StorageAccount 3. CacheDB): ").strip())
+        state = state_map.get(input("State (1. Created 2. Started 3. Stopped 4. Deleted): ").strip())
+        region = region_map.get(input("Region (1. EastUS 2. WestEurope 3. CentralIndia): ").strip())
+        
+        resources = self._service.list_resources(resource_type=resource_type, state=state, region=region)
+        if not resources:
+            print("No matching resources.")
+            return
+        for resource in resources:
+            details = ", ".join(f"{key}={value}" for key, value in resource.config.items() if key != 'access_key')
+            print(f"{resource.id.value:<30} {resource.get_resource_type():<15} {resource.state:<8} {details}")
+        print(f"\n{len(resources)} resource(s)")
+    
+    def _apply_manifest(self) -> None:
+        print("\n--- Apply Manifest ---")
+        path = input("Manifest file (.json/.yaml): ").strip()
+        prune = input("Delete resources missing from the manifest? (yes/no): ").strip().lower() == 'yes'
+        
+        reconciler = ManifestReconciler(self._service, workers=self.manifest_workers)
+        plan = reconciler.plan(load_manifest(path), prune=prune)
+        for line in plan.lines():
+            print(line)
+        if not any(not change.error for change in plan.changes):
+            print("Nothing to apply.")
+            return
+        if input("\nApply this plan? (yes/no): ").strip().lower() != 'yes':
+            print("Plan discarded.")
+            return
+        
+        results = reconciler.apply(plan)
+        failed = [result for result in results.values() if not result.ok]
+        for result in failed:
+            print(f"❌ {result.name}: {result.error}")
+        print(f"✅ Applied {len(results) - len(failed)} change(s), {len(failed)} failed")
+    
+    def _show_stats(self) -> None:
+        print("\n--- Stats ---")
+        if self._metrics is None:
+            print("Metrics are not enabled.")
+            return
+        snapshot = self._metrics.snapshot()
+        totals = {}
+        for counter in snapshot["counters"].get("operations_total", []):
+            labels = counter["labels"]
+            key = (labels["operation"], labels["resource_type"])
+            ok, failed = totals.get(key, (0, 0))
+            if labels["outcome"] == "ok":
+                totals[key] = (ok + counter["value"], failed)
+            else:
+                totals[key] = (ok, failed + counter["value"])
+        latencies = {(series["labels"]["operation"], series["labels"]["resource_type"]): series
+                     for series in snapshot["histograms"].get("operation_duration_seconds", [])}
+        if not totals:
+            print("No operations recorded yet.")
+        else:
+            print(f"{'operation':<10} {'type':<15} {'ok':>7} {'failed':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+            for (operation, resource_type), (ok, failed) in sorted(totals.items()):
+                series = latencies.get((operation, resource_type))
+                p50, p99, peak = ((series["p50_seconds"], series["p99_seconds"], series["max_seconds"])
+                                  if series else (0.0, 0.0, 0.0))
+                print(f"{operation:<10} {resource_type:<15} {ok:>7} {failed:>7} "
+                      f"{p50 * 1000:>9.3f} {p99 * 1000:>9.3f} {peak * 1000:>9.3f}")
+        errors = snapshot["counters"].get("operation_errors_total", [])
+        if errors:
+            print("\nErrors:")
+            for counter in errors:
+                labels = counter["labels"]
+                print(f"  {labels['error']:<32} {labels['operation']:<8} {labels['resource_type']:<15} "
+                      f"{counter['value']:>6}")
+        
+        path = input("\nWrite Prometheus metrics to file (Enter to skip, '-' for screen): ").strip()
+        if path:
+            self._metrics.write_prometheus(path)
+            if path != '-':
+                print(f"✅ Metrics written to {path}")
+    
+    def _show_fleet_summary(self) -> None:
+        print("\n--- Fleet Summary ---")
+        summary = self._service.fleet_summary()
+        resources = summary["resources"]
+        print(f"{resources['total']} provisioned resource(s)")
+        for resource_type, states in resources["by_type"].items():
+            counts = ", ".join(f"{state} {count}" for state, count in states.items())
+            print(f"  {resource_type:<15} {counts}")
+        
+        app_service = summary["app_service"]
+        print(f"\nAppService: {app_service['services']} service(s), {app_service['running']} running, "
+              f"{app_service['running_replicas']}/{app_service['replicas']} replica(s) running")
+        for region, group in app_service["by_region"].items():
+            print(f"  {region:<15} {group['services']:>6} service(s) {group['replicas']:>7} replica(s)")
+        for runtime, group in app_service["by_runtime"].items():
+            print(f"  {runtime:<15} {group['services']:>6} service(s) {group['replicas']:>7} replica(s)")
+        
+        storage = summary["storage_account"]
+        print(f"\nStorageAccount: {storage['accounts']} account(s), {storage['provisioned_gb']} GB provisioned, "
+              f"{storage['encryption_ratio']:.0%} encrypted")
+        
+        cache = summary["cache_db"]
+        print(f"\nCacheDB: {cache['databases']} database(s), {cache['provisioned_mb']} MB provisioned, "
+              f"mean TTL {cache['mean_ttl_seconds']:.0f}s")
+        for policy, megabytes in cache["mb_by_eviction_policy"].items():
+            print(f"  {policy:<15} {megabytes:>9} MB")
+        print("  TTL " + "  ".join(f"{bucket}: {count}" for bucket, count in cache["ttl_distribution"].items()))
+        
+        path = input("\nWrite the summary as JSON to file (Enter to skip): ").strip()
+        if path:
+            with open(path, 'w') as f:
+                json.dump(summary, f, indent=2)
+            print(f"✅ Fleet summary written to {path}")
@@ -0,0 +1,411 @@
+import argparse
+import json
+import sys
+from typing import Callable, Dict, IO, Iterable, List, Optional, Tuple
+
+# Builds (service, repository) around a logger; supplied by main.py so one-shot commands stay lazy
+ServiceBuilder = Callable[..., Tuple]
+
+RESOURCE_TYPES = ('AppService', 'StorageAccount', 'CacheDB')
+_TRANSITIONS = ('start', 'stop', 'delete')
+_GROUPED = ('create',) + _TRANSITIONS
+# Consecutive batch commands of the same kind run as one bulk operation of at most this many items
+_GROUP_SIZE = 1000
+_OUTPUT_CHUNK = 1000
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="CloudConnect resource manager. "
+                                     "Run without a command for the interactive menu.")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="record operation metrics and write them in Prometheus format to PATH ('-' for stdout)")
+    parser.add_argument("--data-dir", metavar="PATH",
+                        help="persist resources under PATH (default: $CLOUDCONNECT_DATA, else kept in memory)")
+    parser.add_argument("--shards", type=int, default=0, metavar="N",
+                        help="partition resources over N worker processes (stored under PATH/shards)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create", help="create a resource")
+    create.add_argument("resource_type", choices=RESOURCE_TYPES)
+    create.add_argument("name")
+    create.add_argument("config", nargs="*", metavar="KEY=VALUE",
+                        help="creation parameters, e.g. runtime=python region=EastUS replica_count=2")
+    for action in _TRANSITIONS:
+        transition = commands.add_parser(action, help=f"{action} one or more resources")
+        transition.add_argument("names", nargs="+")
+
+    logs = commands.add_parser("logs", help="show the latest log entries")
+    logs.add_argument("--limit", type=int, default=20)
+    logs.add_argument("--type", dest="resource_type", choices=RESOURCE_TYPES)
+    logs.add_argument("--name", dest="resource_name")
+    logs.add_argument("--follow", action="store_true", help="keep printing new entries until interrupted")
+
+    listing = commands.add_parser("list", help="list resources")
+    listing.add_argument("--type", dest="resource_type", choices=RESOURCE_TYPES)
+    listing.add_argument("--state", choices=("Created", "Started", "Stopped", "Deleted"))
+    listing.add_argument("--region")
+    listing.add_argument("--json", action="store_true", help="print one JSON object per resource")
+
+    commands.add_parser("fleet", help="print the fleet summary as JSON")
+
+    apply = commands.add_parser("apply", help="reconcile the resources with a JSON or YAML manifest")
+    apply.add_argument("manifest")
+    apply.add_argument("--workers", type=int, default=4, metavar="N", help="threads running the bulk operations")
+    apply.add_argument("--prune", action="store_true", help="delete resources missing from the manifest")
+    apply.add_argument("--dry-run", action="store_true", help="print the plan without applying it")
+
+    batch = commands.add_parser("batch", help="run JSON-lines commands from a file or stdin ('-')")
+    batch.add_argument("source", nargs="?", default="-")
+
+    serve = commands.add_parser("serve", help="serve the HTTP/JSON API until interrupted")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080, help="0 picks a free port")
+    serve.add_argument("--caller-rate", type=float, metavar="OPS",
+                       help="operations per second allowed to each caller (X-Caller header or client address)")
+    serve.add_argument("--caller-burst", type=float, metavar="N", help="burst allowed per caller (default: the rate)")
+    serve.add_argument("--type-rate", action="append", default=[], metavar="TYPE=OPS",
+                       help="operations per second allowed on a resource type; repeatable")
+    serve.add_argument("--max-in-flight", type=int, metavar="N", help="operations allowed to run at once")
+    serve.add_argument("--overload", choices=("reject", "queue"), default="reject",
+                       help="reject at once when over a limit, or queue fairly between callers")
+    serve.add_argument("--max-wait", type=float, default=5.0, metavar="SECONDS",
+                       help="longest time a queued operation waits before it is rejected")
+    return parser
+
+
+def run_command(argv: List[str], build_service: ServiceBuilder) -> int:
+    """Run one non-interactive command; returns the process exit code"""
+    args = build_parser().parse_args(argv)
+    from infrastructure.logging.logger import Logger
+    from infrastructure.logging.rotation import DEFAULT_ROTATION
+
+    if args.command == "logs":
+        return _show_logs(Logger(echo=False), args)
+
+    if args.command in ("apply", "batch", "serve"):
+        logger = Logger.buffered(echo=False, rotation=DEFAULT_ROTATION)
+    else:
+        logger = Logger(rotation=DEFAULT_ROTATION)
+    metrics = None
+    if args.metrics:
+        from infrastructure.metrics.registry import MetricsRegistry
+        metrics = MetricsRegistry()
+    event_bus = None
+    if args.command in ("apply", "batch", "serve"):
+        # Batch runs and the server log lifecycle events from a background thread instead of inside each transition
+        from application.observers.event_bus import EventBus
+        event_bus = EventBus()
+    admission = _admission_control(args) if args.command == "serve" else None
+    service, repository = build_service(logger, metrics, event_bus, args.shards, admission, args.data_dir)
+    try:
+        if args.command == "serve":
+            return _serve(service, logger, event_bus, args.host, args.port)
+        if args.command == "apply":
+            return _apply_manifest(service, args)
+        if args.command == "batch":
+            if args.source == "-":
+                return _run_batch(service, logger, sys.stdin, sys.stdout, event_bus)
+            with open(args.source, 'r') as source:
+                return _run_batch(service, logger, source, sys.stdout, event_bus)
+        return _run_one_shot(service, args)
+    finally:
+        if event_bus is not None:
+            event_bus.close()
+        repository.close()
+        logger.close()
+        if metrics is not None:
+            metrics.write_prometheus(args.metrics)
+
+
+def _admission_control(args):
+    """AdmissionController from the serve options, or None when no limit is set"""
+    from application.services.admission_control import AdmissionController, OverloadPolicy, RateLimit
+
+    per_type = {}
+    for item in args.type_rate:
+        resource_type, rate = _parse_assignment(item)
+        if resource_type not in RESOURCE_TYPES:
+            raise ValueError(f"Unknown resource type in --type-rate: {resource_type}")
+        per_type[resource_type] = RateLimit(float(rate), max(float(rate), 1.0))
+    per_caller = None
+    if args.caller_rate is not None:
+        per_caller = RateLimit(args.caller_rate, args.caller_burst or max(args.caller_rate, 1.0))
+    if per_caller is None and not per_type and args.max_in_flight is None:
+        return None
+    return AdmissionController(per_caller, per_type, args.max_in_flight, OverloadPolicy(args.overload),
+                               max_wait=args.max_wait)
+
+
+def _serve(service, logger, event_bus, host: str, port: int) -> int:
+    import signal
+    from infrastructure.http.api_server import ApiServer
+    from infrastructure.http.event_feed import EventFeed
+
+    def interrupt(signum, frame) -> None:
+        raise KeyboardInterrupt
+
+    feed = EventFeed()
+    event_bus.subscribe(feed)
+    server = ApiServer(service, logger, feed, event_bus, host, port)
+    signal.signal(signal.SIGTERM, interrupt)
+    print(f"Serving the CloudConnect API on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
+def _apply_manifest(service, args) -> int:
+    from application.services.manifest_reconciler import ManifestReconciler
+    from infrastructure.manifest.manifest_loader import load_manifest
+
+    reconciler = ManifestReconciler(service, workers=args.workers)
+    try:
+        plan = reconciler.plan(load_manifest(args.manifest), prune=args.prune)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    for line in plan.lines():
+        print(line)
+    if args.dry_run:
+        return 1 if plan.errors else 0
+    results = reconciler.apply(plan)
+    failed = [result for result in results.values() if not result.ok]
+    for result in failed:
+        print(f"❌ {result.name}: {result.error}", file=sys.stderr)
+    print(f"✅ Applied {len(results) - len(failed)} change(s), {len(failed)} failed")
+    return 1 if failed else 0
+
+
+def _show_logs(logger, args) -> int:
+    for entry in logger.query_logs(args.limit, args.resource_type, args.resource_name):
+        print(entry.line)
+    if args.follow:
+        try:
+            for entry in logger.follow_logs(args.resource_type, args.resource_name):
+                print(entry.line, flush=True)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def _run_one_shot(service, args) -> int:
+    from domain.exceptions import DomainException
+
+    try:
+        if args.command == "create":
+            from infrastructure.manifest.manifest_loader import check_config, decode_config
+            config = dict(_parse_assignment(item) for item in args.config)
+            check_config(args.resource_type, config)
+            service.create_resource(args.resource_type, args.name, **decode_config(config))
+            print(f"✅ {args.resource_type} '{args.name}' created successfully!")
+            return 0
+        if args.command == "fleet":
+            print(json.dumps(service.fleet_summary(), indent=2))
+            return 0
+        if args.command == "list":
+            resources = service.list_resources(resource_type=args.resource_type, state=args.state,
+                                               region=args.region)
+            for resource in resources:
+                if args.json:
+                    print(json.dumps(describe_resource(resource)))
+                else:
+                    details = ", ".join(f"{key}={value}" for key, value in resource.config.items()
+                                        if key != 'access_key')
+                    print(f"{resource.id.value:<30} {resource.get_resource_type():<15} {resource.state:<8} {details}")
+            return 0
+        results = getattr(service, f"{args.command}_many")(args.names)
+    except (ValueError, KeyError, DomainException) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    for result in results:
+        if not result.ok:
+            print(f"❌ {result.name}: {result.error}", file=sys.stderr)
+    return 0 if all(result.ok for result in results) else 1
+
+
+def _parse_assignment(item: str) -> Tuple[str, object]:
+    key, separator, text = item.partition("=")
+    if not separator:
+        raise ValueError(f"Expected KEY=VALUE, got '{item}'")
+    return key.strip(), _parse_value(text.strip())
+
+
+def _parse_value(text: str):
+    if text.lower() in ('true', 'yes'):
+        return True
+    if text.lower() in ('false', 'no'):
+        return False
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+def describe_resource(resource) -> Dict:
+    """JSON-ready view of a resource; secrets such as access keys are left out"""
+    return {
+        "name": resource.id.value,
+        "type": resource.get_resource_type(),
+        "state": resource.state,
+        "config": {key: value for key, value in resource.config.items() if key != 'access_key'},
+    }
+
+
+class BatchRunner:
+    """Executes batch commands in input order, running consecutive creates or transitions as bulk operations.
+
+    Each command yields exactly one result, passed to ``sink`` in input order:
+    ``{"line": 3, "op": "start", "name": "web", "ok": false, "error": "...", "error_type": "..."}``.
+    With ``idempotency_key`` every change is keyed by it and its line number, so
+    resubmitting the same batch under the same key replays the earlier outcomes.
+    """
+
+    def __init__(self, service, logger, sink: Callable[[Dict], None], event_bus=None,
+                 idempotency_key: Optional[str] = None):
+        self._service = service
+        self._idempotency_key = idempotency_key
+        self._logger = logger
+        self._event_bus = event_bus
+        self._sink = sink
+        self._group: List[Tuple[int, Dict]] = []
+        self._group_names = set()
+        self.failures = 0
+
+    def submit(self, line_number: int, text: str) -> None:
+        try:
+            command = json.loads(text)
+        except ValueError as e:
+            self._flush_group()
+            self._emit({"line": line_number, "op": None}, e)
+            return
+        self.submit_command(line_number, command)
+
+    def submit_command(self, line_number: int, command) -> None:
+        if not isinstance(command, dict) or not isinstance(command.get("op"), str):
+            self._flush_group()
+            self._emit({"line": line_number, "op": None}, ValueError("Expected a JSON object with an 'op' field"))
+            return
+        # A repeated name ends the group so it sees the outcome of the earlier command, as if run one by one
+        name = str(command.get("name"))
+        if self._group and (self._group[0][1]["op"] != command["op"] or len(self._group) >= _GROUP_SIZE
+                            or name in self._group_names):
+            self._flush_group()
+        if command["op"] in _GROUPED:
+            self._group.append((line_number, command))
+            self._group_names.add(name)
+        else:
+            self._flush_group()
+            self._run_single(line_number, command)
+
+    def finish(self) -> None:
+        self._flush_group()
+
+    def _flush_group(self) -> None:
+        group, self._group = self._group, []
+        self._group_names = set()
+        if not group:
+            return
+        from infrastructure.manifest.manifest_loader import check_config, decode_config, require_field
+
+        op = group[0][1]["op"]
+        runnable = []
+        for line_number, command in group:
+            # An ill-typed command fails its own line only
+            try:
+                name = require_field(command, "name", str)
+                if op == "create":
+                    resource_type = require_field(command, "type", str)
+                    config = command.get("config") or {}
+                    check_config(resource_type, config)
+                    runnable.append((line_number, command, (resource_type, name, decode_config(config))))
+                else:
+                    runnable.append((line_number, command, name))
+            except ValueError as e:
+                runnable.append((line_number, command, e))
+        valid = [item for _, _, item in runnable if not isinstance(item, Exception)]
+        operation = self._service.create_many if op == "create" else getattr(self._service, f"{op}_many")
+        outcomes = iter(operation(valid, idempotency_key=self._key_for(group[0][0]))) if valid else iter(())
+        for line_number, command, item in runnable:
+            result = {"line": line_number, "op": op, "name": command.get("name")}
+            if isinstance(item, Exception):
+                self._emit(result, item)
+            else:
+                outcome = next(outcomes)
+                self._emit(result, outcome.error)
+
+    def _run_single(self, line_number: int, command: Dict) -> None:
+        from domain.exceptions import DomainException
+        from infrastructure.manifest.manifest_loader import require_field
+
+        op = command["op"]
+        result = {"line": line_number, "op": op}
+        try:
+            if op == "list":
+                filters = {key: require_field(command, key, str, required=False)
+                           for key in ("resource_type", "state", "region")}
+                result["resources"] = [describe_resource(resource)
+                                       for resource in self._service.list_resources(**filters)]
+            elif op == "logs":
+                if self._event_bus is not None:
+                    self._event_bus.flush()
+                limit = require_field(command, "limit", int, required=False)
+                entries = self._logger.query_logs(20 if limit is None else limit,
+                                                  require_field(command, "resource_type", str, required=False),
+                                                  require_field(command, "resource_name", str, required=False))
+                result["entries"] = [entry.line for entry in entries]
+            elif op == "scale":
+                result["name"] = command.get("name")
+                self._service.scale_resource(require_field(command, "name", str),
+                                             require_field(command, "replica_count", int),
+                                             idempotency_key=self._key_for(line_number))
+            else:
+                raise ValueError(f"Unknown op: {op}")
+        except (ValueError, DomainException) as e:
+            self._emit(result, e)
+            return
+        self._emit(result, None)
+
+    def _key_for(self, line_number: int) -> Optional[str]:
+        return None if self._idempotency_key is None else f"{self._idempotency_key}:{line_number}"
+
+    def _emit(self, result: Dict, error: Optional[Exception]) -> None:
+        result["ok"] = error is None
+        if error is not None:
+            result["error"] = str(error)
+            result["error_type"] = type(error).__name__
+            self.failures += 1
+        self._sink(result)
+
+
+class _JsonLinesWriter:
+    """Batch result sink writing one JSON line per result in chunks"""
+
+    def __init__(self, output: IO):
+        self._output = output
+        self._buffer: List[str] = []
+
+    def __call__(self, result: Dict) -> None:
+        self._buffer.append(json.dumps(result))
+        if len(self._buffer) >= _OUTPUT_CHUNK:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._output.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+        self._output.flush()
+
+
+def _run_batch(service, logger, lines: Iterable[str], output: IO, event_bus=None) -> int:
+    writer = _JsonLinesWriter(output)
+    runner = BatchRunner(service, logger, writer, event_bus)
+    for line_number, text in enumerate(lines, 1):
+        if text.strip():
+            runner.submit(line_number, text)
+    runner.finish()
+    writer.flush()
+    return 1 if runner.failures else 0
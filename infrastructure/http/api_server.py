@@ -0,0 +1,287 @@
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from domain.exceptions import (
+    DomainException,
+    DuplicateResourceError,
+    IdempotencyKeyReusedError,
+    InvalidStateTransitionError,
+    ResourceNotFoundException,
+    ResourceNotRunningError,
+    ThrottledError,
+)
+from application.services.admission_control import acting_as
+from infrastructure.cli.command_line import BatchRunner, describe_resource
+from infrastructure.http.event_feed import EventFeed
+from infrastructure.manifest.manifest_loader import check_config, decode_config, require_field
+
+_TRANSITIONS = ('start', 'stop', 'delete')
+_STATUS_BY_ERROR = (
+    (ThrottledError, 429),
+    (ResourceNotFoundException, 404),
+    (DuplicateResourceError, 409),
+    (IdempotencyKeyReusedError, 409),
+    (InvalidStateTransitionError, 409),
+    (ResourceNotRunningError, 409),
+    (DomainException, 422),
+    (ValueError, 400),
+)
+# Streaming clients get a comment line this often so idle connections are kept open by proxies
+_HEARTBEAT_SECONDS = 15.0
+
+
+class HttpError(Exception):
+    """Request-level failure answered with ``status``"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    """Maps requests to service calls; HTTP/1.1, so connections are kept alive between requests"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: '_Server'
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_PATCH(self) -> None:
+        self._dispatch("PATCH")
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        api = self.server.api
+        headers = None
+        try:
+            body = self._read_body()
+            if parts == ["events", "stream"] and method == "GET":
+                self._stream_events(query)
+                return
+            # Admission control limits each caller: the X-Caller header (a tenant or client id) or the client address
+            with acting_as(self.headers.get("X-Caller") or self.client_address[0]):
+                status, payload = api.route(method, parts, query, body, self.headers.get("Idempotency-Key"))
+        except HttpError as e:
+            status, payload = e.status, _error_payload(e)
+        except Exception as e:
+            status, payload = _status_of(e), _error_payload(e)
+            if isinstance(e, ThrottledError) and e.retry_after:
+                headers = {"Retry-After": str(math.ceil(e.retry_after))}
+        self._send_json(status, payload, headers)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError as e:
+            raise HttpError(400, f"Request body is not valid JSON: {e}")
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream_events(self, query: Dict[str, str]) -> None:
+        """Server-sent events: one ``event:``/``data:`` record per lifecycle event until the client goes away"""
+        feed = self.server.api.feed
+        last = self.headers.get("Last-Event-ID") or query.get("after")
+        after = int(last) if last is not None else feed.last
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while not self.server.stopping:
+                events, missed = feed.wait(after, _HEARTBEAT_SECONDS)
+                if missed:
+                    self.wfile.write(f"event: missed\ndata: {missed}\n\n".encode('utf-8'))
+                if not events:
+                    self.wfile.write(b": keep-alive\n\n")
+                chunks = [f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event)}\n\n"
+                          for event in events]
+                if chunks:
+                    self.wfile.write("".join(chunks).encode('utf-8'))
+                    after = events[-1]["id"]
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    api: 'ApiServer'
+    stopping = False
+
+
+class ApiServer:
+    """HTTP/JSON front-end of the resource service, meant for localhost.
+
+    ========  ===========================  ============================================
+    GET       /health                      liveness
+    GET       /stats                       idempotency cache and admission control statistics
+    GET       /fleet                       fleet summary: counts by type and state, provisioned capacity
+    GET       /resources                   list; filters ``type``, ``state``, ``region``
+    POST      /resources                   create from ``{"type", "name", "config"}``
+    GET       /resources/{name}            one resource
+    POST      /resources/{name}/{action}   ``start``, ``stop``, ``delete`` or ``scale``
+    DELETE    /resources/{name}            delete
+    GET       /logs                        latest entries; ``limit``, ``type``, ``name``
+    POST      /batch                       array of batch commands, as for ``main.py batch``
+    GET       /events                      long-poll; ``after`` (event id) and ``timeout``
+    GET       /events/stream               server-sent events; resumes from ``Last-Event-ID``
+    ========  ===========================  ============================================
+
+    Changes carrying an ``Idempotency-Key`` header run at most once per key: a retry gets the outcome of the
+    first request, and the key of a /batch request covers each of its commands.
+    Requests are attributed to the caller named by an ``X-Caller`` header, or else to the client address, and
+    throttled requests answer 429 with a ``Retry-After`` header.
+    Errors answer ``{"ok": false, "error", "error_type"}`` with a 4xx status, or 500 for unexpected failures.
+    """
+
+    def __init__(self, service, logger, feed: Optional[EventFeed] = None, event_bus=None,
+                 host: str = "127.0.0.1", port: int = 8080, max_poll_seconds: float = 30.0):
+        self._service = service
+        self._logger = logger
+        self._event_bus = event_bus
+        self._max_poll_seconds = max_poll_seconds
+        self.feed = feed or EventFeed()
+        self._server = _Server((host, port), _ApiHandler)
+        self._server.api = self
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    @property
+    def url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def start(self) -> threading.Thread:
+        """Serve from a background thread"""
+        thread = threading.Thread(target=self.serve_forever, name="api-server", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self) -> None:
+        self._server.stopping = True
+        self.feed.close()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def route(self, method: str, parts: List[str], query: Dict[str, str], body,
+              idempotency_key: Optional[str] = None) -> Tuple[int, Dict]:
+        service = self._service
+        if parts == ["health"] and method == "GET":
+            return 200, {"ok": True}
+        if parts == ["stats"] and method == "GET":
+            admission = service.admission.stats() if service.admission is not None else None
+            return 200, {"ok": True, "idempotency": service.idempotency.stats(), "admission": admission}
+        if parts == ["fleet"] and method == "GET":
+            return 200, {"ok": True, "fleet": service.fleet_summary()}
+        if parts == ["resources"]:
+            if method == "GET":
+                resources = service.list_resources(resource_type=query.get("type"), state=query.get("state"),
+                                                   region=query.get("region"))
+                return 200, {"ok": True, "resources": [describe_resource(resource) for resource in resources]}
+            if method == "POST":
+                body = _object(body)
+                resource_type = require_field(body, "type", str)
+                config = body.get("config") or {}
+                check_config(resource_type, config)
+                resource = service.create_resource(resource_type, require_field(body, "name", str),
+                                                   idempotency_key=idempotency_key, **decode_config(config))
+                return 201, {"ok": True, "resource": describe_resource(resource)}
+        elif len(parts) == 2 and parts[0] == "resources":
+            if method == "GET":
+                return 200, {"ok": True, "resource": describe_resource(service.get_resource(parts[1]))}
+            if method == "DELETE":
+                return self._transition("delete", parts[1], idempotency_key)
+        elif len(parts) == 3 and parts[0] == "resources" and method == "POST":
+            name, action = parts[1], parts[2]
+            if action in _TRANSITIONS:
+                return self._transition(action, name, idempotency_key)
+            if action == "scale":
+                service.scale_resource(name, require_field(_object(body), "replica_count", int), idempotency_key)
+                return 200, {"ok": True, "resource": describe_resource(service.get_resource(name))}
+        elif parts == ["logs"] and method == "GET":
+            if self._event_bus is not None:
+                self._event_bus.flush()
+            entries = self._logger.query_logs(int(query.get("limit", 20)), query.get("type"), query.get("name"))
+            return 200, {"ok": True, "entries": [entry.line for entry in entries]}
+        elif parts == ["batch"] and method == "POST":
+            return self._batch(body, idempotency_key)
+        elif parts == ["events"] and method == "GET":
+            after = int(query.get("after", self.feed.last))
+            timeout = min(float(query.get("timeout", self._max_poll_seconds)), self._max_poll_seconds)
+            events, missed = self.feed.wait(after, timeout)
+            return 200, {"ok": True, "events": events, "missed": missed,
+                         "last": events[-1]["id"] if events else after}
+        else:
+            raise HttpError(404, f"No route for {method} /{'/'.join(parts)}")
+        raise HttpError(405, f"{method} is not supported on /{'/'.join(parts)}")
+
+    def _transition(self, action: str, name: str, idempotency_key: Optional[str]) -> Tuple[int, Dict]:
+        getattr(self._service, f"{action}_resource")(name, idempotency_key)
+        return 200, {"ok": True, "resource": describe_resource(self._service.get_resource(name))}
+
+    def _batch(self, body, idempotency_key: Optional[str]) -> Tuple[int, Dict]:
+        if not isinstance(body, list):
+            raise HttpError(400, "Expected a JSON array of commands")
+        results = []
+        runner = BatchRunner(self._service, self._logger, results.append, self._event_bus, idempotency_key)
+        # Each command is checked as it is run, so a malformed one fails its own item; a batch runs its commands in
+        # order on this thread and batches of other requests interleave with it as single requests do
+        for line_number, command in enumerate(body, 1):
+            runner.submit_command(line_number, command)
+        runner.finish()
+        return 200, {"ok": runner.failures == 0, "failures": runner.failures, "results": results}
+
+
+def _object(body) -> Dict:
+    if not isinstance(body, dict):
+        raise HttpError(400, "Expected a JSON object body")
+    return body
+
+
+def _status_of(error: Exception) -> int:
+    for error_type, status in _STATUS_BY_ERROR:
+        if isinstance(error, error_type):
+            return status
+    return 500
+
+
+def _error_payload(error: Exception) -> Dict:
+    return {"ok": False, "error": str(error), "error_type": type(error).__name__}
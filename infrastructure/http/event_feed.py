@@ -0,0 +1,64 @@
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+from application.observers.resource_observer import ResourceObserver
+from domain.entities.resource import Resource
+from domain.states import EVENT_STATES
+
+
+class EventFeed(ResourceObserver):
+    """Keeps the latest lifecycle events under increasing sequence numbers for polling and streaming clients.
+
+    Only the newest ``capacity`` events are retained; a client that falls
+    further behind is told how many it missed.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self._events: deque = deque(maxlen=max(capacity, 1))
+        self._last = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+    @property
+    def last(self) -> int:
+        return self._last
+
+    def on_resource_started(self, resource: Resource, message: str) -> None:
+        self.on_batch([('started', resource, message)])
+
+    def on_resource_stopped(self, resource: Resource, message: str) -> None:
+        self.on_batch([('stopped', resource, message)])
+
+    def on_resource_deleted(self, resource: Resource, message: str) -> None:
+        self.on_batch([('deleted', resource, message)])
+
+    def on_batch(self, events: List) -> None:
+        time = datetime.now().isoformat()
+        with self._condition:
+            for event, resource, message in events:
+                self._last += 1
+                self._events.append({"id": self._last, "event": event, "name": resource.id.value,
+                                     "type": resource.get_resource_type(), "state": EVENT_STATES[event],
+                                     "message": message, "time": time})
+            self._condition.notify_all()
+
+    def wait(self, after: int, timeout: Optional[float], limit: int = 1000) -> Tuple[List[Dict], int]:
+        """Events numbered above ``after`` and how many of those were already discarded.
+
+        Waits up to ``timeout`` seconds (None: forever) for the first one.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._last > after or self._closed, timeout)
+            if not self._events or self._last <= after:
+                return [], 0
+            first = self._events[0]["id"]
+            missed = max(first - after - 1, 0)
+            return list(islice(self._events, max(after + 1 - first, 0), None))[:limit], missed
+
+    def close(self) -> None:
+        """Release every waiting client"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
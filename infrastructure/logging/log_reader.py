@@ -0,0 +1,250 @@
+import heapq
+import os
+import re
+import time
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Optional
+from infrastructure.logging.segments import (
+    INDEX_SUFFIX,
+    RAW_SUFFIX,
+    SEGMENT_SUFFIX,
+    SEQUENCED_FILE,
+    SegmentIndex,
+    list_sequenced,
+    read_blocks_reversed,
+    sequenced_path,
+)
+
+# Stored in the log files so that entries sort and filter by time
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+# Shown by the interactive CLI, as before the files carried full timestamps
+DISPLAY_TIMESTAMP_FORMAT = "%I:%M %p"
+_ENTRY_PATTERN = re.compile(r"^\[([^\]]*)\] (?:\[([^\]]*)\] )?(.*)$")
+
+
+class LogEntry(NamedTuple):
+    timestamp: datetime
+    resource_type: str
+    resource_name: Optional[str]
+    message: str
+    line: str
+
+    @property
+    def display(self) -> str:
+        """The entry in the interactive CLI format, e.g. '[10:32 AM] AppService started ...'"""
+        if self.timestamp == datetime.min:
+            return self.line  # legacy entries are stored in that format
+        return f"[{self.timestamp.strftime(DISPLAY_TIMESTAMP_FORMAT)}] {self.message}"
+
+
+def parse_entry(resource_type: str, line: str) -> Optional[LogEntry]:
+    line = line.rstrip('\n')
+    match = _ENTRY_PATTERN.match(line)
+    if not match:
+        return None
+    raw_timestamp, resource_name, message = match.groups()
+    try:
+        # Same result as strptime with TIMESTAMP_FORMAT, several times faster
+        timestamp = datetime.fromisoformat(raw_timestamp)
+    except ValueError:
+        try:
+            datetime.strptime(raw_timestamp, DISPLAY_TIMESTAMP_FORMAT)
+        except ValueError:
+            return None
+        # Legacy entries carry no date; order them before everything else
+        timestamp = datetime.min
+    return LogEntry(timestamp, resource_type, resource_name, message, line)
+
+
+def read_lines_reversed(filepath: str, block_size: int = 64 * 1024) -> Iterator[str]:
+    """Yield the lines of a file from last to first, reading fixed-size blocks from the end"""
+    with open(filepath, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b''
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + remainder
+            lines = block.split(b'\n')
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line.decode('utf-8', errors='replace')
+        if remainder:
+            yield remainder.decode('utf-8', errors='replace')
+
+
+class LogReader:
+    """Reads the per-type log files newest-first and merges them by timestamp"""
+
+    def __init__(self, log_directory: str = "logs", block_size: int = 64 * 1024):
+        self._log_directory = log_directory
+        self._block_size = block_size
+
+    def _log_files(self, resource_type: Optional[str] = None) -> List[str]:
+        if not os.path.exists(self._log_directory):
+            return []
+        if resource_type is not None:
+            filename = f"{resource_type.lower()}.log"
+            return [filename] if os.path.exists(os.path.join(self._log_directory, filename)) else []
+        return sorted(f for f in os.listdir(self._log_directory) if f.endswith('.log'))
+
+    def _resource_types(self, resource_type: Optional[str] = None) -> List[str]:
+        """Types with an active file, rotated files or segments"""
+        if not os.path.exists(self._log_directory):
+            return []
+        types = set()
+        for filename in os.listdir(self._log_directory):
+            if filename.endswith('.log'):
+                types.add(filename[:-len('.log')])
+            else:
+                match = SEQUENCED_FILE.match(filename)
+                if match:
+                    types.add(match["type"])
+        if resource_type is not None:
+            return [resource_type.lower()] if resource_type.lower() in types else []
+        return sorted(types)
+
+    def _lines_reversed(self, resource_type: str, resource_name: Optional[str], since: Optional[datetime],
+                        until: Optional[datetime]) -> Iterator[str]:
+        """Lines of the active file, then of rotated files and segments from newest to oldest.
+
+        Segments whose index rules out the time window or resource name are
+        skipped without being opened, and only matching blocks are decompressed.
+        """
+        # Listed before the active file is opened, so a rotation in between cannot yield lines twice
+        rotated = sorted({sequence for suffix in (RAW_SUFFIX, INDEX_SUFFIX)
+                          for _, sequence, _ in list_sequenced(self._log_directory, suffix, resource_type)},
+                         reverse=True)
+        try:
+            yield from self._plain_lines_reversed(os.path.join(self._log_directory, f"{resource_type}.log"),
+                                                  resource_type, until)
+        except FileNotFoundError:
+            pass
+        for sequence in rotated:
+            index_path = sequenced_path(self._log_directory, resource_type, sequence, INDEX_SUFFIX)
+            if not os.path.exists(index_path):
+                try:
+                    yield from self._plain_lines_reversed(
+                        sequenced_path(self._log_directory, resource_type, sequence, RAW_SUFFIX), resource_type, until)
+                    continue
+                except FileNotFoundError:
+                    pass  # compressed meanwhile
+            try:
+                index = SegmentIndex.load(index_path)
+                if since is not None and index.end < since:
+                    return
+                if not index.overlaps(since, until) or not index.may_contain(resource_name):
+                    continue
+                segment_path = sequenced_path(self._log_directory, resource_type, sequence, SEGMENT_SUFFIX)
+                for lines in read_blocks_reversed(segment_path, index, since, until):
+                    yield from reversed(lines)
+            except FileNotFoundError:
+                continue  # pruned meanwhile
+
+    def _plain_lines_reversed(self, path: str, resource_type: str, until: Optional[datetime]) -> Iterator[str]:
+        if until is not None:
+            with open(path, 'r', errors='replace') as f:
+                first = parse_entry(resource_type, f.readline())
+            if first is not None and first.timestamp > until:
+                return  # the whole file is newer than the window
+        yield from read_lines_reversed(path, self._block_size)
+
+    def _entries_reversed(self, resource_type: str, resource_name: Optional[str],
+                          since: Optional[datetime], until: Optional[datetime]) -> Iterator[LogEntry]:
+        # Cheap text test before parsing; the parsed name is still compared below
+        marker = None if resource_name is None else f"[{resource_name}]"
+        for line in self._lines_reversed(resource_type, resource_name, since, until):
+            if not line or (marker is not None and marker not in line):
+                continue
+            entry = parse_entry(resource_type, line)
+            if entry is None:
+                continue
+            if since is not None and entry.timestamp < since:
+                return
+            if until is not None and entry.timestamp > until:
+                continue
+            if resource_name is not None and entry.resource_name != resource_name:
+                continue
+            yield entry
+
+    def tail(self, limit: int = 20, resource_type: Optional[str] = None, resource_name: Optional[str] = None,
+             since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[LogEntry]:
+        """Return the newest ``limit`` matching entries in chronological order"""
+        if limit <= 0:
+            return []
+        streams = [self._entries_reversed(name, resource_name, since, until)
+                   for name in self._resource_types(resource_type)]
+        merged = heapq.merge(*streams, key=lambda entry: entry.timestamp, reverse=True)
+        entries = []
+        for entry in merged:
+            entries.append(entry)
+            if len(entries) >= limit:
+                break
+        entries.reverse()
+        return entries
+
+    def follow(self, resource_type: Optional[str] = None, resource_name: Optional[str] = None,
+               poll_interval: float = 0.5, stop: Optional[Callable[[], bool]] = None) -> Iterator[LogEntry]:
+        """Yield entries appended after the call, polling the log directory until ``stop()`` is true.
+
+        Each active file stays open between polls. When a rotation replaces it,
+        the old handle is drained to EOF before the new file is read from the
+        start, so lines written just before the rotation are not lost.
+        """
+        handles: Dict[str, BinaryIO] = {}
+        pending: Dict[str, bytes] = {}
+        try:
+            for filename in self._log_files(resource_type):
+                try:
+                    handles[filename] = open(os.path.join(self._log_directory, filename), 'rb')
+                except FileNotFoundError:
+                    continue  # rotated away; its successor is read from the start
+                handles[filename].seek(0, os.SEEK_END)
+            while stop is None or not stop():
+                appended = []
+                for filename in set(self._log_files(resource_type)) | set(handles):
+                    resource = filename[:-len('.log')]
+                    for line in self._read_appended(filename, handles, pending):
+                        entry = parse_entry(resource, line)
+                        if entry is not None and (resource_name is None or entry.resource_name == resource_name):
+                            appended.append(entry)
+                if appended:
+                    appended.sort(key=lambda entry: entry.timestamp)
+                    yield from appended
+                else:
+                    time.sleep(poll_interval)
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+    def _read_appended(self, filename: str, handles: Dict[str, BinaryIO], pending: Dict[str, bytes]) -> List[str]:
+        """Complete lines appended to an active file since the last poll, following it across rotations"""
+        filepath = os.path.join(self._log_directory, filename)
+        data = pending.pop(filename, b'')
+        handle = handles.get(filename)
+        if handle is not None:
+            try:
+                replaced = os.stat(filepath).st_ino != os.fstat(handle.fileno()).st_ino
+            except FileNotFoundError:
+                replaced = True
+            # Checked before the drain: once the path moved on, nothing more is written to the old file
+            data += handle.read()
+            if replaced:
+                handle.close()
+                del handles[filename]
+                handle = None
+        if handle is None:
+            try:
+                handles[filename] = open(filepath, 'rb')
+            except FileNotFoundError:
+                pass  # not recreated yet; read from the start on a later poll
+            else:
+                if data and not data.endswith(b'\n'):
+                    data += b'\n'  # the old file ended mid-line
+                data += handles[filename].read()
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            pending[filename] = data[complete:]
+        return data[:complete].decode('utf-8', errors='replace').splitlines()
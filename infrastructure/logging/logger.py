@@ -1,36 +1,91 @@
 import os
+import threading
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Optional, Tuple
+from infrastructure.logging.writers import LogWriter, DirectLogWriter, BufferedLogWriter
+from infrastructure.logging.log_reader import LogReader, LogEntry, DISPLAY_TIMESTAMP_FORMAT, TIMESTAMP_FORMAT
+from infrastructure.logging.rotation import RotationPolicy
 
 
 class Logger:
-    def __init__(self, log_directory: str = "logs"):
+    """Timestamps entries and hands them to the writer in timestamp order.
+
+    Stamping and handing over happen under one lock, and a clock that steps
+    back is clamped to the last stamp, so every file is in non-decreasing
+    timestamp order as LogReader's merge expects.
+    """
+
+    def __init__(self, log_directory: str = "logs", writer: Optional[LogWriter] = None, echo: bool = True,
+                 rotation: Optional[RotationPolicy] = None):
         self._log_directory = log_directory
         self._ensure_log_directory()
+        self._writer = writer or DirectLogWriter(log_directory, rotation)
+        self._reader = LogReader(log_directory)
+        self._echo = echo
+        self._order_lock = threading.Lock()
+        self._last_timestamp = datetime.min
+    
+    @classmethod
+    def buffered(cls, log_directory: str = "logs", echo: bool = True, **writer_options) -> 'Logger':
+        """Logger whose file writes are batched by a background BufferedLogWriter"""
+        os.makedirs(log_directory, exist_ok=True)
+        return cls(log_directory, BufferedLogWriter(log_directory, **writer_options), echo)
     
     def _ensure_log_directory(self) -> None:
         if not os.path.exists(self._log_directory):
             os.makedirs(self._log_directory)
     
-    def log(self, resource_type: str, message: str) -> None:
-        timestamp = datetime.now().strftime("%I:%M %p")
-        log_entry = f"[{timestamp}] {message}"
+    def _now(self) -> datetime:
+        # Called under _order_lock
+        self._last_timestamp = max(datetime.now(), self._last_timestamp)
+        return self._last_timestamp
+    
+    def log(self, resource_type: str, message: str, resource_name: Optional[str] = None) -> None:
+        with self._order_lock:
+            now = self._now()
+            self._writer.write(resource_type, self._format(now.strftime(TIMESTAMP_FORMAT), message, resource_name))
         
-        print(log_entry)
+        if self._echo:
+            print(f"[{now.strftime(DISPLAY_TIMESTAMP_FORMAT)}] {message}")
+    
+    def log_many(self, entries: List[Tuple[str, str, Optional[str]]]) -> None:
+        """Log (resource_type, message, resource_name) entries with a single echo and write pass"""
+        with self._order_lock:
+            now = self._now()
+            timestamp = now.strftime(TIMESTAMP_FORMAT)
+            self._writer.write_many([(resource_type, self._format(timestamp, message, resource_name))
+                                     for resource_type, message, resource_name in entries])
         
-        log_file = os.path.join(self._log_directory, f"{resource_type.lower()}.log")
-        with open(log_file, 'a') as f:
-            f.write(log_entry + '\n')
+        if self._echo and entries:
+            displayed = now.strftime(DISPLAY_TIMESTAMP_FORMAT)
+            print("\n".join(f"[{displayed}] {message}" for _, message, _ in entries))
+    
+    @staticmethod
+    def _format(timestamp: str, message: str, resource_name: Optional[str]) -> str:
+        if resource_name:
+            return f"[{timestamp}] [{resource_name}] {message}"
+        return f"[{timestamp}] {message}"
+    
+    def flush(self) -> None:
+        self._writer.flush()
+    
+    def rotate(self) -> None:
+        """Rotate the active log files now when a rotation policy is configured"""
+        self._writer.rotate()
+    
+    def close(self) -> None:
+        self._writer.close()
     
     def get_logs(self, limit: int = 20) -> List[str]:
-        logs = []
-        if not os.path.exists(self._log_directory):
-            return logs
-        
-        for filename in os.listdir(self._log_directory):
-            if filename.endswith('.log'):
-                filepath = os.path.join(self._log_directory, filename)
-                with open(filepath, 'r') as f:
-                    logs.extend(f.readlines())
-        
-        return logs[-limit:] if logs else []
\ No newline at end of file
+        """Latest entries as the interactive CLI shows them; ``query_logs`` returns the stored lines"""
+        return [entry.display for entry in self.query_logs(limit)]
+    
+    def query_logs(self, limit: int = 20, resource_type: Optional[str] = None, resource_name: Optional[str] = None,
+                   since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[LogEntry]:
+        self._writer.flush()
+        return self._reader.tail(limit, resource_type, resource_name, since, until)
+    
+    def follow_logs(self, resource_type: Optional[str] = None, resource_name: Optional[str] = None,
+                    **options) -> Iterator[LogEntry]:
+        self._writer.flush()
+        return self._reader.follow(resource_type, resource_name, **options)
@@ -0,0 +1,239 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+from infrastructure.logging.log_reader import parse_entry
+from infrastructure.logging.segments import (
+    INDEX_SUFFIX,
+    RAW_SUFFIX,
+    SEGMENT_SUFFIX,
+    SegmentIndex,
+    list_sequenced,
+    sequenced_path,
+    write_segment,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RotationPolicy:
+    """When active log files are rotated and how long their compressed segments are kept.
+
+    A file is rotated once it reaches ``max_bytes`` or its first entry is
+    ``max_age`` seconds old (checked on write). Retention applies per resource
+    type: only the newest ``retain_segments`` segments, those ending within
+    ``retain_age`` seconds and, newest first, those fitting in ``retain_bytes``
+    of compressed data are kept.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = 16 * 1024 * 1024, max_age: Optional[float] = None,
+                 retain_segments: Optional[int] = None, retain_age: Optional[float] = None,
+                 retain_bytes: Optional[int] = None, block_bytes: int = 64 * 1024, compression_level: int = 6):
+        if max_bytes is None and max_age is None:
+            raise ValueError("Rotation needs max_bytes or max_age")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        if max_age is not None and max_age <= 0:
+            raise ValueError("max_age must be positive")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.retain_segments = retain_segments
+        self.retain_age = retain_age
+        self.retain_bytes = retain_bytes
+        self.block_bytes = max(block_bytes, 1)
+        self.compression_level = compression_level
+
+
+# Used by the application: 16 MiB segments kept for 30 days
+DEFAULT_ROTATION = RotationPolicy(max_bytes=16 * 1024 * 1024, retain_age=30 * 24 * 3600)
+
+
+class LogRotator:
+    """Moves full log files aside and compresses them into indexed segments on a background thread.
+
+    Writers only pay for a rename: ``rotate()`` moves ``<type>.log`` to
+    ``<type>.<sequence>.rotating`` and queues it. The compactor thread writes
+    ``<type>.<sequence>.log.gz`` with its ``.idx`` sidecar, removes the
+    rotated file and applies retention. Rotated files left behind by a crash
+    are compressed on the next start. Writers hold ``lock`` around appends so
+    that a rename never happens in the middle of one. A file or segment that
+    fails to compact or prune is logged and counted in ``errors`` (and a
+    rotated file is left for the next start); lines that cannot be parsed are
+    left out of the segment and counted in ``lines_dropped``.
+    """
+
+    _STOP = object()
+
+    def __init__(self, log_directory: str, policy: RotationPolicy):
+        self._log_directory = log_directory
+        self._policy = policy
+        self.lock = threading.RLock()
+        self._opened: Dict[str, float] = {}
+        self._sequences: Dict[str, int] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self.rotations = 0
+        self.segments_written = 0
+        self.segments_pruned = 0
+        self.errors = 0
+        self.lines_dropped = 0
+        self._closed = False
+        for suffix in (SEGMENT_SUFFIX, INDEX_SUFFIX, RAW_SUFFIX):
+            for resource_type, sequence, _ in list_sequenced(log_directory, suffix):
+                self._sequences[resource_type] = max(self._sequences.get(resource_type, 0), sequence)
+        self._thread = threading.Thread(target=self._run, name="log-compactor", daemon=True)
+        self._thread.start()
+        for resource_type, sequence, path in list_sequenced(log_directory, RAW_SUFFIX):
+            self._queue.put((resource_type, sequence, path))
+        atexit.register(self.close)
+
+    def _active_path(self, resource_type: str) -> str:
+        return os.path.join(self._log_directory, f"{resource_type}.log")
+
+    def due(self, resource_type: str, size: int) -> bool:
+        """Whether the active file of ``resource_type`` (lower case), now ``size`` bytes, should rotate"""
+        policy = self._policy
+        if policy.max_bytes is not None and size >= policy.max_bytes:
+            return True
+        if policy.max_age is None:
+            return False
+        opened = self._opened.get(resource_type)
+        if opened is None:
+            opened = self._opened[resource_type] = self._first_entry_time(resource_type)
+        return time.time() - opened >= policy.max_age
+
+    def _first_entry_time(self, resource_type: str) -> float:
+        try:
+            with open(self._active_path(resource_type), 'r', errors='replace') as f:
+                entry = parse_entry(resource_type, f.readline())
+            if entry is not None and entry.timestamp.year > 1:
+                return entry.timestamp.timestamp()
+        except OSError:
+            pass
+        return time.time()
+
+    def rotate(self, resource_type: str) -> Optional[str]:
+        """Move the active file aside for compression; returns the rotated path, or None if there was nothing"""
+        with self.lock:
+            path = self._active_path(resource_type)
+            try:
+                if os.path.getsize(path) == 0:
+                    return None
+            except OSError:
+                return None
+            sequence = self._sequences.get(resource_type, 0)
+            while True:
+                sequence += 1
+                rotated = sequenced_path(self._log_directory, resource_type, sequence, RAW_SUFFIX)
+                if os.path.exists(sequenced_path(self._log_directory, resource_type, sequence, INDEX_SUFFIX)):
+                    continue
+                try:
+                    # link fails instead of overwriting when another process took this sequence
+                    os.link(path, rotated)
+                    break
+                except FileExistsError:
+                    continue
+            os.remove(path)
+            self._sequences[resource_type] = sequence
+            self._opened.pop(resource_type, None)
+            self.rotations += 1
+        self._queue.put((resource_type, sequence, rotated))
+        return rotated
+
+    def rotate_all(self) -> None:
+        if not os.path.exists(self._log_directory):
+            return
+        for filename in sorted(os.listdir(self._log_directory)):
+            if filename.endswith('.log'):
+                self.rotate(filename[:-len('.log')])
+
+    def wait(self) -> None:
+        """Block until every rotated file has been compressed"""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def stats(self) -> Dict[str, int]:
+        return {"rotations": self.rotations, "segments_written": self.segments_written,
+                "segments_pruned": self.segments_pruned, "pending": self._queue.qsize(), "errors": self.errors,
+                "lines_dropped": self.lines_dropped}
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is self._STOP:
+                    return
+                resource_type, sequence, rotated = item
+                try:
+                    self._compact(resource_type, sequence, rotated)
+                except Exception:
+                    # The thread must outlive a bad file, or every later rotation and wait() would stall
+                    self.errors += 1
+                    _LOGGER.exception("Compacting %s failed; it is retried on the next start", rotated)
+                self._prune(resource_type)
+            finally:
+                self._queue.task_done()
+
+    def _compact(self, resource_type: str, sequence: int, rotated: str) -> None:
+        policy = self._policy
+        write_segment(sequenced_path(self._log_directory, resource_type, sequence, SEGMENT_SUFFIX),
+                      sequenced_path(self._log_directory, resource_type, sequence, INDEX_SUFFIX),
+                      resource_type, sequence, self._parsed_lines(resource_type, rotated),
+                      policy.block_bytes, policy.compression_level)
+        # The segment is complete and indexed before the plain copy disappears
+        os.remove(rotated)
+        self.segments_written += 1
+
+    def _parsed_lines(self, resource_type: str, path: str) -> Iterator[Tuple[str, object, Optional[str]]]:
+        dropped = 0
+        with open(path, 'r', errors='replace') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if not line:
+                    continue
+                entry = parse_entry(resource_type, line)
+                if entry is None:
+                    dropped += 1
+                    continue
+                yield line, entry.timestamp, entry.resource_name
+        if dropped:
+            self.lines_dropped += dropped
+            _LOGGER.warning("Left %d unparseable line(s) of %s out of its segment", dropped, path)
+
+    def _prune(self, resource_type: str) -> None:
+        policy = self._policy
+        if policy.retain_segments is None and policy.retain_age is None and policy.retain_bytes is None:
+            return
+        indexes = list_sequenced(self._log_directory, INDEX_SUFFIX, resource_type)
+        cutoff = None if policy.retain_age is None else time.time() - policy.retain_age
+        kept_bytes = 0
+        for position, (_, sequence, index_path) in enumerate(reversed(indexes)):
+            try:
+                index = SegmentIndex.load(index_path)
+            except Exception:
+                self.errors += 1
+                _LOGGER.exception("Reading segment index %s failed; the segment is left in place", index_path)
+                continue
+            kept_bytes += index.compressed_bytes
+            expired = ((policy.retain_segments is not None and position >= policy.retain_segments)
+                       or (cutoff is not None and index.end.year > 1 and index.end.timestamp() < cutoff)
+                       or (policy.retain_bytes is not None and kept_bytes > policy.retain_bytes))
+            if expired:
+                try:
+                    # Index first, so readers stop selecting the segment before its data goes
+                    os.remove(index_path)
+                    os.remove(sequenced_path(self._log_directory, resource_type, sequence, SEGMENT_SUFFIX))
+                except OSError:
+                    self.errors += 1
+                    _LOGGER.exception("Removing segment %s failed", index_path)
+                    continue
+                self.segments_pruned += 1
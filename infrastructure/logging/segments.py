@@ -0,0 +1,193 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+SEGMENT_SUFFIX = ".log.gz"
+INDEX_SUFFIX = ".idx"
+# A rotated file waiting to be compressed; readers treat it like a plain log file
+RAW_SUFFIX = ".rotating"
+SEQUENCED_FILE = re.compile(r"^(?P<type>.+)\.(?P<sequence>\d{6,})(?P<suffix>\.log\.gz|\.idx|\.rotating)$")
+
+
+class Checkpoint(NamedTuple):
+    """One independently compressed block of a segment"""
+    offset: int
+    length: int
+    first: datetime
+    last: datetime
+
+
+class NameFilter:
+    """Bloom filter over the resource names of a segment: about 10 bits per name, 1% false positives"""
+
+    _HASHES = 7
+
+    def __init__(self, bits: bytearray):
+        self._bits = bits
+        self._size = len(bits) * 8
+
+    @classmethod
+    def of(cls, names: Iterable[str]) -> 'NameFilter':
+        names = set(names)
+        name_filter = cls(bytearray(max(len(names) * 10 // 8, 8)))
+        for name in names:
+            for position in name_filter._positions(name):
+                name_filter._bits[position >> 3] |= 1 << (position & 7)
+        return name_filter
+
+    def _positions(self, name: str) -> Iterator[int]:
+        digest = hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest()
+        first, second = int.from_bytes(digest[:4], 'little'), int.from_bytes(digest[4:], 'little') | 1
+        return ((first + i * second) % self._size for i in range(self._HASHES))
+
+    def __contains__(self, name: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(name))
+
+    def encode(self) -> str:
+        return base64.b64encode(bytes(self._bits)).decode('ascii')
+
+    @classmethod
+    def decode(cls, text: str) -> 'NameFilter':
+        return cls(bytearray(base64.b64decode(text)))
+
+
+class SegmentIndex:
+    """Sidecar of a compressed segment: time range, a filter of its resource names and block checkpoints"""
+
+    def __init__(self, resource_type: str, sequence: int, start: datetime, end: datetime, entries: int,
+                 names: NameFilter, checkpoints: List[Checkpoint]):
+        self.resource_type = resource_type
+        self.sequence = sequence
+        self.start = start
+        self.end = end
+        self.entries = entries
+        self.names = names
+        self.checkpoints = checkpoints
+
+    def overlaps(self, since: Optional[datetime], until: Optional[datetime]) -> bool:
+        return (since is None or self.end >= since) and (until is None or self.start <= until)
+
+    def may_contain(self, resource_name: Optional[str]) -> bool:
+        return resource_name is None or resource_name in self.names
+
+    @property
+    def compressed_bytes(self) -> int:
+        return sum(checkpoint.length for checkpoint in self.checkpoints)
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.resource_type,
+            "sequence": self.sequence,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "entries": self.entries,
+            "names": self.names.encode(),
+            "checkpoints": [[c.offset, c.length, c.first.isoformat(), c.last.isoformat()]
+                            for c in self.checkpoints],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SegmentIndex':
+        return cls(data["type"], data["sequence"], datetime.fromisoformat(data["start"]),
+                   datetime.fromisoformat(data["end"]), data["entries"],
+                   NameFilter.decode(data["names"]),
+                   [Checkpoint(offset, length, datetime.fromisoformat(first), datetime.fromisoformat(last))
+                    for offset, length, first, last in data["checkpoints"]])
+
+    @classmethod
+    def load(cls, path: str) -> 'SegmentIndex':
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def sequenced_path(log_directory: str, resource_type: str, sequence: int, suffix: str) -> str:
+    return os.path.join(log_directory, f"{resource_type}.{sequence:06d}{suffix}")
+
+
+def list_sequenced(log_directory: str, suffix: str, resource_type: Optional[str] = None) -> List[Tuple[str, int, str]]:
+    """(resource type, sequence, path) of the rotated files with ``suffix``, oldest first"""
+    if not os.path.exists(log_directory):
+        return []
+    found = []
+    for filename in os.listdir(log_directory):
+        match = SEQUENCED_FILE.match(filename)
+        if match and match["suffix"] == suffix and (resource_type is None or match["type"] == resource_type):
+            found.append((match["type"], int(match["sequence"]), os.path.join(log_directory, filename)))
+    found.sort(key=lambda item: (item[0], item[1]))
+    return found
+
+
+def write_segment(segment_path: str, index_path: str, resource_type: str, sequence: int,
+                  entries: Iterable[Tuple[str, datetime, Optional[str]]], block_bytes: int = 64 * 1024,
+                  compression_level: int = 6) -> SegmentIndex:
+    """Compress (line, timestamp, resource name) entries into a segment of gzip members plus its index.
+
+    Each member holds about ``block_bytes`` of text and can be decompressed on
+    its own; together they still form one valid gzip file. Both files are
+    written under temporary names and renamed, the index last, so a reader
+    never sees a segment without a complete index.
+    """
+    checkpoints: List[Checkpoint] = []
+    names = set()
+    start = end = None
+    count = 0
+    block: List[bytes] = []
+    block_size = 0
+    first = last = None
+    temporary = segment_path + ".tmp"
+    with open(temporary, 'wb') as f:
+        def write_block() -> None:
+            compressor = zlib.compressobj(compression_level, zlib.DEFLATED, 31)
+            data = compressor.compress(b''.join(block)) + compressor.flush()
+            checkpoints.append(Checkpoint(f.tell(), len(data), first, last))
+            f.write(data)
+
+        for line, timestamp, resource_name in entries:
+            encoded = line.encode('utf-8') + b'\n'
+            if not block:
+                first = timestamp
+            block.append(encoded)
+            block_size += len(encoded)
+            last = timestamp
+            start = timestamp if start is None else min(start, timestamp)
+            end = timestamp if end is None else max(end, timestamp)
+            count += 1
+            if resource_name is not None:
+                names.add(resource_name)
+            if block_size >= block_bytes:
+                write_block()
+                block, block_size = [], 0
+        if block:
+            write_block()
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, segment_path)
+
+    start = start or datetime.min
+    index = SegmentIndex(resource_type, sequence, start, end or start, count, NameFilter.of(names), checkpoints)
+    with open(index_path + ".tmp", 'w') as f:
+        json.dump(index.to_dict(), f)
+    os.replace(index_path + ".tmp", index_path)
+    return index
+
+
+def read_blocks_reversed(segment_path: str, index: SegmentIndex, since: Optional[datetime] = None,
+                         until: Optional[datetime] = None) -> Iterator[List[str]]:
+    """Yield the lines of each block overlapping the window, newest block first.
+
+    Blocks outside the window are neither read nor decompressed.
+    """
+    with open(segment_path, 'rb') as f:
+        for checkpoint in reversed(index.checkpoints):
+            if until is not None and checkpoint.first > until:
+                continue
+            if since is not None and checkpoint.last < since:
+                return
+            f.seek(checkpoint.offset)
+            text = zlib.decompress(f.read(checkpoint.length), 31).decode('utf-8', errors='replace')
+            yield text.splitlines()
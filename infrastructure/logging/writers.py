@@ -0,0 +1,244 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import Dict, List, Optional, TextIO, Tuple
+from infrastructure.logging.rotation import LogRotator, RotationPolicy
+
+
+class LogWriter(ABC):
+    """Persists formatted log entries to per-resource-type files"""
+
+    def __init__(self, log_directory: str, rotation: Optional[RotationPolicy] = None):
+        self._log_directory = log_directory
+        self._rotator = LogRotator(log_directory, rotation) if rotation else None
+
+    @property
+    def rotator(self) -> Optional[LogRotator]:
+        return self._rotator
+
+    def _log_file(self, resource_type: str) -> str:
+        return os.path.join(self._log_directory, f"{resource_type.lower()}.log")
+
+    @abstractmethod
+    def write(self, resource_type: str, log_entry: str) -> None:
+        pass
+
+    def write_many(self, entries: List[Tuple[str, str]]) -> None:
+        for resource_type, log_entry in entries:
+            self.write(resource_type, log_entry)
+
+    def flush(self) -> None:
+        pass
+
+    def rotate(self) -> None:
+        """Rotate every active file now; no-op without a rotation policy"""
+        if self._rotator is not None:
+            self._rotator.rotate_all()
+
+    def close(self) -> None:
+        if self._rotator is not None:
+            self._rotator.close()
+
+
+class DirectLogWriter(LogWriter):
+    """Opens, appends and closes the target file on every entry"""
+
+    def write(self, resource_type: str, log_entry: str) -> None:
+        if self._rotator is not None:
+            self.write_many([(resource_type, log_entry)])
+            return
+        with open(self._log_file(resource_type), 'a') as f:
+            f.write(log_entry + '\n')
+
+    def write_many(self, entries: List[Tuple[str, str]]) -> None:
+        grouped: Dict[str, List[str]] = {}
+        for resource_type, log_entry in entries:
+            grouped.setdefault(resource_type.lower(), []).append(log_entry + '\n')
+        rotator = self._rotator
+        for resource_type, lines in grouped.items():
+            with rotator.lock if rotator else nullcontext():
+                with open(self._log_file(resource_type), 'a') as f:
+                    f.writelines(lines)
+                    size = f.tell()
+                if rotator and rotator.due(resource_type, size):
+                    rotator.rotate(resource_type)
+
+
+class BufferedLogWriter(LogWriter):
+    """Queues entries to a background thread that appends them in batches.
+
+    One handle is kept open per resource-type file. The writer thread flushes
+    whenever ``flush_size`` entries are pending or ``flush_interval`` seconds
+    have passed since the first pending entry. When the queue is full, callers
+    either block or the entry is dropped and counted in ``dropped``. A batch
+    that cannot be written (a full disk, say) is counted in ``lost`` and the
+    thread carries on with the next one.
+    """
+
+    _FLUSH = object()
+    _ROTATE = object()
+    _STOP = object()
+    # How often callers waiting on the writer thread check that it is still alive
+    _LIVENESS_INTERVAL = 0.5
+
+    def __init__(self, log_directory: str, flush_interval: float = 0.5, flush_size: int = 256,
+                 queue_size: int = 10000, block_on_full: bool = True, fsync: bool = False,
+                 rotation: Optional[RotationPolicy] = None):
+        if flush_interval <= 0:
+            raise ValueError("Flush interval must be positive")
+        if flush_size < 1:
+            raise ValueError("Flush size must be at least 1")
+        super().__init__(log_directory, rotation)
+        self._flush_interval = flush_interval
+        self._flush_size = flush_size
+        self._block_on_full = block_on_full
+        self._fsync = fsync
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._handles: Dict[str, TextIO] = {}
+        self._counter_lock = threading.Lock()
+        self._dropped = 0
+        self._lost = 0
+        self.last_error: Optional[Exception] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def lost(self) -> int:
+        """Entries that reached the writer thread but failed to be written"""
+        return self._lost
+
+    def write(self, resource_type: str, log_entry: str) -> None:
+        if self._closed:
+            raise RuntimeError("Log writer is closed")
+        item = (resource_type, log_entry)
+        if self._block_on_full:
+            self._put(item)
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._counter_lock:
+                self._dropped += 1
+
+    def flush(self) -> None:
+        """Block until every queued entry has been written out"""
+        if self._closed:
+            return
+        self._request(self._FLUSH)
+
+    def rotate(self) -> None:
+        """Write out queued entries, then rotate every active file from the writer thread"""
+        if self._closed or self._rotator is None:
+            return
+        self._request(self._ROTATE)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._put(self._STOP)
+            self._thread.join()
+        self._close_handles()
+        super().close()
+        atexit.unregister(self.close)
+
+    def _put(self, item) -> None:
+        while True:
+            try:
+                self._queue.put(item, timeout=self._LIVENESS_INTERVAL)
+                return
+            except queue.Full:
+                self._check_alive()
+
+    def _request(self, command) -> None:
+        # The writer thread sets the event once everything queued before the command is handled
+        done = threading.Event()
+        self._put((command, done))
+        while not done.wait(self._LIVENESS_INTERVAL):
+            self._check_alive()
+
+    def _check_alive(self) -> None:
+        if not self._thread.is_alive():
+            raise RuntimeError("Log writer thread has stopped")
+
+    def _run(self) -> None:
+        batch: List[Tuple[str, str]] = []
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            command = done = None
+            if item is self._STOP:
+                command = item
+            elif item is not None and item[0] in (self._FLUSH, self._ROTATE):
+                command, done = item
+            elif item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self._flush_interval
+            expired = deadline is not None and time.monotonic() >= deadline
+            if batch and (command is not None or expired or len(batch) >= self._flush_size):
+                self._guarded(len(batch), self._write_batch, batch)
+                batch = []
+                deadline = None
+            if command is self._ROTATE:
+                self._guarded(0, self._rotate_files)
+            if done is not None:
+                done.set()
+            if command is self._STOP:
+                return
+
+    def _guarded(self, entries: int, operation, *args) -> None:
+        try:
+            operation(*args)
+        except Exception as e:
+            # Reopen the files on the next batch rather than reuse handles left in an unknown state
+            self._close_handles()
+            with self._counter_lock:
+                self._lost += entries
+            self.last_error = e
+
+    def _rotate_files(self) -> None:
+        self._close_handles()
+        self._rotator.rotate_all()
+
+    def _close_handles(self) -> None:
+        for handle in self._handles.values():
+            try:
+                handle.close()
+            except OSError:
+                pass
+        self._handles.clear()
+
+    def _write_batch(self, batch: List[Tuple[str, str]]) -> None:
+        grouped: Dict[str, List[str]] = {}
+        for resource_type, log_entry in batch:
+            grouped.setdefault(resource_type.lower(), []).append(log_entry + '\n')
+        for resource_type, lines in grouped.items():
+            handle = self._handles.get(resource_type)
+            if handle is None:
+                handle = open(self._log_file(resource_type), 'a')
+                self._handles[resource_type] = handle
+            handle.writelines(lines)
+            handle.flush()
+            if self._fsync:
+                os.fsync(handle.fileno())
+            # Only this thread writes, so the handle can be closed and the file renamed right away
+            if self._rotator is not None and self._rotator.due(resource_type, handle.tell()):
+                handle.close()
+                del self._handles[resource_type]
+                self._rotator.rotate(resource_type)
@@ -0,0 +1,83 @@
+import json
+from typing import Dict, List, Optional
+from application.services.manifest_reconciler import ResourceSpec
+from domain.value_objects import Runtime, Region, EvictionPolicy
+
+_ENUM_FIELDS = {
+    "runtime": Runtime,
+    "region": Region,
+    "eviction_policy": EvictionPolicy,
+}
+# Creation parameters of each resource type, with the type each value must have
+CONFIG_FIELDS = {
+    "AppService": (("runtime", str), ("region", str), ("replica_count", int)),
+    "StorageAccount": (("encryption_enabled", bool), ("access_key", str), ("max_size_gb", int)),
+    "CacheDB": (("ttl_seconds", int), ("capacity_mb", int), ("eviction_policy", str)),
+}
+_TYPE_NAMES = {str: "a string", int: "an integer", bool: "a boolean", dict: "an object"}
+
+
+def require_field(document: Dict, name: str, expected: type, required: bool = True) -> Optional[object]:
+    """Value of ``name`` in a parsed request or manifest entry; ValueError when it is missing or of another type"""
+    value = document.get(name)
+    if value is None:
+        if required:
+            raise ValueError(f"Missing field: {name}")
+        return None
+    # Booleans are not numbers here, although bool subclasses int
+    if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+        raise ValueError(f"Field {name} must be {_TYPE_NAMES[expected]}")
+    return value
+
+
+def check_config(resource_type: str, config) -> None:
+    """Raise ValueError unless ``config`` holds every creation parameter of the type, each of the expected type"""
+    if not isinstance(config, dict):
+        raise ValueError(f"Field config must be {_TYPE_NAMES[dict]}")
+    for field, expected in CONFIG_FIELDS.get(resource_type, ()):
+        require_field(config, field, expected)
+
+
+def decode_config(config: Dict) -> Dict:
+    """Factory kwargs from a plain configuration mapping, turning enum values into enum members"""
+    return {key: _ENUM_FIELDS[key](value) if key in _ENUM_FIELDS else value for key, value in config.items()}
+
+
+def parse_manifest(document) -> List[ResourceSpec]:
+    """Specs from a parsed manifest: a list of resources, or a mapping with a ``resources`` list.
+
+    Each resource has ``type``, ``name``, an optional target ``state``, a
+    ``config`` mapping with the creation parameters and an optional
+    ``depends_on`` list of resource names, e.g.
+    ``{"type": "CacheDB", "name": "sessions", "state": "Started",
+    "config": {"ttl_seconds": 300, "capacity_mb": 512, "eviction_policy": "LRU"}}``.
+    """
+    entries = document.get("resources", []) if isinstance(document, dict) else document
+    if not isinstance(entries, list):
+        raise ValueError("Manifest must contain a list of resources")
+    specs = []
+    for position, entry in enumerate(entries):
+        try:
+            kwargs = decode_config(entry.get("config") or {})
+            depends_on = entry.get("depends_on") or ()
+            if isinstance(depends_on, str):
+                raise ValueError("depends_on must be a list of resource names")
+            specs.append(ResourceSpec(entry["type"], str(entry["name"]), kwargs, entry.get("state"),
+                                      tuple(str(name) for name in depends_on)))
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid manifest entry #{position + 1}: {e!r}")
+    return specs
+
+
+def load_manifest(path: str) -> List[ResourceSpec]:
+    """Read a JSON or (with PyYAML installed) YAML manifest file"""
+    with open(path, 'r') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML manifests require PyYAML; use a JSON manifest instead")
+            document = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+        else:
+            document = json.load(f)
+    return parse_manifest(document)
@@ -0,0 +1,109 @@
+import threading
+from typing import Dict, List
+
+# Values below 2**_SUB_BUCKET_BITS are counted exactly; above, each power of two is split into
+# 2**(_SUB_BUCKET_BITS - 1) linear sub-buckets, bounding the relative error to under 1.6%
+_SUB_BUCKET_BITS = 7
+_HALF = 1 << (_SUB_BUCKET_BITS - 1)
+_EXACT = 1 << _SUB_BUCKET_BITS
+_NO_VALUE = 1 << 62
+
+
+def _index(value: int) -> int:
+    if value < _EXACT:
+        return value
+    shift = value.bit_length() - _SUB_BUCKET_BITS
+    return shift * _HALF + (value >> shift)
+
+
+def _upper_bound(index: int) -> int:
+    """Largest value counted in the bucket"""
+    if index < _EXACT:
+        return index
+    shift = index // _HALF - 1
+    return ((index - shift * _HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """HDR-style histogram of integer nanosecond latencies.
+
+    Buckets are log-linear, so memory stays a few KB while any recorded value
+    is reported within ~1.6% from nanoseconds up to hours. Recording is a
+    bit-length computation and a list increment under a lock.
+    """
+
+    def __init__(self):
+        # Sized for values up to ~1 ms; longer latencies grow the list once
+        self._counts: List[int] = [0] * _index(1 << 20)
+        self._count = 0
+        self._total = 0
+        self._min = _NO_VALUE
+        self._max = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def total_seconds(self) -> float:
+        return self._total / 1e9
+
+    def record(self, nanoseconds: int) -> None:
+        if nanoseconds < _EXACT:
+            index = nanoseconds if nanoseconds > 0 else 0
+        else:
+            shift = nanoseconds.bit_length() - _SUB_BUCKET_BITS
+            index = shift * _HALF + (nanoseconds >> shift)
+        with self._lock:
+            try:
+                self._counts[index] += 1
+            except IndexError:
+                self._counts.extend([0] * (index + 1 - len(self._counts)))
+                self._counts[index] += 1
+            self._count += 1
+            self._total += nanoseconds
+            if nanoseconds < self._min:
+                self._min = nanoseconds
+            if nanoseconds > self._max:
+                self._max = nanoseconds
+
+    def percentile(self, fraction: float) -> float:
+        """Latency in seconds below which ``fraction`` of the recorded values fall"""
+        with self._lock:
+            if not self._count:
+                return 0.0
+            rank = max(1, int(self._count * fraction + 0.5))
+            seen = 0
+            for index, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank:
+                    return min(_upper_bound(index), self._max) / 1e9
+        return self._max / 1e9
+
+    def cumulative_counts(self, bounds_seconds: List[float]) -> List[int]:
+        """Number of values at or below each bound, for Prometheus ``le`` buckets"""
+        with self._lock:
+            counts = list(self._counts)
+        result = []
+        seen = 0
+        index = 0
+        for bound in bounds_seconds:
+            limit = bound * 1e9
+            while index < len(counts) and _upper_bound(index) <= limit:
+                seen += counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self._count,
+            "sum_seconds": self.total_seconds,
+            "min_seconds": (self._min if self._count else 0) / 1e9,
+            "max_seconds": self._max / 1e9,
+            "p50_seconds": self.percentile(0.50),
+            "p90_seconds": self.percentile(0.90),
+            "p99_seconds": self.percentile(0.99),
+            "p999_seconds": self.percentile(0.999),
+        }
@@ -0,0 +1,175 @@
+import functools
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+from infrastructure.metrics.registry import MetricsRegistry
+
+_SINGLE_OPERATIONS = ('start_resource', 'stop_resource', 'delete_resource', 'scale_resource')
+_BULK_OPERATIONS = ('create_many', 'start_many', 'stop_many', 'delete_many')
+_OBSERVER_EVENTS = {'on_resource_started': 'started', 'on_resource_stopped': 'stopped',
+                    'on_resource_deleted': 'deleted', 'on_batch': 'batch'}
+
+
+class Instrumentation:
+    """Wraps the methods of live objects to record counters and latency histograms.
+
+    Wrappers are installed as instance attributes, so nothing changes for
+    uninstrumented objects: with metrics disabled the hot paths run the
+    original methods with no added cost. ``remove()`` restores them.
+    """
+
+    def __init__(self, metrics: MetricsRegistry):
+        self.metrics = metrics
+        self._installed: List[Tuple[object, str]] = []
+
+    def service(self, service) -> None:
+        """Time every service operation per resource type and count failures per exception"""
+        def type_of_create(args, kwargs) -> str:
+            return args[0] if args else kwargs.get('resource_type', 'unknown')
+
+        def type_of_name(args, kwargs) -> str:
+            try:
+                return service.get_resource(args[0] if args else kwargs['name']).get_resource_type()
+            except Exception:
+                return 'unknown'
+
+        self._wrap(service, 'create_resource', self._timed_operation('create', type_of_create))
+        for name in _SINGLE_OPERATIONS:
+            self._wrap(service, name, self._timed_operation(name[:-len('_resource')], type_of_name))
+        for name in _BULK_OPERATIONS:
+            self._wrap(service, name, self._timed_bulk_operation(name))
+        self._wrap(service, 'list_resources', self._timed_call('service_query_duration_seconds', operation='list'))
+
+    def factory_registry(self, registry) -> None:
+        def record(method: Callable) -> Callable:
+            @functools.wraps(method)
+            def wrapper(resource_type, *args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return method(resource_type, *args, **kwargs)
+                except Exception as e:
+                    self.metrics.increment("factory_errors_total", resource_type=resource_type,
+                                           error=type(e).__name__)
+                    raise
+                finally:
+                    self.metrics.observe("factory_create_duration_seconds", time.perf_counter_ns() - start,
+                                         resource_type=resource_type)
+            return wrapper
+
+        self._wrap(registry, 'create_resource', record)
+
+    def observer(self, observer) -> None:
+        """Time the delivery of each event kind to the observer"""
+        for name, event in _OBSERVER_EVENTS.items():
+            if hasattr(observer, name):
+                self._wrap(observer, name, self._timed_call("observer_dispatch_duration_seconds",
+                                                            observer=type(observer).__name__, event=event))
+
+    def logger(self, logger) -> None:
+        entries_total = self.metrics.counter("log_entries_total")
+
+        def count_entries(method: Callable) -> Callable:
+            timed = self._timed_call("logger_write_duration_seconds", method='log_many')(method)
+
+            @functools.wraps(method)
+            def wrapper(entries):
+                entries = list(entries)
+                entries_total.add(len(entries))
+                return timed(entries)
+            return wrapper
+
+        timed_log = self._timed_call("logger_write_duration_seconds", method='log')
+
+        def count_entry(method: Callable) -> Callable:
+            timed = timed_log(method)
+
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                entries_total.add()
+                return timed(*args, **kwargs)
+            return wrapper
+
+        self._wrap(logger, 'log', count_entry)
+        self._wrap(logger, 'log_many', count_entries)
+        self._wrap(logger, 'query_logs', self._timed_call("logger_read_duration_seconds", method='query_logs'))
+
+    def remove(self) -> None:
+        """Restore every wrapped method"""
+        for target, name in reversed(self._installed):
+            target.__dict__.pop(name, None)
+        self._installed = []
+
+    def _wrap(self, target, name: str, decorator: Callable[[Callable], Callable]) -> None:
+        setattr(target, name, decorator(getattr(target, name)))
+        self._installed.append((target, name))
+
+    def _timed_call(self, metric: str, **labels) -> Callable[[Callable], Callable]:
+        histogram = self.metrics.histogram(metric, **labels)
+
+        def decorator(method: Callable) -> Callable:
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    histogram.record(time.perf_counter_ns() - start)
+            return wrapper
+        return decorator
+
+    def _operation_recorder(self, operation: str) -> Callable[[str, int, Optional[str]], None]:
+        """Records one operation outcome; metric cells are resolved once per (resource type, error)"""
+        metrics = self.metrics
+        cells: Dict[Tuple[str, Optional[str]], Tuple] = {}
+
+        def record(resource_type: str, elapsed: int, error: Optional[str], count: int = 1) -> None:
+            entry = cells.get((resource_type, error))
+            if entry is None:
+                entry = cells[(resource_type, error)] = (
+                    metrics.histogram("operation_duration_seconds", operation=operation, resource_type=resource_type),
+                    metrics.counter("operations_total", operation=operation, resource_type=resource_type,
+                                    outcome="ok" if error is None else "error"),
+                    None if error is None else metrics.counter("operation_errors_total", operation=operation,
+                                                                resource_type=resource_type, error=error))
+            if elapsed >= 0:
+                entry[0].record(elapsed)
+            entry[1].add(count)
+            if entry[2] is not None:
+                entry[2].add(count)
+        return record
+
+    def _timed_operation(self, operation: str, type_of: Callable) -> Callable[[Callable], Callable]:
+        record = self._operation_recorder(operation)
+
+        def decorator(method: Callable) -> Callable:
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    result = method(*args, **kwargs)
+                except Exception as e:
+                    record(type_of(args, kwargs), time.perf_counter_ns() - start, type(e).__name__)
+                    raise
+                record(type_of(args, kwargs), time.perf_counter_ns() - start, None)
+                return result
+            return wrapper
+        return decorator
+
+    def _timed_bulk_operation(self, operation: str) -> Callable[[Callable], Callable]:
+        histogram = self.metrics.histogram("bulk_operation_duration_seconds", operation=operation)
+        record = self._operation_recorder(operation[:-len('_many')])
+
+        def decorator(method: Callable) -> Callable:
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                results = method(*args, **kwargs)
+                histogram.record(time.perf_counter_ns() - start)
+                outcomes = Counter((result.resource_type or 'unknown', None if result.ok else type(result.error).__name__)
+                                   for result in results)
+                for (resource_type, error), count in outcomes.items():
+                    # Items of a bulk call have no individual latency; only the call itself is timed
+                    record(resource_type, -1, error, count)
+                return results
+            return wrapper
+        return decorator
@@ -0,0 +1,122 @@
+import os
+import sys
+import threading
+from typing import Dict, Optional, Tuple
+from infrastructure.metrics.histogram import LatencyHistogram
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Upper bounds of the Prometheus histogram buckets, in seconds
+EXPORT_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+def _labels(**labels) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class CounterCell:
+    """One counter series; callers on a hot path keep the cell instead of looking it up by labels"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def add(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class MetricsRegistry:
+    """Named counters and latency histograms keyed by label set"""
+
+    def __init__(self, namespace: str = "cloudconnect"):
+        self._namespace = namespace
+        self._counters: Dict[str, Dict[Labels, CounterCell]] = {}
+        self._histograms: Dict[str, Dict[Labels, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, **labels) -> CounterCell:
+        key = _labels(**labels)
+        series = self._counters.get(name)
+        cell = series.get(key) if series else None
+        if cell is None:
+            with self._lock:
+                cell = self._counters.setdefault(name, {}).setdefault(key, CounterCell())
+        return cell
+
+    def increment(self, name: str, amount: int = 1, **labels) -> None:
+        self.counter(name, **labels).add(amount)
+
+    def histogram(self, name: str, **labels) -> LatencyHistogram:
+        key = _labels(**labels)
+        series = self._histograms.get(name)
+        histogram = series.get(key) if series else None
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, {}).setdefault(key, LatencyHistogram())
+        return histogram
+
+    def observe(self, name: str, nanoseconds: int, **labels) -> None:
+        self.histogram(name, **labels).record(nanoseconds)
+
+    def snapshot(self) -> Dict:
+        """Plain-data copy: {"counters": {name: [{"labels", "value"}]}, "histograms": {name: [{"labels", ...}]}}"""
+        counters, histograms = self._copy()
+        return {
+            "counters": {name: [{"labels": dict(labels), "value": value} for labels, value in sorted(series.items())]
+                         for name, series in counters.items()},
+            "histograms": {name: [dict(histogram.snapshot(), labels=dict(labels))
+                                  for labels, histogram in sorted(series.items())]
+                           for name, series in histograms.items()},
+        }
+
+    def _copy(self) -> Tuple[Dict, Dict]:
+        """Series that recorded anything; instrumentation creates some of them up front"""
+        with self._lock:
+            counters = {name: {labels: cell.value for labels, cell in series.items() if cell.value}
+                        for name, series in self._counters.items()}
+            histograms = {name: {labels: histogram for labels, histogram in series.items() if histogram.count}
+                          for name, series in self._histograms.items()}
+        return ({name: series for name, series in counters.items() if series},
+                {name: series for name, series in histograms.items() if series})
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        counters, histograms = self._copy()
+        lines = []
+        for name, series in sorted(counters.items()):
+            metric = f"{self._namespace}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{metric}{_format_labels(labels)} {value}")
+        for name, series in sorted(histograms.items()):
+            metric = f"{self._namespace}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, histogram in sorted(series.items()):
+                count = histogram.count
+                for bound, cumulative in zip(EXPORT_BUCKETS, histogram.cumulative_counts(list(EXPORT_BUCKETS))):
+                    lines.append(f"{metric}_bucket{_format_labels(labels, ('le', repr(bound)))} {cumulative}")
+                lines.append(f"{metric}_bucket{_format_labels(labels, ('le', '+Inf'))} {count}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.total_seconds!r}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[str] = None) -> None:
+        """Write the Prometheus dump to ``path``, or to stdout when it is None or '-'"""
+        text = self.to_prometheus()
+        if path in (None, '-'):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            return
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w') as f:
+            f.write(text)
+        os.replace(temp_path, path)
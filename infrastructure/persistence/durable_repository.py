@@ -0,0 +1,335 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, TextIO, Tuple
+from application.factories.resource_factory import ResourceFactoryRegistry
+from application.observers.resource_observer import ResourceObserver
+from domain.entities.resource import Resource
+from domain.exceptions import DuplicateResourceError
+from domain.repositories.resource_repository import ResourceRepository
+from domain.states import EVENT_STATES, state_from_name
+from domain.value_objects import ResourceId
+from infrastructure.manifest.manifest_loader import decode_config
+
+_SNAPSHOT_FILE = "snapshot.json"
+# Access keys are kept out of the snapshot and WAL, in a file only the owner can read
+_CREDENTIALS_FILE = "credentials.log"
+_SECRET_FIELDS = ("access_key",)
+_WAL_PREFIX = "wal-"
+_WAL_SUFFIX = ".log"
+
+
+def encode_resource(resource: Resource) -> Dict:
+    return {
+        "t": resource.get_resource_type(),
+        "n": resource.id.value,
+        "c": resource.config,
+        "s": resource.state,
+        "at": resource.created_at,
+    }
+
+
+def decode_resource(record: Dict, factory_registry: ResourceFactoryRegistry) -> Resource:
+    resource = factory_registry.create_resource(record["t"], ResourceId(record["n"]), **decode_config(record["c"]))
+    resource.restore(state_from_name(record["s"]), record["at"])
+    return resource
+
+
+class _TransitionRecorder(ResourceObserver):
+    """Appends a record of the state each lifecycle event reports to the write-ahead log.
+
+    As a ``records_state`` observer it is notified inside the transition, so the
+    record is appended before the transition returns.
+    """
+
+    records_state = True
+
+    def __init__(self, repository: 'DurableResourceRepository'):
+        self._repository = repository
+
+    def on_resource_started(self, resource: Resource, message: str) -> None:
+        self._repository._append_states([(resource.id.value, EVENT_STATES['started'])])
+
+    def on_resource_stopped(self, resource: Resource, message: str) -> None:
+        self._repository._append_states([(resource.id.value, EVENT_STATES['stopped'])])
+
+    def on_resource_deleted(self, resource: Resource, message: str) -> None:
+        self._repository._append_states([(resource.id.value, EVENT_STATES['deleted'])])
+
+    def on_batch(self, events: List) -> None:
+        self._repository._append_states([(resource.id.value, EVENT_STATES[event]) for event, resource, _ in events])
+
+
+class DurableResourceRepository(ResourceRepository):
+    """Resource repository persisted through a write-ahead log and periodic snapshots.
+
+    Every add and state transition is appended to the current WAL segment as a
+    JSON line. Records are flushed (and optionally fsynced) in groups of
+    ``group_commit_size``, and a background thread commits whatever is
+    pending every ``group_commit_interval`` seconds, so no record waits longer
+    than that. Once ``snapshot_every`` records have been logged, the full
+    repository is written to a snapshot and the older segments are removed.
+    Recovery loads the snapshot, replays only the segments written after it
+    and keeps appending to the last one. Access keys are never written to the
+    snapshot or the WAL but to a credentials file readable only by its owner.
+    A resource that cannot be rebuilt (say its access key was lost with that
+    file) is left out of the repository and reported in ``recovery_errors``;
+    its records are kept, so later snapshots still carry it, and its name stays
+    taken.
+    """
+
+    def __init__(self, data_directory: str, factory_registry: ResourceFactoryRegistry,
+                 group_commit_size: int = 1, group_commit_interval: float = 0.0, fsync: bool = False,
+                 snapshot_every: Optional[int] = 100000):
+        super().__init__()
+        self._data_directory = data_directory
+        self._factory_registry = factory_registry
+        self._group_commit_size = max(group_commit_size, 1)
+        self._group_commit_interval = group_commit_interval
+        self._fsync = fsync
+        self._snapshot_every = snapshot_every
+        self._recorder = _TransitionRecorder(self)
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._records_since_snapshot = 0
+        self._sequence = 0
+        self._wal: Optional[TextIO] = None
+        self._credentials: Dict[str, Dict] = {}
+        self._credentials_file: Optional[TextIO] = None
+        # Stored records of the resources recovery could not rebuild, and why
+        self._unrecoverable: Dict[str, Dict] = {}
+        self.recovery_errors: Dict[str, str] = {}
+        os.makedirs(data_directory, exist_ok=True)
+        self._recover()
+        self._closing = threading.Event()
+        self._committer: Optional[threading.Thread] = None
+        if self._group_commit_size > 1 and group_commit_interval > 0:
+            self._committer = threading.Thread(target=self._commit_periodically, name="wal-commit", daemon=True)
+            self._committer.start()
+
+    def add(self, resource: Resource) -> None:
+        with self._lock:
+            if resource.id.value in self._unrecoverable:
+                raise DuplicateResourceError(f"Resource '{resource.id}' already exists but could not be restored: "
+                                             f"{self.recovery_errors[resource.id.value]}")
+            super().add(resource)
+            resource.attach_observer(self._recorder)
+            self._append({"op": "add", "r": self._encode(resource)})
+
+    def update(self, resource: Resource, previous_config: Dict) -> None:
+        with self._lock:
+            super().update(resource, previous_config)
+            self._append({"op": "config", "n": resource.id.value, "c": resource.config})
+
+    def flush(self) -> None:
+        """Commit every buffered WAL record"""
+        with self._lock:
+            if self._wal and self._pending:
+                self._commit()
+
+    def snapshot(self) -> None:
+        """Write the full repository to a snapshot and drop the WAL segments it covers"""
+        with self._lock:
+            self._close_wal()
+            snapshot_path = os.path.join(self._data_directory, _SNAPSHOT_FILE)
+            temp_path = snapshot_path + ".tmp"
+            self._rewrite_credentials()
+            with open(temp_path, 'w') as f:
+                f.write(json.dumps({"seq": self._sequence}) + '\n')
+                for resource in self._resources.values():
+                    f.write(json.dumps(self._encode(resource), separators=(',', ':')) + '\n')
+                for record in self._unrecoverable.values():
+                    f.write(json.dumps(record, separators=(',', ':')) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, snapshot_path)
+            for segment in self._segments():
+                os.remove(os.path.join(self._data_directory, segment))
+            self._records_since_snapshot = 0
+            self._open_wal()
+
+    compact = snapshot
+
+    def close(self) -> None:
+        self._closing.set()
+        if self._committer is not None:
+            self._committer.join()
+        with self._lock:
+            self._close_wal()
+            if self._credentials_file:
+                self._credentials_file.close()
+                self._credentials_file = None
+
+    def _commit_periodically(self) -> None:
+        while not self._closing.wait(self._group_commit_interval):
+            self.flush()
+
+    def _segments(self) -> List[str]:
+        segments = [f for f in os.listdir(self._data_directory)
+                    if f.startswith(_WAL_PREFIX) and f.endswith(_WAL_SUFFIX)]
+        return sorted(segments, key=lambda f: int(f[len(_WAL_PREFIX):-len(_WAL_SUFFIX)]))
+
+    def _recover(self) -> None:
+        self._read_credentials()
+        snapshot_path = os.path.join(self._data_directory, _SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'r') as f:
+                self._sequence = json.loads(f.readline())["seq"]
+                for line in f:
+                    self._load(json.loads(line))
+        last_segment = None
+        for segment in self._segments():
+            segment_path = os.path.join(self._data_directory, segment)
+            if int(segment[len(_WAL_PREFIX):-len(_WAL_SUFFIX)]) < self._sequence:
+                # Already covered by the snapshot; left behind by an interrupted compaction
+                os.remove(segment_path)
+                continue
+            self._replay(segment_path)
+            last_segment = segment
+        # Segments are named after their first record, so the last one can simply be extended
+        self._open_wal(last_segment)
+
+    def _replay(self, segment_path: str) -> None:
+        valid_bytes = 0
+        with open(segment_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                valid_bytes += len(line)
+                self._sequence += 1
+                self._records_since_snapshot += 1
+                if record["op"] == "add":
+                    self._load(record["r"])
+                elif record["n"] in self._unrecoverable:
+                    stored = self._unrecoverable[record["n"]]
+                    if record["op"] == "config":
+                        stored["c"].update(record["c"])
+                    else:
+                        stored["s"] = record["s"]
+                elif record["op"] == "config":
+                    resource = self._resources[ResourceId(record["n"])]
+                    previous_config = resource.config
+                    resource.scale(record["c"]["replica_count"])
+                    self._index.reindex(resource, previous_config)
+                else:
+                    resource = self._resources[ResourceId(record["n"])]
+                    resource.restore(state_from_name(record["s"]), resource.created_at)
+                    self._index.update_state(resource)
+        # Drop a torn record left by a crash mid-write
+        if valid_bytes < os.path.getsize(segment_path):
+            with open(segment_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+    def _load(self, record: Dict) -> None:
+        secrets = self._credentials.get(record["n"])
+        try:
+            resource = decode_resource(dict(record, c={**record["c"], **secrets}) if secrets else record,
+                                       self._factory_registry)
+        except (KeyError, TypeError, ValueError) as e:
+            # One resource that cannot be rebuilt must not keep the rest of the repository from opening
+            error = f"missing {e}" if isinstance(e, KeyError) else str(e)
+            self._unrecoverable[record["n"]] = dict(record, c=dict(record["c"]))
+            self.recovery_errors[record["n"]] = error
+            logging.getLogger(__name__).error("Resource '%s' could not be restored: %s", record["n"], error)
+            return
+        resource.attach_observer(self._recorder)
+        self._store(resource)
+
+    def _open_wal(self, segment: Optional[str] = None) -> None:
+        segment = segment or f"{_WAL_PREFIX}{self._sequence}{_WAL_SUFFIX}"
+        self._wal = open(os.path.join(self._data_directory, segment), 'a')
+
+    def _encode(self, resource: Resource) -> Dict:
+        """Encoded resource as stored on disk: secret config fields go to the credentials file instead"""
+        record = encode_resource(resource)
+        config = record["c"]
+        secrets = {field: config.pop(field) for field in _SECRET_FIELDS if field in config}
+        if secrets and self._credentials.get(record["n"]) != secrets:
+            self._credentials[record["n"]] = secrets
+            self._write_credentials({"n": record["n"], **secrets})
+        return record
+
+    def _read_credentials(self) -> None:
+        path = os.path.join(self._data_directory, _CREDENTIALS_FILE)
+        if not os.path.exists(path):
+            return
+        valid_bytes = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                valid_bytes += len(line)
+                self._credentials[entry.pop("n")] = entry
+        if valid_bytes < os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+    def _write_credentials(self, entry: Dict) -> None:
+        # Written ahead of the WAL record that needs it and committed straight away
+        if self._credentials_file is None:
+            self._credentials_file = self._open_private(os.path.join(self._data_directory, _CREDENTIALS_FILE), 'a')
+        self._credentials_file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self._credentials_file.flush()
+        if self._fsync:
+            os.fsync(self._credentials_file.fileno())
+
+    def _rewrite_credentials(self) -> None:
+        """Compact the credentials file to the current key of every stored resource"""
+        if self._credentials_file:
+            self._credentials_file.close()
+            self._credentials_file = None
+        path = os.path.join(self._data_directory, _CREDENTIALS_FILE)
+        names = {resource_id.value for resource_id in self._resources}
+        self._credentials = {name: secrets for name, secrets in self._credentials.items() if name in names}
+        with self._open_private(path + ".tmp", 'w') as f:
+            for name, secrets in self._credentials.items():
+                f.write(json.dumps({"n": name, **secrets}, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def _open_private(path: str, mode: str) -> TextIO:
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if mode == 'a' else os.O_TRUNC)
+        f = os.fdopen(os.open(path, flags, 0o600), mode)
+        os.chmod(path, 0o600)
+        return f
+
+    def _close_wal(self) -> None:
+        if self._wal:
+            self.flush()
+            self._wal.close()
+            self._wal = None
+
+    def _append_states(self, states: List[Tuple[str, str]]) -> None:
+        with self._lock:
+            for name, state in states:
+                self._append({"op": "state", "n": name, "s": state})
+
+    def _append(self, record: Dict) -> None:
+        self._wal.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._sequence += 1
+        self._records_since_snapshot += 1
+        self._pending += 1
+        if (self._pending >= self._group_commit_size
+                or time.monotonic() - self._last_commit >= self._group_commit_interval > 0):
+            self._commit()
+        if self._snapshot_every and self._records_since_snapshot >= self._snapshot_every:
+            self.snapshot()
+
+    def _commit(self) -> None:
+        self._wal.flush()
+        if self._fsync:
+            os.fsync(self._wal.fileno())
+        self._pending = 0
+        self._last_commit = time.monotonic()
@@ -1,38 +1,95 @@
-from infrastructure.logging.logger import Logger
-from domain.repositories.resource_repository import ResourceRepository
-from application.factories.resource_factory import (
-    ResourceFactoryRegistry, 
-    AppServiceFactory, 
-    StorageAccountFactory, 
-    CacheDBFactory
-)
-from application.observers.resource_observer import LoggingObserver
-from application.services.resource_management_service import ResourceManagementService
-from infrastructure.cli.cloud_connect_cli import CloudConnectCLI
-
-
-def main():
-    """Bootstrap and run the CloudConnect application"""
-    
-    # Infrastructure
-    logger = Logger()
-    
-    # Domain
-    repository = ResourceRepository()
-    
+import os
+import sys
+
+# Directory the resources persist to when no data directory is passed; without either they are kept in memory
+DATA_DIRECTORY_VARIABLE = "CLOUDCONNECT_DATA"
+
+
+def build_service(logger, metrics=None, event_bus=None, shards=0, admission=None, data_directory=None):
+    """Wire the repository and service around a logger; returns (service, repository).
+
+    With ``data_directory`` (or the CLOUDCONNECT_DATA environment variable) the resources persist there and are
+    recovered on startup; otherwise they live in memory for the run.
+
+    With a MetricsRegistry the factory registry, service, logging observer and logger are instrumented.
+    With an EventBus, lifecycle events reach the logger through the bus instead of inside each transition.
+    With ``shards`` the resources are partitioned over that many worker processes, persisted under the data
+    directory's shards/ when there is one, and the returned service takes the place of the repository to close.
+    With an AdmissionController every changing operation is admitted by it first.
+    """
+    from application.factories.resource_factory import (
+        ResourceFactoryRegistry,
+        AppServiceFactory,
+        StorageAccountFactory,
+        CacheDBFactory
+    )
+    from application.observers.resource_observer import LoggingObserver
+    from application.services.concurrent_resource_management_service import ConcurrentResourceManagementService
+
     # Application
     factory_registry = ResourceFactoryRegistry()
     factory_registry.register('AppService', AppServiceFactory())
     factory_registry.register('StorageAccount', StorageAccountFactory())
     factory_registry.register('CacheDB', CacheDBFactory())
-    
+
     logging_observer = LoggingObserver(logger)
-    service = ResourceManagementService(repository, factory_registry, logging_observer)
-    
+    if event_bus is not None:
+        event_bus.subscribe(logging_observer)
+
+    data_directory = data_directory or os.environ.get(DATA_DIRECTORY_VARIABLE)
+    if shards:
+        from application.services.sharded_resource_management_service import ShardedResourceManagementService
+        service = ShardedResourceManagementService(factory_registry, event_bus or logging_observer, shards,
+                                                   data_directory and os.path.join(data_directory, "shards"),
+                                                   admission=admission)
+        repository = service
+    else:
+        # Domain (persisted to the data directory and recovered on startup when one is given)
+        if data_directory:
+            from infrastructure.persistence.durable_repository import DurableResourceRepository
+            repository = DurableResourceRepository(data_directory, factory_registry)
+        else:
+            from domain.repositories.resource_repository import ResourceRepository
+            repository = ResourceRepository()
+        service = ConcurrentResourceManagementService(repository, factory_registry, event_bus or logging_observer,
+                                                      admission=admission)
+
+    if metrics is not None:
+        from infrastructure.metrics.instrumentation import Instrumentation
+        instrumentation = Instrumentation(metrics)
+        instrumentation.factory_registry(factory_registry)
+        instrumentation.service(service)
+        instrumentation.observer(logging_observer)
+        instrumentation.logger(logger)
+    return service, repository
+
+
+def main(argv=None):
+    """Bootstrap and run the CloudConnect application"""
+    argv = sys.argv[1:] if argv is None else argv
+
+    # Non-interactive: one-shot commands and batch mode (imports only what the command needs)
+    if argv:
+        from infrastructure.cli.command_line import run_command
+        return run_command(argv, build_service)
+
+    # Infrastructure
+    from infrastructure.logging.logger import Logger
+    from infrastructure.logging.rotation import DEFAULT_ROTATION
+    from infrastructure.cli.cloud_connect_cli import CloudConnectCLI
+    from infrastructure.metrics.registry import MetricsRegistry
+    logger = Logger(rotation=DEFAULT_ROTATION)
+    metrics = MetricsRegistry()
+    service, repository = build_service(logger, metrics)
+
     # CLI
-    cli = CloudConnectCLI(service, logger)
-    cli.run()
+    cli = CloudConnectCLI(service, logger, metrics)
+    try:
+        cli.run()
+    finally:
+        repository.close()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import contextlib
+import io
+import json
+import unittest
+from application.observers.resource_observer import ResourceObserver
+from application.services.concurrent_resource_management_service import ConcurrentResourceManagementService
+from benchmarks.common import build_registry
+from domain.repositories.resource_repository import ResourceRepository
+from infrastructure.cli.command_line import BatchRunner, _run_one_shot, build_parser
+
+_APP_CONFIG = {"runtime": "python", "region": "EastUS", "replica_count": 2}
+
+
+class _SilentObserver(ResourceObserver):
+    def on_resource_started(self, resource, message: str) -> None:
+        pass
+
+    def on_resource_stopped(self, resource, message: str) -> None:
+        pass
+
+    def on_resource_deleted(self, resource, message: str) -> None:
+        pass
+
+
+class BatchRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.service = ConcurrentResourceManagementService(ResourceRepository(), build_registry(), _SilentObserver())
+
+    def run_batch(self, commands):
+        results = []
+        runner = BatchRunner(self.service, None, results.append)
+        for line_number, command in enumerate(commands, 1):
+            runner.submit(line_number, json.dumps(command))
+        runner.finish()
+        return results
+
+    def test_ill_typed_commands_fail_their_own_line_only(self):
+        results = self.run_batch([
+            {"op": "create", "type": "AppService", "name": "web", "config": _APP_CONFIG},
+            {"op": "create", "type": "AppService", "name": "api", "config": dict(_APP_CONFIG, replica_count="2")},
+            {"op": "create", "type": "AppService", "name": "jobs", "config": ["not", "an", "object"]},
+            {"op": "create", "type": 7, "name": "worker", "config": _APP_CONFIG},
+            {"op": "start", "name": 5},
+            {"op": "start", "name": "web"},
+            {"op": "scale", "name": "web", "replica_count": "3"},
+            {"op": "logs", "limit": "10"},
+            {"op": "list", "state": ["Started"]},
+        ])
+        self.assertEqual([result["line"] for result in results], list(range(1, 10)))
+        self.assertEqual([result["ok"] for result in results], [True, False, False, False, False, True, False, False,
+                                                                 False])
+        self.assertTrue(all(result["error_type"] == "ValueError" for result in results if not result["ok"]))
+        self.assertEqual(self.service.get_resource("web").state, "Started")
+        self.assertEqual([resource.id.value for resource in self.service.list_resources()], ["web"])
+
+    def test_one_shot_create_with_ill_typed_parameter_exits_with_an_error(self):
+        args = build_parser().parse_args(["create", "AppService", "web", "runtime=python", "region=EastUS",
+                                          "replica_count=x"])
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            self.assertEqual(_run_one_shot(self.service, args), 1)
+        self.assertIn("replica_count", errors.getvalue())
+        self.assertEqual(self.service.list_resources(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import random
+import threading
+import time
+import unittest
+from collections import Counter, defaultdict
+from typing import Dict, List
+from application.observers.resource_observer import ResourceObserver
+from application.services.concurrent_resource_management_service import ConcurrentResourceManagementService
+from benchmarks.common import build_registry, resource_spec
+from domain.entities.resource import Resource
+from domain.exceptions import DomainException, DuplicateResourceError
+from domain.repositories.resource_repository import ResourceRepository
+
+# Lifecycle event -> states it may follow
+_VALID_AFTER = {"started": ("Created", "Stopped"), "stopped": ("Started",), "deleted": ("Created", "Stopped")}
+_STATE_AFTER = {"started": "Started", "stopped": "Stopped", "deleted": "Deleted"}
+
+
+class RecordingObserver(ResourceObserver):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.events: Dict[str, List[str]] = defaultdict(list)
+
+    def _record(self, resource: Resource, event: str) -> None:
+        # A slow observer widens the window in which a later transition could overtake this event
+        time.sleep(0.0001)
+        with self._lock:
+            self.events[resource.id.value].append(event)
+
+    def on_resource_started(self, resource: Resource, message: str) -> None:
+        self._record(resource, "started")
+
+    def on_resource_stopped(self, resource: Resource, message: str) -> None:
+        self._record(resource, "stopped")
+
+    def on_resource_deleted(self, resource: Resource, message: str) -> None:
+        self._record(resource, "deleted")
+
+
+def run_threads(count: int, target) -> None:
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class ConcurrentServiceStressTest(unittest.TestCase):
+    THREADS = 16
+    RESOURCES = 24
+    OPERATIONS = 400
+
+    def setUp(self):
+        self.observer = RecordingObserver()
+        # Few stripes, so that unrelated resources contend for the same locks as well
+        self.service = ConcurrentResourceManagementService(ResourceRepository(), build_registry(), self.observer,
+                                                           lock_stripes=4)
+
+    def test_concurrent_creates_add_each_resource_once(self):
+        specs = [resource_spec(i) for i in range(50)]
+        created = Counter()
+        lock = threading.Lock()
+
+        def create(worker: int) -> None:
+            for resource_type, name, kwargs in specs:
+                try:
+                    self.service.create_resource(resource_type, name, **kwargs)
+                except DuplicateResourceError:
+                    continue
+                with lock:
+                    created[name] += 1
+
+        run_threads(self.THREADS, create)
+        self.assertEqual(created, Counter({name: 1 for _, name, _ in specs}))
+        self.assertEqual(len(self.service.list_resources()), len(specs))
+
+    def test_transitions_are_neither_invalid_nor_lost_and_events_stay_ordered(self):
+        names = [name for _, name, _ in (resource_spec(i) for i in range(self.RESOURCES))]
+        self.service.create_many(resource_spec(i) for i in range(self.RESOURCES))
+        applied = Counter()
+        lock = threading.Lock()
+
+        def hammer(worker: int) -> None:
+            rng = random.Random(worker)
+            for _ in range(self.OPERATIONS):
+                action = rng.choice(("start", "stop", "start", "stop", "delete"))
+                if rng.random() < 0.2:
+                    batch = rng.sample(names, 3)
+                    results = getattr(self.service, f"{action}_many")(batch)
+                    done = [result.name for result in results if result.applied]
+                else:
+                    name = rng.choice(names)
+                    try:
+                        getattr(self.service, f"{action}_resource")(name)
+                    except DomainException:
+                        continue
+                    done = [name]
+                with lock:
+                    for name in done:
+                        applied[name, action] += 1
+
+        run_threads(self.THREADS, hammer)
+        events = self.observer.events
+        for name in names:
+            state = "Created"
+            for event in events[name]:
+                self.assertIn(state, _VALID_AFTER[event], f"{name}: {event} delivered after {state}: {events[name]}")
+                state = _STATE_AFTER[event]
+            self.assertEqual(self.service.get_resource(name).state, state, name)
+            delivered = Counter(events[name])
+            for action, event in (("start", "started"), ("stop", "stopped"), ("delete", "deleted")):
+                self.assertEqual(delivered[event], applied[name, action], f"{name}: {action}")
+
+
+class _BlockingObserver(ResourceObserver):
+    """Holds up delivery of the first event until released"""
+
+    def __init__(self):
+        self.delivering = threading.Event()
+        self.release = threading.Event()
+
+    def on_resource_started(self, resource: Resource, message: str) -> None:
+        if not self.delivering.is_set():
+            self.delivering.set()
+            self.release.wait(5)
+
+    def on_resource_stopped(self, resource: Resource, message: str) -> None:
+        pass
+
+    def on_resource_deleted(self, resource: Resource, message: str) -> None:
+        pass
+
+
+class ConcurrentServiceVisibilityTest(unittest.TestCase):
+    def test_returned_transition_is_visible_while_another_thread_delivers(self):
+        observer = _BlockingObserver()
+        # One stripe, so the second start leaves its event to the thread still delivering the first
+        service = ConcurrentResourceManagementService(ResourceRepository(), build_registry(), observer,
+                                                      lock_stripes=1)
+        service.create_many(resource_spec(i) for i in range(2))
+        first = threading.Thread(target=service.start_resource, args=("res-0",))
+        first.start()
+        try:
+            self.assertTrue(observer.delivering.wait(5))
+            service.start_resource("res-1")
+            started = [resource.id.value for resource in service.list_resources(state="Started")]
+            self.assertEqual(started, ["res-0", "res-1"])
+            self.assertEqual(service.fleet_summary()["resources"]["by_state"], {"Started": 2})
+        finally:
+            observer.release.set()
+            first.join()
+
+
+class SharedRepositoryTest(unittest.TestCase):
+    def test_services_sharing_a_repository_deliver_each_event_once(self):
+        observer = RecordingObserver()
+        repository = ResourceRepository()
+        first = ConcurrentResourceManagementService(repository, build_registry(), observer)
+        first.create_many(resource_spec(i) for i in range(2))
+        # Attaches the observer to the stored resources again
+        second = ConcurrentResourceManagementService(repository, build_registry(), observer)
+        resource_type, name, kwargs = resource_spec(2)
+        second.create_resource(resource_type, name, **kwargs)
+        first.start_many(["res-0", "res-2"])
+        second.start_resource("res-1")
+        second.stop_resource("res-0")
+        self.assertEqual(dict(observer.events), {"res-0": ["started", "stopped"], "res-1": ["started"],
+                                                 "res-2": ["started"]})
+
+
+if __name__ == "__main__":
+    unittest.main()